@@ -3,8 +3,12 @@ Content Summarizer Application
 A modern Streamlit application for summarizing YouTube videos and web articles using AI.
 """
 import streamlit as st
+import asyncio
 import sys
 import os
+import time
+import uuid
+import html
 
 # Add the project root to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -15,15 +19,43 @@ from src.components import (
     render_header,
     render_sidebar_info, 
     render_url_input,
+    render_mode_selector,
+    render_compare_input,
     render_process_button,
     render_status_message,
     render_summary,
+    render_summary_stream,
+    render_source_progress,
     render_metrics,
+    render_trace_breakdown,
+    render_archive_hits,
     render_troubleshooting,
     render_footer
 )
-from src.services import ContentLoader, ContentLoaderError, SummarizationService, SummarizationError
-from src.utils import validate_url, get_content_type_display, calculate_text_metrics, format_metrics_for_display
+from src.services import (
+    ContentLoader,
+    ContentLoaderError,
+    SummarizationService,
+    SummarizationError,
+    SummaryArchiveError,
+    compare_urls,
+    get_job_queue,
+    get_summary_archive,
+    get_service_registry,
+    rate_limit_session
+)
+from src.worker import ensure_worker_pool
+from src.utils import (
+    classify_url,
+    get_content_type_display,
+    calculate_text_metrics,
+    format_metrics_for_display,
+    format_trace_for_display,
+    start_trace,
+    span,
+    mark_error,
+    start_metrics_server
+)
 
 
 def initialize_app():
@@ -61,14 +93,22 @@ def check_configuration(config: Config) -> bool:
 
 def initialize_services() -> tuple:
     """
-    Initialize application services.
+    Get the process-wide application services.
+    
+    Services are built once per process and shared across sessions and reruns;
+    they are rebuilt if the health check fails.
     
     Returns:
         tuple: (content_loader, summarization_service)
     """
+    # Expose Prometheus metrics when METRICS_PORT is set (no-op on reruns)
+    start_metrics_server()
+    
+    registry = get_service_registry()
     try:
-        content_loader = ContentLoader()
-        summarization_service = SummarizationService()
+        content_loader, summarization_service = registry.get_services()
+        if not registry.health_check():
+            content_loader, summarization_service = registry.rebuild()
         return content_loader, summarization_service
     except (ContentLoaderError, SummarizationError) as e:
         render_status_message("error", f"❌ Failed to initialize services: {str(e)}")
@@ -79,28 +119,46 @@ def process_content(url: str, content_loader: ContentLoader, summarization_servi
     """
     Process content from URL and generate summary.
     
+    The request is traced; with TRACE_PANEL_ENABLED a per-stage breakdown is
+    shown below the results. LLM calls queue under the browser session, so
+    sessions share the API rate limits fairly.
+    
     Args:
         url (str): URL to process
         content_loader (ContentLoader): Content loading service
         summarization_service (SummarizationService): Summarization service
     """
-    # Validate URL
-    is_valid, content_type, error_message = validate_url(url)
+    session_id = st.session_state.setdefault("rate_limit_session", uuid.uuid4().hex)
+    with start_trace("process_content", url=url) as trace, rate_limit_session(session_id):
+        _process_content(url, content_loader, summarization_service)
+    
+    if Config.TRACE_PANEL_ENABLED:
+        render_trace_breakdown(format_trace_for_display(trace.to_dict()))
+
+
+def _process_content(url: str, content_loader: ContentLoader, summarization_service: SummarizationService):
+    """Load, summarize and render one URL inside the current trace."""
+    # Validate and classify the URL once
+    with span("validate"):
+        is_valid, parsed_url, error_message = classify_url(url)
     
     if not is_valid:
+        mark_error(error_message)
         render_status_message("error", f"❌ {error_message}")
         return
     
-    content_type_display = get_content_type_display(content_type)
+    content_type_display = get_content_type_display(parsed_url.kind)
     
     with st.spinner("🔄 Processing your content... This may take a moment."):
         try:
             # Load content
             render_status_message("info", f"📥 Loading {content_type_display} Content...")
             
-            docs = content_loader.load_content(url)
+            with span("load", content_type=parsed_url.kind):
+                docs = content_loader.load_content(parsed_url)
             
             if not content_loader.validate_documents(docs):
+                mark_error("No content extracted")
                 render_status_message(
                     "error", 
                     "❌ No content was extracted from the URL. Please check if the URL contains accessible text content."
@@ -111,27 +169,251 @@ def process_content(url: str, content_loader: ContentLoader, summarization_servi
             # Generate summary
             render_status_message("info", "🧠 AI is analyzing and generating your summary...")
             
-            summary_result = summarization_service.summarize_content(docs)
-            
-            render_status_message("success", "✅ Summary Generated Successfully!")
-            
-            # Display results
-            render_summary(summary_result["summary"])
-            
-            # Calculate and display metrics
-            text_metrics = calculate_text_metrics(summary_result["summary"])
-            formatted_metrics = format_metrics_for_display(text_metrics)
+            if Config.STREAMING_ENABLED:
+                # Display tokens as they are generated
+                stream = summarization_service.stream_summary(docs)
+                summary_text = render_summary_stream(stream)
+                summary_result = stream.result or {}
+                render_status_message("success", "✅ Summary Generated Successfully!")
+            else:
+                summary_result = summarization_service.summarize_content(docs)
+                summary_text = summary_result["summary"]
+                
+                render_status_message("success", "✅ Summary Generated Successfully!")
+                
+                # Display results
+                with span("render"):
+                    render_summary(summary_text)
             
-            render_metrics(formatted_metrics, content_type_display)
+            render_result_details(summary_text, summary_result, content_type_display)
             
         except (ContentLoaderError, SummarizationError) as e:
+            mark_error(str(e))
             render_status_message("error", f"❌ An error occurred while processing your request: {str(e)}")
             render_troubleshooting()
         except Exception as e:
+            mark_error(f"Unexpected error: {str(e)}")
             render_status_message("error", "❌ An unexpected error occurred while processing your request")
             render_troubleshooting()
 
 
+def process_comparison(urls: list, content_loader: ContentLoader, summarization_service: SummarizationService):
+    """
+    Summarize several URLs side by side and render a comparative synthesis.
+    
+    Sources are loaded and summarized concurrently, each with a status line
+    that follows it through loading and summarizing. Comparisons always run
+    in the app process, also with the job queue enabled.
+    
+    Args:
+        urls (list): URLs to compare
+        content_loader (ContentLoader): Content loading service
+        summarization_service (SummarizationService): Summarization service
+    """
+    if len(urls) < 2:
+        render_status_message("error", "❌ Enter at least two URLs to compare, one per line.")
+        return
+    if len(urls) > Config.COMPARE_MAX_URLS:
+        render_status_message("error", f"❌ At most {Config.COMPARE_MAX_URLS} URLs can be compared at once.")
+        return
+    
+    placeholders = [st.empty() for _ in urls]
+    for index, url in enumerate(urls):
+        render_source_progress(placeholders[index], index, {"url": url, "stage": "queued"})
+    
+    def on_progress(index: int, record: dict):
+        render_source_progress(placeholders[index], index, record)
+    
+    session_id = st.session_state.setdefault("rate_limit_session", uuid.uuid4().hex)
+    with st.spinner("🔄 Comparing your sources... This may take a moment."), rate_limit_session(session_id):
+        comparison = asyncio.run(compare_urls(urls, content_loader, summarization_service, on_progress=on_progress))
+    
+    sources = comparison["sources"]
+    failed = [record for record in sources if record.get("status") != "ok"]
+    if comparison["synthesis"] is None:
+        render_status_message(
+            "error",
+            f"❌ The sources could not be compared: {html.escape(comparison['synthesis_error'] or 'unknown error')}"
+        )
+        render_troubleshooting()
+    else:
+        message = f"✅ Compared {comparison['synthesis']['source_count']} sources in {comparison['elapsed_seconds']:.1f}s"
+        if failed:
+            message += f"; left out {len(failed)} that could not be summarized"
+        render_status_message("success", message + ".")
+        with span("render"):
+            render_summary(comparison["synthesis"]["summary"], heading="🔍 Comparative Synthesis")
+    
+    st.markdown("### 📚 Source Summaries")
+    for index, record in enumerate(sources):
+        with st.expander(f"Source {index + 1}: {record['url']}", expanded=False):
+            if record.get("status") == "ok":
+                content_type_display = get_content_type_display(record["content_type"])
+                st.caption(
+                    f"{content_type_display} · {record.get('model_used', '')} · "
+                    f"{record['elapsed_seconds']:.1f}s{' · cached' if record.get('cached') else ''}"
+                )
+                st.markdown(record["summary"])
+            else:
+                st.markdown(f"❌ {record.get('error', 'Not summarized')}")
+
+
+def render_result_details(summary_text: str, summary_result: dict, content_type_display: str):
+    """
+    Render the notes and metrics shown under a finished summary.
+    
+    Args:
+        summary_text (str): The summary text
+        summary_result (dict): Summary result from the summarization service
+        content_type_display (str): Display name of the content type
+    """
+    if summary_result.get("fallback_reason"):
+        render_status_message(
+            "warning",
+            "⚠️ The AI model is unavailable, so this summary is made of the content's key sentences."
+        )
+    near_duplicate = summary_result.get("near_duplicate")
+    if near_duplicate:
+        source = near_duplicate.get("source") or "another page"
+        render_status_message(
+            "info",
+            f"♻️ This content is nearly identical to {html.escape(source)} "
+            f"({near_duplicate['similarity']:.0%} fingerprint match), so its summary was reused."
+        )
+    semantic_match = summary_result.get("semantic_match")
+    if semantic_match:
+        source = semantic_match.get("source") or "another page"
+        render_status_message(
+            "info",
+            f"♻️ This content matches the archived summary of {html.escape(source)} "
+            f"({semantic_match['similarity']:.0%} similar), so that summary was reused."
+        )
+    
+    # Calculate and display metrics
+    text_metrics = calculate_text_metrics(summary_text)
+    formatted_metrics = format_metrics_for_display(text_metrics)
+    
+    render_metrics(formatted_metrics, content_type_display)
+    
+    render_related_summaries(summary_text, summary_result.get("source"))
+
+
+def _archive_hits_for_display(hits: list) -> list:
+    """Convert archive hits to the dictionaries render_archive_hits() shows."""
+    return [
+        {"title": hit.entry.title, "source": hit.entry.source, "score": hit.score, "summary": hit.entry.summary}
+        for hit in hits
+    ]
+
+
+def render_related_summaries(summary_text: str, source: str = None):
+    """
+    Show archived summaries related to a new one, when the archive is enabled.
+    
+    Args:
+        summary_text (str): The new summary
+        source (str, optional): Its source, left out of the results
+    """
+    archive = get_summary_archive()
+    if archive is None or not summary_text:
+        return
+    try:
+        hits = archive.search(summary_text, k=3, exclude_source=source)
+    except SummaryArchiveError:
+        return
+    if hits:
+        render_archive_hits(_archive_hits_for_display(hits), "🔗 Related Summaries")
+
+
+def render_archive_search():
+    """Render the panel for searching past summaries by meaning."""
+    archive = get_summary_archive()
+    if archive is None:
+        return
+    with st.expander("🔎 Search Past Summaries"):
+        query = st.text_input("Describe what you are looking for", key="archive_query")
+        if not query:
+            return
+        try:
+            hits = archive.search(query, k=5)
+        except SummaryArchiveError as e:
+            render_status_message("error", f"❌ The summary archive is unavailable: {html.escape(str(e))}")
+            return
+        if hits:
+            render_archive_hits(_archive_hits_for_display(hits), "📚 Matching Summaries")
+        else:
+            render_status_message("info", "No archived summary matches yet.")
+
+
+JOB_STAGE_MESSAGES = {
+    "queued": "⏳ Waiting for a worker...",
+    "starting": "📥 Loading Content...",
+    "loading": "📥 Loading Content...",
+    "summarizing": "🧠 AI is analyzing and generating your summary..."
+}
+
+
+def submit_job(url: str):
+    """
+    Queue a URL for the worker pool and show its job from now on.
+    
+    The job ID is kept in the page URL, so the job is shown again after a
+    reload.
+    
+    Args:
+        url (str): URL to process
+    """
+    session_id = st.session_state.setdefault("rate_limit_session", uuid.uuid4().hex)
+    job = get_job_queue().submit(url, session=session_id)
+    st.query_params["job"] = job.job_id
+
+
+def render_job(job_id: str):
+    """
+    Show a queued job's progress until it finishes, then its result.
+    
+    The job queue is polled every JOB_POLL_INTERVAL_SECONDS, and the summary
+    is shown as the worker generates it.
+    
+    Args:
+        job_id (str): Job to show
+    """
+    queue = get_job_queue()
+    status_placeholder = st.empty()
+    summary_placeholder = st.empty()
+    
+    job = queue.get(job_id)
+    while job is not None and not job.finished:
+        message = JOB_STAGE_MESSAGES.get(job.stage or job.status, JOB_STAGE_MESSAGES["queued"])
+        if job.status == "queued" and job.error:
+            message = f"🔁 Retrying after an error (attempt {job.attempts + 1} of {job.max_attempts}): {job.error}"
+        with status_placeholder.container():
+            render_status_message("info", message)
+        if job.partial_summary:
+            with summary_placeholder.container():
+                render_summary(f"{job.partial_summary}▌")
+        time.sleep(Config.JOB_POLL_INTERVAL_SECONDS)
+        job = queue.get(job_id)
+    
+    status_placeholder.empty()
+    summary_placeholder.empty()
+    if job is None:
+        render_status_message("error", "❌ This job is no longer available. Please submit the URL again.")
+        return
+    if job.status == "failed":
+        render_status_message("error", f"❌ An error occurred while processing your request: {job.error}")
+        render_troubleshooting()
+        return
+    
+    result = job.result
+    render_status_message("success", "✅ Summary Generated Successfully!")
+    render_summary(result["summary"])
+    render_result_details(result["summary"], result, get_content_type_display(result["content_type"]))
+    
+    if Config.TRACE_PANEL_ENABLED and result.get("trace"):
+        render_trace_breakdown(format_trace_for_display(result["trace"]))
+
+
 def main():
     """Main application function."""
     # Initialize application
@@ -141,8 +423,14 @@ def main():
     if not check_configuration(config):
         return
     
-    # Initialize services
-    content_loader, summarization_service = initialize_services()
+    # Initialize services; with the job queue, worker processes do the work.
+    # Otherwise they are built in the background while the page is drawn and
+    # only waited for when a URL is submitted.
+    start_metrics_server()
+    if Config.JOB_QUEUE_ENABLED:
+        ensure_worker_pool()
+    else:
+        get_service_registry().warm_up()
     
     # Render UI
     render_header()
@@ -154,13 +442,31 @@ def main():
         render_sidebar_info()
     
     with col2:
-        # URL input and processing
-        url = render_url_input()
-        process_clicked = render_process_button()
+        mode = render_mode_selector()
+        
+        if mode == "compare":
+            # Several URLs summarized concurrently, then compared
+            urls = render_compare_input(Config.COMPARE_MAX_URLS)
+            if render_process_button("🔍 Compare Sources") and urls:
+                content_loader, summarization_service = initialize_services()
+                process_comparison(urls, content_loader, summarization_service)
+        else:
+            # URL input and processing
+            url = render_url_input()
+            process_clicked = render_process_button()
+            
+            # Process content if button clicked and URL provided
+            if url and process_clicked:
+                if Config.JOB_QUEUE_ENABLED:
+                    submit_job(url)
+                else:
+                    content_loader, summarization_service = initialize_services()
+                    process_content(url, content_loader, summarization_service)
+        
+        if Config.JOB_QUEUE_ENABLED and "job" in st.query_params:
+            render_job(st.query_params["job"])
         
-        # Process content if button clicked and URL provided
-        if url and process_clicked:
-            process_content(url, content_loader, summarization_service)
+        render_archive_search()
     
     # Render footer
     render_footer()
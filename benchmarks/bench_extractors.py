@@ -0,0 +1,196 @@
+"""
+Benchmark HTML extractors on a corpus of saved pages.
+
+Each extractor runs in its own process so peak RSS is measured in isolation.
+Fidelity is the token-level F1 score against a reference ``<page>.txt`` next
+to each ``<page>.html``; pages without a reference are scored against the
+unstructured output.
+
+Usage:
+    python -m benchmarks.bench_extractors [--corpus DIR] [--repeat N] [--output results.json]
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import re
+import resource
+import sys
+import time
+from collections import Counter
+from typing import List, Dict, Any, Optional
+
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+EXTRACTOR_NAMES = ("readability", "unstructured")
+
+
+def load_corpus(corpus_dir: str) -> List[Dict[str, Optional[str]]]:
+    """
+    Load saved HTML pages and their optional reference text.
+
+    Args:
+        corpus_dir (str): Directory containing ``*.html`` files
+
+    Returns:
+        List[Dict[str, Optional[str]]]: Pages with name, html and reference text
+    """
+    pages = []
+    for html_path in sorted(glob.glob(os.path.join(corpus_dir, "*.html"))):
+        reference_path = os.path.splitext(html_path)[0] + ".txt"
+        reference = None
+        if os.path.exists(reference_path):
+            with open(reference_path, "r", encoding="utf-8") as handle:
+                reference = handle.read()
+        with open(html_path, "r", encoding="utf-8", errors="replace") as handle:
+            pages.append({"name": os.path.basename(html_path), "html": handle.read(), "reference": reference})
+    return pages
+
+
+def token_f1(extracted: str, reference: str) -> float:
+    """
+    Compute the bag-of-words F1 score between extracted and reference text.
+
+    Args:
+        extracted (str): Text produced by an extractor
+        reference (str): Expected main content
+
+    Returns:
+        float: F1 score between 0 and 1
+    """
+    extracted_tokens = Counter(re.findall(r"\w+", extracted.lower()))
+    reference_tokens = Counter(re.findall(r"\w+", reference.lower()))
+    overlap = sum((extracted_tokens & reference_tokens).values())
+    if overlap == 0:
+        return 0.0
+    precision = overlap / sum(extracted_tokens.values())
+    recall = overlap / sum(reference_tokens.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_extractor(name: str, corpus_dir: str, repeat: int, queue) -> None:
+    """Benchmark one extractor in a child process and report through the queue."""
+    from src.services.extractors import ReadabilityExtractor, UnstructuredExtractor, ExtractionError
+
+    pages = load_corpus(corpus_dir)
+    extractor = ReadabilityExtractor() if name == "readability" else UnstructuredExtractor()
+
+    # The first pass warms up imports and lazy initialization outside the timed section
+    rss_before = _peak_rss_mb()
+    outputs = {}
+    errors = 0
+    for page in pages:
+        try:
+            outputs[page["name"]] = extractor.extract(page["html"])
+        except ExtractionError:
+            outputs[page["name"]] = ""
+            errors += 1
+    rss_after_warmup = _peak_rss_mb()
+
+    started_wall = time.perf_counter()
+    started_cpu = time.process_time()
+    for _ in range(repeat):
+        for page in pages:
+            try:
+                extractor.extract(page["html"])
+            except ExtractionError:
+                pass
+    wall = time.perf_counter() - started_wall
+    cpu = time.process_time() - started_cpu
+
+    processed = repeat * len(pages)
+    queue.put({
+        "extractor": name,
+        "pages": len(pages),
+        "iterations": processed,
+        "errors": errors,
+        "pages_per_second": round(processed / wall, 2) if wall > 0 else None,
+        "ms_per_page": round(wall * 1000 / processed, 3) if processed else None,
+        "cpu_ms_per_page": round(cpu * 1000 / processed, 3) if processed else None,
+        "rss_before_mb": round(rss_before, 1),
+        "rss_after_warmup_mb": round(rss_after_warmup, 1),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "outputs": outputs
+    })
+
+
+def run_benchmark(corpus_dir: str, repeat: int) -> Dict[str, Any]:
+    """
+    Benchmark every extractor on the corpus.
+
+    Args:
+        corpus_dir (str): Directory containing ``*.html`` files
+        repeat (int): Timed passes over the corpus per extractor
+
+    Returns:
+        Dict[str, Any]: Per-extractor throughput, memory and fidelity results
+    """
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for name in EXTRACTOR_NAMES:
+        queue = context.Queue()
+        process = context.Process(target=_run_extractor, args=(name, corpus_dir, repeat, queue))
+        process.start()
+        try:
+            results[name] = queue.get(timeout=600)
+        except Exception:
+            results[name] = {"extractor": name, "error": "benchmark process failed"}
+        process.join()
+
+    pages = load_corpus(corpus_dir)
+    unstructured_outputs = results.get("unstructured", {}).get("outputs", {})
+    for name, result in results.items():
+        outputs = result.pop("outputs", None)
+        if outputs is None:
+            continue
+        scores = []
+        for page in pages:
+            reference = page["reference"] or unstructured_outputs.get(page["name"])
+            if reference:
+                scores.append(token_f1(outputs.get(page["name"], ""), reference))
+        result["fidelity_f1"] = round(sum(scores) / len(scores), 4) if scores else None
+
+    return {
+        "corpus": os.path.abspath(corpus_dir),
+        "repeat": repeat,
+        "python": sys.version.split()[0],
+        "results": list(results.values())
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark HTML content extractors")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Directory of saved *.html pages")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed passes over the corpus")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.corpus, args.repeat)
+
+    print(f"{'extractor':<14}{'pages/s':>10}{'ms/page':>10}{'peak MiB':>10}{'F1':>8}{'errors':>8}")
+    for result in report["results"]:
+        if "error" in result:
+            print(f"{result['extractor']:<14}{result['error']}")
+            continue
+        print(
+            f"{result['extractor']:<14}{result['pages_per_second']:>10}{result['ms_per_page']:>10}"
+            f"{result['peak_rss_mb']:>10}{result['fidelity_f1']:>8}{result['errors']:>8}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
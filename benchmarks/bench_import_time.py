@@ -0,0 +1,149 @@
+"""
+Benchmark the cold-start import time of the app.
+
+Each run imports the target modules in a fresh interpreter started with
+``-X importtime``. The report gives the total import time, the slowest
+modules (self and cumulative time) and the time per top-level package,
+from the fastest run. With --check the run exits with status 1 if the
+total exceeds --budget-ms or a module listed in HEAVY_MODULES is imported;
+those are meant to load on first use, not with the app.
+
+Usage:
+    python -m benchmarks.bench_import_time [--runs N] [--budget-ms MS] [--check] [--output results.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import List, Dict, Any
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What Streamlit imports when it runs app.py (and the worker pool it starts)
+DEFAULT_TARGETS = ("app", "src.worker")
+
+# Cold-start budget for DEFAULT_TARGETS; about twice the measured time, which
+# is mostly Streamlit itself
+COLD_START_BUDGET_MS = 1000
+
+# Packages that must only be imported when first used
+HEAVY_MODULES = (
+    "langchain",
+    "langchain_core",
+    "langchain_community",
+    "langchain_groq",
+    "langchain_text_splitters",
+    "unstructured",
+    "transformers",
+    "sentence_transformers",
+    "torch",
+    "faiss",
+)
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Parse ``-X importtime`` output into one entry per imported module."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000
+        })
+    return modules
+
+
+def measure(targets: List[str]) -> List[Dict[str, Any]]:
+    """Import the targets in a fresh interpreter and return its import times."""
+    code = "; ".join(f"import {target}" for target in targets)
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"Importing {', '.join(targets)} failed:\n{process.stderr[-2000:]}")
+    return parse_importtime(process.stderr)
+
+
+def summarize(modules: List[Dict[str, Any]], top: int) -> Dict[str, Any]:
+    """Total, slowest modules and per-package time of one run."""
+    packages: Dict[str, float] = {}
+    for module in modules:
+        package = module["module"].split(".")[0]
+        packages[package] = packages.get(package, 0.0) + module["self_ms"]
+    imported = {module["module"].split(".")[0] for module in modules}
+    return {
+        "total_ms": round(sum(module["cumulative_ms"] for module in modules if module["depth"] == 0), 1),
+        "modules": len(modules),
+        "slowest_self": [
+            {"module": module["module"], "ms": round(module["self_ms"], 1)}
+            for module in sorted(modules, key=lambda module: -module["self_ms"])[:top]
+        ],
+        "slowest_cumulative": [
+            {"module": module["module"], "ms": round(module["cumulative_ms"], 1)}
+            for module in sorted(modules, key=lambda module: -module["cumulative_ms"])[:top]
+        ],
+        "packages": [
+            {"package": package, "ms": round(ms, 1)}
+            for package, ms in sorted(packages.items(), key=lambda item: -item[1])[:top]
+        ],
+        "heavy_imported": sorted(name for name in HEAVY_MODULES if name in imported)
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Cold-start import time benchmark")
+    parser.add_argument("targets", nargs="*", default=list(DEFAULT_TARGETS), help="Modules to import")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time; the fastest counts")
+    parser.add_argument("--top", type=int, default=15, help="Modules and packages to list")
+    parser.add_argument("--budget-ms", type=float, default=COLD_START_BUDGET_MS, help="Cold-start budget")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 if over budget or a heavy module is imported")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    runs = [measure(args.targets) for _ in range(max(1, args.runs))]
+    totals = [summarize(modules, args.top)["total_ms"] for modules in runs]
+    best = min(runs, key=lambda modules: summarize(modules, args.top)["total_ms"])
+    report = summarize(best, args.top)
+    report.update(targets=args.targets, runs_ms=totals, budget_ms=args.budget_ms)
+
+    print(f"import {', '.join(args.targets)}: {report['total_ms']} ms ({report['modules']} modules), "
+          f"runs {', '.join(str(total) for total in totals)} ms, budget {args.budget_ms:g} ms")
+    for title, key, name in (
+        ("slowest modules (self)", "slowest_self", "module"),
+        ("slowest modules (cumulative)", "slowest_cumulative", "module"),
+        ("time per package", "packages", "package")
+    ):
+        print(f"\n{title}:")
+        for entry in report[key]:
+            print(f"  {entry['ms']:>9.1f} ms  {entry[name]}")
+    if report["heavy_imported"]:
+        print(f"\nimported at cold start: {', '.join(report['heavy_imported'])}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.check:
+        failures = []
+        if report["total_ms"] > args.budget_ms:
+            failures.append(f"cold start {report['total_ms']} ms exceeds the {args.budget_ms:g} ms budget")
+        if report["heavy_imported"]:
+            failures.append(f"{', '.join(report['heavy_imported'])} imported at cold start")
+        for failure in failures:
+            print(f"FAIL: {failure}", file=sys.stderr)
+        if failures:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
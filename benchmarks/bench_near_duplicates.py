@@ -0,0 +1,161 @@
+"""
+Benchmark near-duplicate fingerprinting and index lookups.
+
+The index part fills a NearDuplicateIndex with random fingerprints and times
+lookups of two kinds: indexed fingerprints with up to the allowed number of
+bits flipped (every one must be found) and fresh random fingerprints (none
+should match). The fingerprint part hashes every corpus page as its reference
+text, as extracted by each HTML extractor and as the page's full text, all
+normalized as the summarizer sees them, and reports the Hamming distance of
+each version to the reference and to the other pages.
+
+Usage:
+    python -m benchmarks.bench_near_duplicates [--entries N] [--queries N] [--output results.json]
+"""
+import argparse
+import json
+import time
+from typing import List, Dict, Any
+
+import numpy as np
+
+from benchmarks.bench_extractors import DEFAULT_CORPUS, EXTRACTOR_NAMES, load_corpus
+
+
+def bench_index(entries: int, queries: int, threshold: float, seed: int) -> Dict[str, Any]:
+    """Fill an in-memory index and time matching and missing lookups."""
+    from src.services.near_duplicates import NearDuplicateIndex
+
+    rng = np.random.default_rng(seed)
+    index = NearDuplicateIndex(threshold=threshold, max_entries=entries)
+    fingerprints = rng.integers(0, 2 ** 64, size=entries, dtype=np.uint64)
+    key = "00" * 32
+
+    started = time.perf_counter()
+    for fingerprint in fingerprints.tolist():
+        index.add(fingerprint, 0, key)
+    insert_seconds = time.perf_counter() - started
+
+    latencies = {"near": [], "random": []}
+    found = false_matches = 0
+    for _ in range(queries):
+        fingerprint = int(fingerprints[rng.integers(entries)])
+        for bit in rng.choice(64, size=rng.integers(0, index.max_distance + 1), replace=False):
+            fingerprint ^= 1 << int(bit)
+        started = time.perf_counter()
+        match = index.lookup(fingerprint, 0)
+        latencies["near"].append(time.perf_counter() - started)
+        found += match is not None
+
+        started = time.perf_counter()
+        match = index.lookup(int(rng.integers(0, 2 ** 64, dtype=np.uint64)), 0)
+        latencies["random"].append(time.perf_counter() - started)
+        false_matches += match is not None
+
+    def summary(values: List[float]) -> Dict[str, float]:
+        micros = np.asarray(values) * 1e6
+        return {
+            "p50_us": round(float(np.percentile(micros, 50)), 1),
+            "p99_us": round(float(np.percentile(micros, 99)), 1),
+            "max_us": round(float(micros.max()), 1)
+        }
+
+    return {
+        "entries": entries,
+        "threshold": threshold,
+        "max_distance": index.max_distance,
+        "bands": index.stats()["bands"],
+        "inserts_per_second": round(entries / insert_seconds),
+        "near_lookups": summary(latencies["near"]),
+        "random_lookups": summary(latencies["random"]),
+        "recall": round(found / queries, 4),
+        "false_matches": false_matches
+    }
+
+
+def bench_fingerprints(corpus_dir: str) -> List[Dict[str, Any]]:
+    """Fingerprint every version of every corpus page and compare them."""
+    from bs4 import BeautifulSoup
+    from langchain_core.documents import Document
+    from src.services.extractors import ExtractionError, create_extractor
+    from src.services.near_duplicates import simhash
+    from src.services.text_normalizer import TextNormalizer
+
+    normalizer = TextNormalizer(enabled=True)
+
+    def normalized(text: str) -> str:
+        return normalizer.normalize_documents([Document(page_content=text)]).documents[0].page_content
+
+    pages = load_corpus(corpus_dir)
+    references = {page["name"]: simhash(normalized(page["reference"])) for page in pages}
+    results = []
+    for page in pages:
+        versions = {"full text": BeautifulSoup(page["html"], "html.parser").get_text("\n")}
+        for name in EXTRACTOR_NAMES:
+            try:
+                versions[name] = create_extractor(name).extract(page["html"])
+            except ExtractionError:
+                continue
+        reference = references[page["name"]]
+        for version, text in versions.items():
+            text = normalized(text)
+            started = time.perf_counter()
+            fingerprint = simhash(text)
+            elapsed = time.perf_counter() - started
+            if fingerprint is None or reference is None:
+                continue
+            results.append({
+                "page": page["name"],
+                "version": version,
+                "words": len(text.split()),
+                "distance_to_reference": bin(fingerprint ^ reference).count("1"),
+                "closest_other_page": min(
+                    (bin(fingerprint ^ other).count("1") for name, other in references.items()
+                     if name != page["name"] and other is not None),
+                    default=None
+                ),
+                "fingerprint_ms": round(elapsed * 1000, 3)
+            })
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Near-duplicate index benchmark")
+    parser.add_argument("--entries", type=int, default=1_000_000, help="Fingerprints in the index")
+    parser.add_argument("--queries", type=int, default=10_000, help="Lookups of each kind")
+    parser.add_argument("--threshold", type=float, default=None, help="Similarity threshold, defaults to NEAR_DUPLICATE_THRESHOLD")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Directory with *.html pages")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    from config.settings import Config
+    threshold = Config.NEAR_DUPLICATE_THRESHOLD if args.threshold is None else args.threshold
+
+    index_result = bench_index(max(1, args.entries), max(1, args.queries), threshold, args.seed)
+    print(
+        f"{index_result['entries']} fingerprints, {index_result['bands']} bands, "
+        f"distance <= {index_result['max_distance']}: {index_result['inserts_per_second']} inserts/s"
+    )
+    for kind in ("near", "random"):
+        latency = index_result[f"{kind}_lookups"]
+        print(f"  {kind:<7} lookups  p50 {latency['p50_us']} us  p99 {latency['p99_us']} us  max {latency['max_us']} us")
+    print(f"  recall {index_result['recall']}, false matches {index_result['false_matches']}")
+
+    fingerprint_results = bench_fingerprints(args.corpus)
+    print(f"\n{'page':<22}{'version':<14}{'words':>7}{'to ref':>8}{'other':>7}{'ms':>8}")
+    for result in fingerprint_results:
+        print(
+            f"{result['page'][:21]:<22}{result['version']:<14}{result['words']:>7}"
+            f"{result['distance_to_reference']:>8}{str(result['closest_other_page']):>7}{result['fingerprint_ms']:>8}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump({"index": index_result, "fingerprints": fingerprint_results}, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
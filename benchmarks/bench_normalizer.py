@@ -0,0 +1,115 @@
+"""
+Benchmark the text normalization pre-pass on the benchmark corpus.
+
+Every page is extracted with each HTML extractor and as the page's full text
+(navigation and footer included, like a plain partitioner produces), and every
+transcript fixture is joined into its plain text as the YouTube loader does.
+The report shows, per input, the estimated tokens before and after
+TextNormalizer, the token F1 against the page's reference text before and
+after (so content loss is visible), and the CPU cost of the normalization.
+
+Usage:
+    python -m benchmarks.bench_normalizer [--corpus DIR] [--repeat N] [--output results.json]
+"""
+import argparse
+import glob
+import json
+import os
+import time
+from typing import List, Dict, Any
+
+from benchmarks.bench_extractors import DEFAULT_CORPUS, EXTRACTOR_NAMES, load_corpus, token_f1
+
+
+def load_inputs(corpus_dir: str) -> List[Dict[str, Any]]:
+    """
+    Build the normalizer inputs from the corpus.
+
+    Args:
+        corpus_dir (str): Directory with ``*.html`` pages and ``transcripts/*.json``
+
+    Returns:
+        List[Dict[str, Any]]: Inputs with name, text and optional reference
+    """
+    from bs4 import BeautifulSoup
+    from src.services.extractors import ExtractionError, create_extractor
+
+    inputs = []
+    for page in load_corpus(corpus_dir):
+        text = BeautifulSoup(page["html"], "html.parser").get_text("\n")
+        inputs.append({"name": f"{page['name']} (full text)", "text": text, "reference": page["reference"]})
+    for name in EXTRACTOR_NAMES:
+        extractor = create_extractor(name)
+        for page in load_corpus(corpus_dir):
+            try:
+                text = extractor.extract(page["html"])
+            except ExtractionError:
+                continue
+            inputs.append({"name": f"{page['name']} ({name})", "text": text, "reference": page["reference"]})
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "transcripts", "*.json"))):
+        with open(path, "r", encoding="utf-8") as handle:
+            segments = json.load(handle)["segments"]
+        text = " ".join(segment["text"] for segment in segments)
+        inputs.append({"name": os.path.basename(path), "text": text, "reference": None, "transcript": True})
+    return inputs
+
+
+def run(inputs: List[Dict[str, Any]], repeat: int) -> List[Dict[str, Any]]:
+    """Normalize every input and collect savings, fidelity and timing."""
+    from langchain_core.documents import Document
+    from src.services.text_normalizer import TRANSCRIPT_CONTENT_TYPE, TextNormalizer
+
+    normalizer = TextNormalizer(enabled=True)
+    results = []
+    for item in inputs:
+        metadata = {"source": item["name"]}
+        if item.get("transcript"):
+            metadata["content_type"] = TRANSCRIPT_CONTENT_TYPE
+        documents = [Document(page_content=item["text"], metadata=metadata)]
+        normalized = normalizer.normalize_documents(documents)
+        text = normalized.documents[0].page_content
+
+        started = time.process_time()
+        for _ in range(repeat):
+            normalizer.normalize_documents(documents)
+        cpu = (time.process_time() - started) / repeat
+
+        megabytes = len(item["text"].encode("utf-8")) / (1024 * 1024)
+        results.append({
+            "input": item["name"],
+            "tokens_before": normalized.tokens_before,
+            "tokens_after": normalized.tokens_after,
+            "saved_percent": round(100 * normalized.tokens_saved / normalized.tokens_before, 1) if normalized.tokens_before else 0.0,
+            "f1_before": round(token_f1(item["text"], item["reference"]), 3) if item["reference"] else None,
+            "f1_after": round(token_f1(text, item["reference"]), 3) if item["reference"] else None,
+            "cpu_ms": round(cpu * 1000, 3),
+            "cpu_ms_per_mb": round(cpu * 1000 / megabytes, 1) if megabytes else None
+        })
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Text normalization benchmark")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Directory with *.html pages and transcripts/")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed normalizations per input")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    results = run(load_inputs(args.corpus), max(1, args.repeat))
+
+    print(f"{'input':<36}{'tokens':>8}{'after':>8}{'saved %':>9}{'F1 before':>11}{'F1 after':>10}{'CPU ms':>9}")
+    for result in results:
+        print(
+            f"{result['input'][:35]:<36}{result['tokens_before']:>8}{result['tokens_after']:>8}"
+            f"{result['saved_percent']:>9}{str(result['f1_before']):>11}{str(result['f1_after']):>10}{result['cpu_ms']:>9}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
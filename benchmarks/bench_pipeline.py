@@ -0,0 +1,354 @@
+"""
+End-to-end benchmark of content loading and summarization.
+
+Groq is replaced by a deterministic fake chat model and all content is served
+from a local fixture server (see benchmarks/fakes.py), so runs are
+reproducible and need no network access or API key. Each scenario runs in its
+own process so peak RSS is measured in isolation:
+
+- single:     one user summarizing the corpus URLs one after another (UI path, streaming)
+- concurrent: several users doing the same at once
+- batch:      the batch CLI runner over the corpus URLs
+
+Per-stage timings come from the request traces recorded by the services.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--scenarios single,batch] [--repeat N] [--output results.json]
+    python -m benchmarks.bench_pipeline --compare baseline.json --output current.json
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Any, Dict, Optional
+
+
+SCENARIOS = ("single", "concurrent", "batch")
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values (List[float]): Samples
+        pct (float): Percentile between 0 and 100
+
+    Returns:
+        Optional[float]: The percentile, or None without samples
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize_samples(values: List[float]) -> Dict[str, Optional[float]]:
+    """Percentiles, mean and max of a list of samples, rounded to microseconds."""
+    stats = {f"p{pct}": percentile(values, pct) for pct in PERCENTILES}
+    stats["mean"] = sum(values) / len(values) if values else None
+    stats["max"] = max(values) if values else None
+    return {name: round(value, 3) if value is not None else None for name, value in stats.items()}
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _git_commit() -> Optional[str]:
+    """Short hash of the checked-out commit, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, timeout=10
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def _aggregate(traces: List[Dict[str, Any]], wall_seconds: float, cpu_seconds: float) -> Dict[str, Any]:
+    """Turn collected trace dictionaries into scenario statistics."""
+    stage_durations: Dict[str, List[float]] = {}
+    stage_cpu: Dict[str, List[float]] = {}
+    for trace in traces:
+        per_request: Dict[str, List[float]] = {}
+        for span in trace["spans"]:
+            totals = per_request.setdefault(span["name"], [0.0, 0.0])
+            totals[0] += span["duration_ms"]
+            totals[1] += span["cpu_ms"]
+        for name, (duration_ms, cpu_ms) in per_request.items():
+            stage_durations.setdefault(name, []).append(duration_ms)
+            stage_cpu.setdefault(name, []).append(cpu_ms)
+
+    requests = len(traces)
+    return {
+        "requests": requests,
+        "errors": sum(1 for trace in traces if trace["status"] != "ok"),
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_rps": round(requests / wall_seconds, 3) if wall_seconds > 0 else None,
+        "latency_ms": summarize_samples([trace["duration_ms"] for trace in traces]),
+        "cpu_seconds": round(cpu_seconds, 3),
+        "cpu_ms_per_request": round(cpu_seconds * 1000 / requests, 3) if requests else None,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "stages": {
+            name: {
+                "count": len(durations),
+                "latency_ms": summarize_samples(durations),
+                "cpu_ms_mean": round(sum(stage_cpu[name]) / len(stage_cpu[name]), 3)
+            }
+            for name, durations in stage_durations.items()
+        }
+    }
+
+
+def _run_scenario(name: str, params: Dict[str, Any], queue) -> None:
+    """Run one scenario in a child process and report through the queue."""
+    try:
+        queue.put(_scenario_result(name, params))
+    except Exception as e:
+        queue.put({"scenario": name, "error": f"{type(e).__name__}: {str(e)}"})
+
+
+def _scenario_result(name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Set up fakes and services, run a scenario and aggregate its traces."""
+    from benchmarks.fakes import (
+        BenchContentLoader,
+        BenchSummarizationService,
+        FakeChatModel,
+        FixtureServer,
+        install_fakes
+    )
+    from src.cli import BatchRunner
+    from src.services.cache import ContentCache
+    from src.utils import classify_url, span, start_trace
+    from src.utils.tracing import add_trace_listener
+
+    install_fakes()
+    traces: List[Dict[str, Any]] = []
+    traces_lock = threading.Lock()
+
+    def collect(trace):
+        with traces_lock:
+            traces.append(trace.to_dict())
+
+    with FixtureServer(params["corpus"]) as server:
+        urls = server.page_urls() + server.video_urls()
+        cache = ContentCache(db_path="") if params["cache"] else None
+        content_loader = BenchContentLoader(cache=cache)
+        summarization_service = BenchSummarizationService(
+            FakeChatModel(
+                first_token_latency=params["llm_latency"],
+                tokens_per_second=params["llm_tokens_per_second"],
+                output_tokens=params["llm_output_tokens"]
+            ),
+            cache=cache
+        )
+
+        def ui_request(url: str):
+            # Mirrors app.process_content with streaming enabled
+            with start_trace("benchmark", url=url):
+                with span("validate"):
+                    _, parsed_url, _ = classify_url(url)
+                with span("load", content_type=parsed_url.kind):
+                    docs = content_loader.load_content(parsed_url)
+                "".join(summarization_service.stream_summary(docs))
+
+        # Warm up imports, connection pools and lazy initialization untimed
+        for url in urls:
+            ui_request(url)
+
+        add_trace_listener(collect)
+        workload = urls * params["repeat"]
+        started_wall = time.perf_counter()
+        started_cpu = time.process_time()
+
+        if name == "single":
+            for url in workload:
+                ui_request(url)
+        elif name == "concurrent":
+            with ThreadPoolExecutor(max_workers=params["users"]) as executor:
+                list(executor.map(ui_request, workload * params["users"]))
+        elif name == "batch":
+            with tempfile.TemporaryDirectory() as output_dir:
+                runner = BatchRunner(
+                    output_path=os.path.join(output_dir, "results.jsonl"),
+                    checkpoint_path=os.path.join(output_dir, "results.checkpoint"),
+                    workers=params["workers"],
+                    fetch_concurrency=params["fetch_concurrency"],
+                    llm_concurrency=params["llm_concurrency"],
+                    content_loader=content_loader,
+                    summarization_service=summarization_service
+                )
+                runner.run(workload, progress_interval=3600)
+        else:
+            raise ValueError(f"Unknown scenario: {name}")
+
+        wall = time.perf_counter() - started_wall
+        cpu = time.process_time() - started_cpu
+
+    result = _aggregate(traces, wall, cpu)
+    result["scenario"] = name
+    return result
+
+
+def run_benchmark(scenarios: List[str], params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run the requested scenarios, each in a fresh process.
+
+    Args:
+        scenarios (List[str]): Scenario names from SCENARIOS
+        params (Dict[str, Any]): Workload and fake model parameters
+
+    Returns:
+        Dict[str, Any]: Run metadata and per-scenario results
+    """
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for name in scenarios:
+        queue = context.Queue()
+        process = context.Process(target=_run_scenario, args=(name, params, queue))
+        process.start()
+        try:
+            results[name] = queue.get(timeout=params["timeout"])
+        except Exception:
+            results[name] = {"scenario": name, "error": "benchmark process failed or timed out"}
+        process.join(timeout=10)
+        if process.is_alive():
+            process.terminate()
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "params": params
+        },
+        "scenarios": results
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compare two benchmark reports.
+
+    A scenario regresses when its p95 latency grows, or its throughput drops,
+    by more than ``threshold`` (a fraction, e.g. 0.1 for 10%).
+
+    Args:
+        baseline (Dict[str, Any]): Earlier report
+        current (Dict[str, Any]): New report
+        threshold (float): Allowed relative change
+
+    Returns:
+        List[str]: Human-readable regressions, empty if there are none
+    """
+    regressions = []
+    print(f"\n{'scenario':<12}{'p95 ms':>22}{'req/s':>22}")
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before or "error" in before or "error" in result:
+            continue
+        p95_before, p95_now = before["latency_ms"]["p95"], result["latency_ms"]["p95"]
+        rps_before, rps_now = before["throughput_rps"], result["throughput_rps"]
+        p95_change = (p95_now - p95_before) / p95_before if p95_before else 0.0
+        rps_change = (rps_now - rps_before) / rps_before if rps_before else 0.0
+        print(
+            f"{name:<12}{p95_before:>9} -> {p95_now:<9}{p95_change:>+4.0%}"
+            f"{rps_before:>9} -> {rps_now:<9}{rps_change:>+4.0%}"
+        )
+        if p95_change > threshold:
+            regressions.append(f"{name}: p95 latency {p95_before} ms -> {p95_now} ms ({p95_change:+.0%})")
+        if rps_change < -threshold:
+            regressions.append(f"{name}: throughput {rps_before} -> {rps_now} req/s ({rps_change:+.0%})")
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point."""
+    from benchmarks.fakes import DEFAULT_CORPUS
+
+    parser = argparse.ArgumentParser(description="End-to-end load and summarize benchmark")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios to run")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Directory of *.html pages and transcripts/*.json")
+    parser.add_argument("--repeat", type=int, default=5, help="Passes over the corpus per scenario")
+    parser.add_argument("--users", type=int, default=4, help="Concurrent users in the concurrent scenario")
+    parser.add_argument("--workers", type=int, default=8, help="Batch worker threads")
+    parser.add_argument("--fetch-concurrency", type=int, default=4, help="Batch concurrent fetches")
+    parser.add_argument("--llm-concurrency", type=int, default=2, help="Batch concurrent LLM calls")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Fake model time to first token (s)")
+    parser.add_argument("--llm-tokens-per-second", type=float, default=500.0, help="Fake model generation rate")
+    parser.add_argument("--llm-output-tokens", type=int, default=200, help="Fake model reply length")
+    parser.add_argument("--cache", action="store_true", help="Enable the in-memory content/summary cache")
+    parser.add_argument("--timeout", type=int, default=900, help="Seconds allowed per scenario")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Baseline JSON report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative regression")
+    args = parser.parse_args(argv)
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    params = {
+        "corpus": os.path.abspath(args.corpus),
+        "repeat": args.repeat,
+        "users": args.users,
+        "workers": args.workers,
+        "fetch_concurrency": args.fetch_concurrency,
+        "llm_concurrency": args.llm_concurrency,
+        "llm_latency": args.llm_latency,
+        "llm_tokens_per_second": args.llm_tokens_per_second,
+        "llm_output_tokens": args.llm_output_tokens,
+        "cache": args.cache,
+        "timeout": args.timeout
+    }
+    report = run_benchmark(scenarios, params)
+
+    print(f"{'scenario':<12}{'req':>6}{'err':>5}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'cpu ms/req':>12}{'peak MiB':>10}")
+    for name, result in report["scenarios"].items():
+        if "error" in result:
+            print(f"{name:<12}{result['error']}")
+            continue
+        latency = result["latency_ms"]
+        print(
+            f"{name:<12}{result['requests']:>6}{result['errors']:>5}{result['throughput_rps']:>9}"
+            f"{latency['p50']:>10}{latency['p95']:>10}{latency['p99']:>10}"
+            f"{result['cpu_ms_per_request']:>12}{result['peak_rss_mb']:>10}"
+        )
+        for stage, stats in result["stages"].items():
+            print(f"  {stage:<24}p50 {stats['latency_ms']['p50']:>9} ms  p95 {stats['latency_ms']['p95']:>9} ms  cpu {stats['cpu_ms_mean']:>8} ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        regressions = compare(baseline, report, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
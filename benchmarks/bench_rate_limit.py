@@ -0,0 +1,132 @@
+"""
+Rate-limit benchmark against a fake Groq endpoint.
+
+FakeGroqServer (see benchmarks/fakes.py) enforces requests- and
+tokens-per-period limits and answers 429 with Retry-After, like the real API.
+Several sessions then fire LLM calls at it through ChatGroq, once with the
+client's own retries only ("ungoverned") and once through the RateGovernor
+("governed"). The report shows how many calls were rejected with 429, how
+many failed, latency, and how evenly the sessions were served.
+
+The limits use a short period (--period) so a run takes seconds; the governor
+is configured with the same period.
+
+Usage:
+    python -m benchmarks.bench_rate_limit [--sessions 4] [--calls 10] [--rpm 20] [--tpm 4000] [--period 5]
+    python -m benchmarks.bench_rate_limit --modes governed --check
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Any, Dict
+
+
+MODES = ("ungoverned", "governed")
+
+
+def _run_mode(mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Run every session's calls against a fresh fake endpoint."""
+    from langchain_groq import ChatGroq
+    from benchmarks.bench_pipeline import summarize_samples
+    from benchmarks.fakes import FakeGroqServer
+    from src.services.chat_models import GovernedChatModel
+    from src.services.rate_limiter import RateGovernor, rate_limit_session
+
+    with FakeGroqServer(args.rpm, args.tpm, args.period, args.latency, args.completion_tokens) as server:
+        llm = ChatGroq(
+            model="fake",
+            groq_api_key="fake",
+            groq_api_base=server.base_url,
+            max_retries=0 if mode == "governed" else 2
+        )
+        governor = None
+        if mode == "governed":
+            governor = RateGovernor(args.rpm, args.tpm, max_wait_seconds=args.max_wait, period_seconds=args.period)
+            llm = GovernedChatModel(llm=llm, governor=governor, completion_tokens=args.completion_tokens)
+
+        prompt = "Summarize the following text. " + "lorem ipsum dolor sit amet " * args.prompt_words
+        latencies: List[float] = []
+        served: Dict[str, int] = {}
+        errors: Dict[str, int] = {}
+        lock = threading.Lock()
+
+        def session(name: str):
+            with rate_limit_session(name):
+                for _ in range(args.calls):
+                    started = time.perf_counter()
+                    try:
+                        llm.invoke(prompt)
+                    except Exception as e:
+                        with lock:
+                            errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                        continue
+                    with lock:
+                        latencies.append((time.perf_counter() - started) * 1000)
+                        served[name] = served.get(name, 0) + 1
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.sessions) as executor:
+            list(executor.map(session, [f"session-{i}" for i in range(args.sessions)]))
+        wall = time.perf_counter() - started
+
+        return {
+            "calls": args.sessions * args.calls,
+            "completed": len(latencies),
+            "errors": errors,
+            "http_429": server.rejected,
+            "wall_seconds": round(wall, 3),
+            "latency_ms": summarize_samples(latencies),
+            "served_per_session": served,
+            "governor": governor.stats() if governor is not None else None
+        }
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="LLM rate-limit benchmark against a fake Groq endpoint")
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated modes to run")
+    parser.add_argument("--sessions", type=int, default=4, help="Concurrent sessions")
+    parser.add_argument("--calls", type=int, default=10, help="LLM calls per session")
+    parser.add_argument("--rpm", type=int, default=20, help="Requests allowed per period")
+    parser.add_argument("--tpm", type=int, default=4000, help="Tokens allowed per period")
+    parser.add_argument("--period", type=float, default=5.0, help="Limit period in seconds (60 for Groq)")
+    parser.add_argument("--prompt-words", type=int, default=20, help="Prompt size in repetitions of five words")
+    parser.add_argument("--completion-tokens", type=int, default=64, help="Tokens per fake reply")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake endpoint response time (s)")
+    parser.add_argument("--max-wait", type=float, default=120.0, help="Governor max wait per call (s)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if the governed mode received any 429 or failed a call")
+    args = parser.parse_args(argv)
+
+    modes = [name.strip() for name in args.modes.split(",") if name.strip()]
+    unknown = [name for name in modes if name not in MODES]
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(unknown)}")
+
+    report = {name: _run_mode(name, args) for name in modes}
+
+    print(f"{'mode':<12}{'calls':>7}{'done':>7}{'errors':>8}{'429s':>7}{'wall s':>9}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, result in report.items():
+        latency = result["latency_ms"]
+        print(
+            f"{name:<12}{result['calls']:>7}{result['completed']:>7}{sum(result['errors'].values()):>8}"
+            f"{result['http_429']:>7}{result['wall_seconds']:>9}{str(latency['p50']):>10}{str(latency['p95']):>10}"
+        )
+        print(f"  served per session: {json.dumps(result['served_per_session'], sort_keys=True)}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+
+    governed = report.get("governed")
+    if args.check and governed is not None and (governed["http_429"] or governed["errors"]):
+        print("FAIL: the governed mode was rate limited or failed calls")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,325 @@
+"""
+Deterministic stand-ins for external services used by the benchmarks.
+
+- FakeChatModel replaces Groq with a chat model of configurable latency and
+  throughput whose output depends only on its input.
+- FixtureServer serves the benchmark corpus (HTML pages and transcript
+  fixtures) over HTTP on localhost.
+- FakeYoutubeLoader and BenchContentLoader fetch transcripts and video
+  metadata from the fixture server instead of YouTube.
+- FakeGroqServer speaks Groq's chat completions API on localhost and enforces
+  requests- and tokens-per-minute limits, answering 429 with Retry-After.
+"""
+import asyncio
+import functools
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Any, Dict, Iterator, Optional
+from langchain_core.callbacks import CallbackManagerForLLMRun, AsyncCallbackManagerForLLMRun
+from langchain_core.documents import Document
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from src.services.content_loader import ContentLoader
+from src.services.rate_limiter import TokenBucket
+from src.services.summarization import SummarizationService
+from src.services.token_budget import estimate_tokens
+
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+
+# Tokens emitted per sleep while streaming, so very high rates stay accurate
+STREAM_BATCH_TOKENS = 8
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model that answers after a fixed delay at a fixed token rate.
+
+    The reply is built from words of the prompt chosen by a hash of the
+    prompt, so identical inputs always produce identical outputs.
+    """
+
+    first_token_latency: float = 0.05
+    tokens_per_second: float = 500.0
+    output_tokens: int = 200
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-benchmark"
+
+    def _reply_tokens(self, messages: List[BaseMessage]) -> List[str]:
+        """Deterministic reply tokens for a prompt."""
+        text = "\n".join(str(message.content) for message in messages)
+        words = text.split() or ["summary"]
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+        step = 1 + seed % 7
+        return [words[(seed + i * step) % len(words)] + " " for i in range(self.output_tokens)]
+
+    def _generation_seconds(self, token_count: int) -> float:
+        return self.first_token_latency + token_count / self.tokens_per_second
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        tokens = self._reply_tokens(messages)
+        time.sleep(self._generation_seconds(len(tokens)))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(tokens).strip()))])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        tokens = self._reply_tokens(messages)
+        await asyncio.sleep(self._generation_seconds(len(tokens)))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(tokens).strip()))])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        tokens = self._reply_tokens(messages)
+        time.sleep(self.first_token_latency)
+        for start in range(0, len(tokens), STREAM_BATCH_TOKENS):
+            batch = tokens[start:start + STREAM_BATCH_TOKENS]
+            time.sleep(len(batch) / self.tokens_per_second)
+            yield ChatGenerationChunk(message=AIMessageChunk(content="".join(batch)))
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler without per-request logging."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """Serve the benchmark corpus from a background thread on localhost."""
+
+    def __init__(self, corpus_dir: str = DEFAULT_CORPUS):
+        self.corpus_dir = corpus_dir
+        handler = functools.partial(_QuietHandler, directory=corpus_dir)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, name="fixture-server", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def page_urls(self) -> List[str]:
+        """URLs of the HTML pages in the corpus."""
+        return [
+            f"{self.base_url}/{name}"
+            for name in sorted(os.listdir(self.corpus_dir))
+            if name.endswith(".html")
+        ]
+
+    def video_urls(self) -> List[str]:
+        """YouTube URLs for the transcript fixtures, answered by FakeYoutubeLoader."""
+        transcripts_dir = os.path.join(self.corpus_dir, "transcripts")
+        if not os.path.isdir(transcripts_dir):
+            return []
+        return [
+            f"https://www.youtube.com/watch?v={name[:-len('.json')]}"
+            for name in sorted(os.listdir(transcripts_dir))
+            if name.endswith(".json")
+        ]
+
+    def __enter__(self) -> "FixtureServer":
+        self._thread.start()
+        FakeYoutubeLoader.base_url = self.base_url
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _fetch_fixture(base_url: str, video_id: str) -> Dict[str, Any]:
+    """Download a transcript fixture from the fixture server."""
+    with urllib.request.urlopen(f"{base_url}/transcripts/{video_id}.json", timeout=10) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+class FakeYoutubeLoader:
+    """Drop-in for YoutubeLoader that reads transcript fixtures over HTTP."""
+
+    base_url = ""
+
+    def __init__(self, video_id: str, add_video_info: bool = False, language: List[str] = None, transcript_format: Any = None, **kwargs: Any):
+        self.video_id = video_id
+
+    def load(self) -> List[Any]:
+        """Return one document per transcript segment, like TranscriptFormat.LINES."""
+        fixture = _fetch_fixture(self.base_url, self.video_id)
+        return [
+            Document(page_content=segment["text"], metadata={"start": segment["start"], "duration": segment["duration"]})
+            for segment in fixture["segments"]
+        ]
+
+
+class BenchContentLoader(ContentLoader):
+    """ContentLoader that reads YouTube metadata from the fixture server."""
+
+    def _fetch_youtube_video_info(self, video_id: str) -> Dict[str, Any]:
+        info = _fetch_fixture(FakeYoutubeLoader.base_url, video_id)["info"]
+        if self.cache is not None:
+            self.cache.put_video_info(video_id, info)
+        return info
+
+
+class _GroqHandler(BaseHTTPRequestHandler):
+    """Chat completions handler; the server carries the limits and counters."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        endpoint: "FakeGroqServer" = self.server.endpoint
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        prompt = "\n".join(str(message.get("content", "")) for message in request.get("messages", []))
+        prompt_tokens = estimate_tokens(prompt)
+        retry_after = endpoint.admit(prompt_tokens + endpoint.completion_tokens)
+        if retry_after is not None:
+            self._send_json(
+                429,
+                {"error": {"message": "Rate limit reached", "type": "tokens", "code": "rate_limit_exceeded"}},
+                {"retry-after": str(max(1, math.ceil(retry_after)))}
+            )
+            return
+
+        words = prompt.split() or ["summary"]
+        text = " ".join(words[i % len(words)] for i in range(endpoint.completion_tokens))
+        time.sleep(endpoint.latency)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": endpoint.completion_tokens,
+            "total_tokens": prompt_tokens + endpoint.completion_tokens
+        }
+        completion_id = f"chatcmpl-{os.urandom(8).hex()}"
+        if not request.get("stream"):
+            self._send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "fake"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": usage
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        pieces = [{"role": "assistant", "content": ""}] + [{"content": word + " "} for word in text.split()]
+        for index, delta in enumerate(pieces):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.get("model", "fake"),
+                "choices": [{"index": 0, "delta": delta, "finish_reason": "stop" if index == len(pieces) - 1 else None}]
+            }
+            if index == len(pieces) - 1:
+                chunk["x_groq"] = {"usage": usage}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        self.wfile.write(b"data: [DONE]\n\n")
+
+
+class FakeGroqServer:
+    """
+    Local stand-in for Groq's OpenAI-compatible chat completions endpoint.
+
+    Requests over the requests- or tokens-per-period limit get a 429 with a
+    Retry-After header, like the real API. Point ChatGroq at ``base_url``.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 30,
+        tokens_per_minute: int = 6000,
+        period_seconds: float = 60.0,
+        latency: float = 0.05,
+        completion_tokens: int = 64
+    ):
+        self.requests = TokenBucket(requests_per_minute, period_seconds)
+        self.tokens = TokenBucket(tokens_per_minute, period_seconds)
+        self.latency = latency
+        self.completion_tokens = completion_tokens
+        self.accepted = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _GroqHandler)
+        self.server.daemon_threads = True
+        self.server.endpoint = self
+        self._thread = threading.Thread(target=self.server.serve_forever, name="fake-groq", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def admit(self, tokens: int) -> Optional[float]:
+        """Charge a request against the limits, or return seconds to retry after."""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+            if wait > 0:
+                self.rejected += 1
+                return wait
+            self.requests.consume(1, now)
+            self.tokens.consume(tokens, now)
+            self.accepted += 1
+            return None
+
+    def __enter__(self) -> "FakeGroqServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class BenchSummarizationService(SummarizationService):
+    """SummarizationService backed by FakeChatModel instead of Groq."""
+
+    def __init__(self, llm: FakeChatModel, cache: Any = None):
+        self._fake_llm = llm
+        super().__init__(cache=cache)
+
+    def _initialize_llm(self):
+        self.llm = self._fake_llm
+
+
+def install_fakes():
+    """Route the content loader's YouTube transcript fetches to FakeYoutubeLoader."""
+    # ContentLoader imports YoutubeLoader from this module when it first fetches a transcript
+    import langchain_community.document_loaders.youtube as youtube_module
+    youtube_module.YoutubeLoader = FakeYoutubeLoader
@@ -15,6 +15,10 @@ class Config:
     # API Configuration
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
     GROQ_MODEL: str = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
+    GROQ_BASE_URL: str = os.getenv("GROQ_BASE_URL", "")
+    GROQ_MODEL_POOL: str = os.getenv("GROQ_MODEL_POOL", "")
+    SUMMARY_TIER: str = os.getenv("SUMMARY_TIER", "balanced")
+    MODEL_COOLDOWN_SECONDS: int = int(os.getenv("MODEL_COOLDOWN_SECONDS", "30"))
     
     # App Configuration
     APP_TITLE: str = "Content Summarizer"
@@ -29,6 +33,106 @@ class Config:
     MAX_RETRIES: int = 3
     TIMEOUT_SECONDS: int = 30
     
+    # HTTP Fetch Configuration
+    CONNECT_TIMEOUT_SECONDS: int = int(os.getenv("CONNECT_TIMEOUT_SECONDS", "5"))
+    RETRY_BACKOFF_SECONDS: float = float(os.getenv("RETRY_BACKOFF_SECONDS", "0.5"))
+    HTTP_POOL_SIZE: int = int(os.getenv("HTTP_POOL_SIZE", "20"))
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "4"))
+    MAX_RESPONSE_BYTES: int = int(os.getenv("MAX_RESPONSE_BYTES", str(10 * 1024 * 1024)))
+    SSL_VERIFY: bool = os.getenv("SSL_VERIFY", "false").lower() == "true"
+    
+    # HTML Extraction Configuration
+    HTML_EXTRACTOR: str = os.getenv("HTML_EXTRACTOR", "readability")
+    EXTRACTION_MIN_CHARS: int = int(os.getenv("EXTRACTION_MIN_CHARS", "250"))
+    
+    # YouTube Loading Configuration
+    YOUTUBE_METADATA_TIMEOUT_SECONDS: float = float(os.getenv("YOUTUBE_METADATA_TIMEOUT_SECONDS", "5"))
+    YOUTUBE_METADATA_WORKERS: int = int(os.getenv("YOUTUBE_METADATA_WORKERS", "4"))
+    YOUTUBE_TRANSCRIPT_LANGUAGE: str = os.getenv("YOUTUBE_TRANSCRIPT_LANGUAGE", "en")
+    
+    # Transcript Store Configuration
+    TRANSCRIPT_STORE_DIR: str = os.getenv("TRANSCRIPT_STORE_DIR", "")
+    TRANSCRIPT_STORE_MAX_BYTES: int = int(os.getenv("TRANSCRIPT_STORE_MAX_BYTES", str(256 * 1024 * 1024)))
+    TRANSCRIPT_MMAP_THRESHOLD_BYTES: int = int(os.getenv("TRANSCRIPT_MMAP_THRESHOLD_BYTES", str(64 * 1024)))
+    
+    # Summarization Strategy Configuration
+    SUMMARY_STRATEGY: str = os.getenv("SUMMARY_STRATEGY", "auto")
+    PROMPT_VERSION: str = os.getenv("PROMPT_VERSION", "v1")
+    PROMPTS_FILE: str = os.getenv("PROMPTS_FILE", "")
+    STUFF_MAX_TOKENS: int = int(os.getenv("STUFF_MAX_TOKENS", "6000"))
+    CHUNK_SIZE_TOKENS: int = int(os.getenv("CHUNK_SIZE_TOKENS", "3000"))
+    CHUNK_OVERLAP_TOKENS: int = int(os.getenv("CHUNK_OVERLAP_TOKENS", "200"))
+    MAP_MAX_CONCURRENCY: int = int(os.getenv("MAP_MAX_CONCURRENCY", "4"))
+    MAX_INPUT_TOKENS: int = int(os.getenv("MAX_INPUT_TOKENS", "400000"))
+    TOKEN_ESTIMATOR: str = os.getenv("TOKEN_ESTIMATOR", "heuristic")
+    STREAMING_ENABLED: bool = os.getenv("STREAMING_ENABLED", "true").lower() == "true"
+    TEXT_NORMALIZATION_ENABLED: bool = os.getenv("TEXT_NORMALIZATION_ENABLED", "false").lower() == "true"
+    
+    # Extractive Summarization Configuration (0 disables the pre-pass)
+    EXTRACTIVE_METHOD: str = os.getenv("EXTRACTIVE_METHOD", "textrank")
+    EXTRACTIVE_PREPASS_TOKENS: int = int(os.getenv("EXTRACTIVE_PREPASS_TOKENS", "0"))
+    EXTRACTIVE_FALLBACK_ENABLED: bool = os.getenv("EXTRACTIVE_FALLBACK_ENABLED", "false").lower() == "true"
+    
+    # Batch CLI Configuration
+    BATCH_WORKERS: int = int(os.getenv("BATCH_WORKERS", "8"))
+    BATCH_FETCH_CONCURRENCY: int = int(os.getenv("BATCH_FETCH_CONCURRENCY", "4"))
+    BATCH_LLM_CONCURRENCY: int = int(os.getenv("BATCH_LLM_CONCURRENCY", "2"))
+    
+    # Multi-URL Comparison Configuration
+    COMPARE_MAX_URLS: int = int(os.getenv("COMPARE_MAX_URLS", "10"))
+    COMPARE_CONCURRENCY: int = int(os.getenv("COMPARE_CONCURRENCY", "10"))
+    COMPARE_SYNTHESIS_WORD_COUNT: int = int(os.getenv("COMPARE_SYNTHESIS_WORD_COUNT", "400"))
+    
+    # Job Queue Configuration
+    JOB_QUEUE_ENABLED: bool = os.getenv("JOB_QUEUE_ENABLED", "false").lower() == "true"
+    JOB_QUEUE_DB_PATH: str = os.getenv("JOB_QUEUE_DB_PATH", "data/jobs.db")
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_LEASE_SECONDS: float = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+    JOB_RETENTION_SECONDS: float = float(os.getenv("JOB_RETENTION_SECONDS", "86400"))
+    JOB_POLL_INTERVAL_SECONDS: float = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "0.5"))
+    
+    # Tracing and Metrics Configuration
+    TRACE_LOG_ENABLED: bool = os.getenv("TRACE_LOG_ENABLED", "false").lower() == "true"
+    TRACE_PANEL_ENABLED: bool = os.getenv("TRACE_PANEL_ENABLED", "false").lower() == "true"
+    METRICS_PORT: int = int(os.getenv("METRICS_PORT", "0"))
+    METRICS_HOST: str = os.getenv("METRICS_HOST", "127.0.0.1")
+    
+    # LLM Rate Limit Configuration (0 disables a limit)
+    LLM_RATE_LIMIT_ENABLED: bool = os.getenv("LLM_RATE_LIMIT_ENABLED", "true").lower() == "true"
+    GROQ_REQUESTS_PER_MINUTE: int = int(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"))
+    GROQ_TOKENS_PER_MINUTE: int = int(os.getenv("GROQ_TOKENS_PER_MINUTE", "6000"))
+    LLM_RATE_LIMIT_HEADROOM: float = float(os.getenv("LLM_RATE_LIMIT_HEADROOM", "0.9"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "0"))
+    LLM_RATE_LIMIT_MAX_WAIT_SECONDS: int = int(os.getenv("LLM_RATE_LIMIT_MAX_WAIT_SECONDS", "120"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    
+    # Single-flight Configuration
+    SINGLE_FLIGHT_ENABLED: bool = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+    SINGLE_FLIGHT_LOCK_DIR: str = os.getenv("SINGLE_FLIGHT_LOCK_DIR", "")
+    SINGLE_FLIGHT_TIMEOUT_SECONDS: int = int(os.getenv("SINGLE_FLIGHT_TIMEOUT_SECONDS", "300"))
+    
+    # Cache Configuration
+    CACHE_ENABLED: bool = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "256"))
+    CACHE_TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", "86400"))
+    CACHE_DB_PATH: str = os.getenv("CACHE_DB_PATH", "")
+    CACHE_DB_MAX_ENTRIES: int = int(os.getenv("CACHE_DB_MAX_ENTRIES", "10000"))
+    
+    # Near-duplicate Summary Reuse (needs the cache)
+    NEAR_DUPLICATE_ENABLED: bool = os.getenv("NEAR_DUPLICATE_ENABLED", "true").lower() == "true"
+    NEAR_DUPLICATE_THRESHOLD: float = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.9"))
+    NEAR_DUPLICATE_MAX_ENTRIES: int = int(os.getenv("NEAR_DUPLICATE_MAX_ENTRIES", "1000000"))
+    
+    # Summary Archive Configuration
+    ARCHIVE_ENABLED: bool = os.getenv("ARCHIVE_ENABLED", "false").lower() == "true"
+    ARCHIVE_DIR: str = os.getenv("ARCHIVE_DIR", "data/archive")
+    ARCHIVE_EMBEDDING_MODEL: str = os.getenv("ARCHIVE_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+    ARCHIVE_BATCH_SIZE: int = int(os.getenv("ARCHIVE_BATCH_SIZE", "64"))
+    ARCHIVE_FLUSH_SECONDS: float = float(os.getenv("ARCHIVE_FLUSH_SECONDS", "5"))
+    ARCHIVE_MAX_SEGMENTS: int = int(os.getenv("ARCHIVE_MAX_SEGMENTS", "8"))
+    ARCHIVE_SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("ARCHIVE_SEMANTIC_CACHE_THRESHOLD", "0"))
+    
     # Content Types
     SUPPORTED_CONTENT_TYPES: Dict[str, str] = {
         "youtube": "🎥 YouTube Video",
@@ -49,7 +153,8 @@ class Config:
     def validate_config(cls) -> bool:
         """Validate required configuration."""
         if not cls.GROQ_API_KEY:
-            return False
+            # Extractive summaries need no API key
+            return cls.SUMMARY_STRATEGY == "extractive" or cls.EXTRACTIVE_FALLBACK_ENABLED
         return True
     
     @classmethod
@@ -2,10 +2,6 @@ import validators, streamlit as st
 import os
 import traceback
 import re
-from langchain.prompts import PromptTemplate
-from langchain_groq import ChatGroq
-from langchain.chains.summarize import load_summarize_chain
-from langchain_community.document_loaders import YoutubeLoader, UnstructuredURLLoader
 
 # Load environment variables
 from dotenv import load_dotenv
@@ -272,12 +268,13 @@ if not groq_api_key:
     st.markdown('<div class="status-error">❌ Groq API Key not found in environment variables. Please set GROQ_API_KEY in your .env file.</div>', unsafe_allow_html=True)
     st.stop()
 
-# Initialize LLM
-try:
-    llm = ChatGroq(model="llama-3.1-8b-instant", groq_api_key=groq_api_key)
-except Exception as e:
-    st.markdown(f'<div class="status-error">❌ Failed to initialize Groq API: {str(e)}</div>', unsafe_allow_html=True)
-    st.stop()
+# LangChain and the loaders take seconds to import, so they are imported when
+# the first URL is processed instead of before the page is drawn
+@st.cache_resource
+def get_llm(api_key):
+    """Create the Groq client once per process"""
+    from langchain_groq import ChatGroq
+    return ChatGroq(model="llama-3.1-8b-instant", groq_api_key=api_key)
 
 # Header Section with Animated Logo
 st.markdown("""
@@ -378,6 +375,10 @@ with col2:
         if validators.url(generic_url):
             with st.spinner("🔄 Processing your content... This may take a moment."):
                 try:
+                    from langchain.prompts import PromptTemplate
+                    from langchain.chains.summarize import load_summarize_chain
+                    from langchain_community.document_loaders import YoutubeLoader, UnstructuredURLLoader
+                    
                     # Determine content type
                     content_type = "🎥 YouTube Video" if is_youtube_url(generic_url) else "🌐 Website Article"
                     
@@ -425,6 +426,11 @@ with col2:
                         """
                         prompt = PromptTemplate(template=prompt_template, input_variables=["text"])
                         
+                        try:
+                            llm = get_llm(groq_api_key)
+                        except Exception as e:
+                            st.markdown(f'<div class="status-error">❌ Failed to initialize Groq API: {str(e)}</div>', unsafe_allow_html=True)
+                            st.stop()
                         chain = load_summarize_chain(llm, chain_type="stuff", prompt=prompt)
                         output_summary = chain.invoke({"input_documents": docs})
                         
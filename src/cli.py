@@ -0,0 +1,397 @@
+"""
+Command-line interface for headless batch summarization.
+
+Usage:
+    python -m src.cli batch urls.txt --output results.jsonl
+    python -m src.cli compare urls.txt --output comparison.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Set
+from config.settings import Config
+from src.services import (
+    ContentLoader,
+    ContentLoaderError,
+    SummarizationService,
+    SummarizationError,
+    compare_urls,
+    get_service_registry
+)
+from src.services.model_router import MODEL_TIERS
+from src.utils import classify_url, start_trace, span, start_metrics_server
+
+
+def read_urls(path: str) -> List[str]:
+    """
+    Read URLs from a text file, one per line.
+
+    Blank lines and lines starting with '#' are ignored and duplicates are
+    dropped while preserving order.
+
+    Args:
+        path (str): Path to the URL list
+
+    Returns:
+        List[str]: Unique URLs in file order
+    """
+    urls = []
+    seen = set()
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            url = line.strip()
+            if not url or url.startswith("#") or url in seen:
+                continue
+            seen.add(url)
+            urls.append(url)
+    return urls
+
+
+def read_checkpoint(path: str) -> Set[str]:
+    """
+    Read the set of URLs already processed by a previous run.
+
+    Args:
+        path (str): Path to the checkpoint file
+
+    Returns:
+        Set[str]: Completed URLs (empty if the file does not exist)
+    """
+    if not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as handle:
+        return {line.strip() for line in handle if line.strip()}
+
+
+class BatchProgress:
+    """Thread-safe progress and throughput counters for a batch run."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.succeeded = 0
+        self.failed = 0
+        self.started_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, ok: bool):
+        """Record the outcome of one URL."""
+        with self._lock:
+            if ok:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+
+    def report(self) -> str:
+        """
+        Format a one-line progress report.
+
+        Returns:
+            str: Completed/total counts, throughput and ETA
+        """
+        with self._lock:
+            done = self.succeeded + self.failed
+            elapsed = time.monotonic() - self.started_at
+        rate = done / elapsed if elapsed > 0 else 0.0
+        remaining = self.total - done
+        eta = f"{remaining / rate:.0f}s" if rate > 0 else "?"
+        return (
+            f"[{done}/{self.total}] ok={self.succeeded} failed={self.failed} "
+            f"elapsed={elapsed:.1f}s rate={rate:.2f} urls/s eta={eta}"
+        )
+
+
+class BatchRunner:
+    """
+    Summarize a list of URLs with a bounded worker pool.
+
+    Fetching and LLM calls have separate concurrency limits so a slow site
+    cannot starve the LLM stage and bursts do not overload the LLM API.
+    Results are appended to a JSONL file and completed URLs to a checkpoint
+    file, so an interrupted run can be resumed.
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        checkpoint_path: str,
+        workers: int,
+        fetch_concurrency: int,
+        llm_concurrency: int,
+        word_count: int = None,
+        content_loader: ContentLoader = None,
+        summarization_service: SummarizationService = None,
+        tier: str = None
+    ):
+        self.output_path = output_path
+        self.checkpoint_path = checkpoint_path
+        self.workers = workers
+        self.word_count = word_count
+        self.tier = tier
+        if content_loader is None or summarization_service is None:
+            content_loader, summarization_service = get_service_registry().get_services()
+        self.content_loader = content_loader
+        self.summarization_service = summarization_service
+        self._fetch_slots = threading.BoundedSemaphore(fetch_concurrency)
+        self._llm_slots = threading.BoundedSemaphore(llm_concurrency)
+        self._write_lock = threading.Lock()
+
+    def process_url(self, url: str) -> Dict[str, Any]:
+        """
+        Load and summarize a single URL.
+
+        Args:
+            url (str): URL to process
+
+        Returns:
+            Dict[str, Any]: Result record for the JSONL output, including
+                per-stage timings in milliseconds
+        """
+        with start_trace("batch", url=url) as trace:
+            record = self._process_url(url)
+            if record["status"] == "error":
+                trace.mark_error(record["error"])
+        record["trace_id"] = trace.trace_id
+        record["timings_ms"] = trace.stage_durations()
+        return record
+
+    def _process_url(self, url: str) -> Dict[str, Any]:
+        """Load and summarize a single URL inside the current trace."""
+        started = time.monotonic()
+        record = {"url": url}
+
+        with span("validate"):
+            is_valid, parsed_url, error_message = classify_url(url)
+        if not is_valid:
+            record.update({"content_type": None, "status": "error", "error": error_message})
+            return record
+        record.update({"content_type": parsed_url.kind, "canonical_url": parsed_url.canonical_url})
+
+        try:
+            with span("queue.fetch"):
+                self._fetch_slots.acquire()
+            try:
+                with span("load", content_type=parsed_url.kind):
+                    docs = self.content_loader.load_content(parsed_url)
+            finally:
+                self._fetch_slots.release()
+
+            if not self.content_loader.validate_documents(docs):
+                record.update({"status": "error", "error": "No content was extracted from the URL"})
+                return record
+
+            with span("queue.llm"):
+                self._llm_slots.acquire()
+            try:
+                summary_result = self.summarization_service.summarize_content(docs, self.word_count, tier=self.tier)
+            finally:
+                self._llm_slots.release()
+
+            record.update(summary_result)
+            record["status"] = "ok"
+        except (ContentLoaderError, SummarizationError) as e:
+            record.update({"status": "error", "error": str(e)})
+        except Exception as e:
+            record.update({"status": "error", "error": f"Unexpected error: {str(e)}"})
+        finally:
+            record["elapsed_seconds"] = round(time.monotonic() - started, 3)
+
+        return record
+
+    def _write_result(self, record: Dict[str, Any], output, checkpoint):
+        """Append a result and mark its URL as completed."""
+        with self._write_lock:
+            output.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            output.flush()
+            checkpoint.write(record["url"] + "\n")
+            checkpoint.flush()
+
+    def run(self, urls: List[str], progress_interval: float = 5.0) -> BatchProgress:
+        """
+        Process URLs that are not yet in the checkpoint.
+
+        Args:
+            urls (List[str]): URLs to process
+            progress_interval (float): Seconds between progress reports on stderr
+
+        Returns:
+            BatchProgress: Final counters for the run
+        """
+        completed = read_checkpoint(self.checkpoint_path)
+        pending = [url for url in urls if url not in completed]
+        if completed:
+            print(f"Resuming: {len(urls) - len(pending)} of {len(urls)} URLs already done", file=sys.stderr)
+
+        progress = BatchProgress(len(pending))
+        stop_reporting = threading.Event()
+
+        def report_progress():
+            while not stop_reporting.wait(progress_interval):
+                print(progress.report(), file=sys.stderr)
+
+        reporter = threading.Thread(target=report_progress, daemon=True)
+        reporter.start()
+
+        with open(self.output_path, "a", encoding="utf-8") as output, \
+                open(self.checkpoint_path, "a", encoding="utf-8") as checkpoint:
+
+            def handle(url: str):
+                record = self.process_url(url)
+                self._write_result(record, output, checkpoint)
+                progress.record(record["status"] == "ok")
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for future in [executor.submit(handle, url) for url in pending]:
+                    future.result()
+
+        stop_reporting.set()
+        reporter.join()
+        print(progress.report(), file=sys.stderr)
+        return progress
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the command-line argument parser.
+
+    Returns:
+        argparse.ArgumentParser: Configured parser
+    """
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Content Summarizer command-line tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    batch = subparsers.add_parser("batch", help="Summarize every URL in a text file")
+    batch.add_argument("input", help="Text file with one URL per line")
+    batch.add_argument("-o", "--output", default="results.jsonl", help="JSONL file to append results to")
+    batch.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint)")
+    batch.add_argument("--workers", type=int, default=Config.BATCH_WORKERS, help="Worker threads")
+    batch.add_argument(
+        "--fetch-concurrency", type=int, default=Config.BATCH_FETCH_CONCURRENCY,
+        help="Maximum concurrent content fetches"
+    )
+    batch.add_argument(
+        "--llm-concurrency", type=int, default=Config.BATCH_LLM_CONCURRENCY,
+        help="Maximum concurrent summarization calls"
+    )
+    batch.add_argument("--word-count", type=int, default=None, help="Target summary word count")
+    batch.add_argument(
+        "--tier", choices=MODEL_TIERS, default=None,
+        help="Latency/cost tier for model routing (default: SUMMARY_TIER)"
+    )
+    batch.add_argument("--progress-interval", type=float, default=5.0, help="Seconds between progress reports")
+
+    compare = subparsers.add_parser("compare", help="Summarize several URLs and compare them in one synthesis")
+    compare.add_argument("input", help="Text file with one URL per line")
+    compare.add_argument("-o", "--output", help="JSON file to write the comparison to (default: stdout)")
+    compare.add_argument("--word-count", type=int, default=None, help="Target word count of each source summary")
+    compare.add_argument(
+        "--synthesis-word-count", type=int, default=None,
+        help="Target word count of the synthesis (default: COMPARE_SYNTHESIS_WORD_COUNT)"
+    )
+    compare.add_argument(
+        "--concurrency", type=int, default=Config.COMPARE_CONCURRENCY,
+        help="Sources loaded and summarized at once"
+    )
+    compare.add_argument(
+        "--tier", choices=MODEL_TIERS, default=None,
+        help="Latency/cost tier for model routing (default: SUMMARY_TIER)"
+    )
+
+    return parser
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    """
+    Run the batch command.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        int: Process exit code
+    """
+    if not Config.validate_config():
+        print("GROQ_API_KEY is not set", file=sys.stderr)
+        return 2
+
+    # Expose Prometheus metrics for the duration of the run when METRICS_PORT is set
+    start_metrics_server()
+
+    urls = read_urls(args.input)
+    runner = BatchRunner(
+        output_path=args.output,
+        checkpoint_path=args.checkpoint or f"{args.output}.checkpoint",
+        workers=args.workers,
+        fetch_concurrency=args.fetch_concurrency,
+        llm_concurrency=args.llm_concurrency,
+        word_count=args.word_count,
+        tier=args.tier
+    )
+    runner.run(urls, progress_interval=args.progress_interval)
+    return 0
+
+
+def run_compare(args: argparse.Namespace) -> int:
+    """
+    Run the compare command.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        int: Process exit code
+    """
+    if not Config.validate_config():
+        print("GROQ_API_KEY is not set", file=sys.stderr)
+        return 2
+
+    urls = read_urls(args.input)
+    if not 2 <= len(urls) <= Config.COMPARE_MAX_URLS:
+        print(f"Expected between 2 and {Config.COMPARE_MAX_URLS} URLs, got {len(urls)}", file=sys.stderr)
+        return 2
+
+    start_metrics_server()
+
+    def report(index: int, record: Dict[str, Any]):
+        print(f"[{index + 1}/{len(urls)}] {record['stage']}: {record['url']}", file=sys.stderr)
+
+    content_loader, summarization_service = get_service_registry().get_services()
+    comparison = asyncio.run(compare_urls(
+        urls,
+        content_loader,
+        summarization_service,
+        word_count=args.word_count,
+        synthesis_word_count=args.synthesis_word_count,
+        tier=args.tier,
+        concurrency=args.concurrency,
+        on_progress=report
+    ))
+
+    text = json.dumps(comparison, ensure_ascii=False, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    if comparison["synthesis"] is None:
+        print(f"Synthesis failed: {comparison['synthesis_error']}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point."""
+    args = build_parser().parse_args(argv)
+    if args.command == "batch":
+        return run_batch(args)
+    if args.command == "compare":
+        return run_compare(args)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
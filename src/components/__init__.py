@@ -7,10 +7,16 @@ from .ui_components import (
     render_header,
     render_sidebar_info,
     render_url_input,
+    render_mode_selector,
+    render_compare_input,
     render_process_button,
     render_status_message,
     render_summary,
+    render_summary_stream,
+    render_source_progress,
     render_metrics,
+    render_trace_breakdown,
+    render_archive_hits,
     render_troubleshooting,
     render_footer
 )
@@ -20,10 +26,16 @@ __all__ = [
     'render_header',
     'render_sidebar_info',
     'render_url_input',
+    'render_mode_selector',
+    'render_compare_input',
     'render_process_button',
     'render_status_message',
     'render_summary',
+    'render_summary_stream',
+    'render_source_progress',
     'render_metrics',
+    'render_trace_breakdown',
+    'render_archive_hits',
     'render_troubleshooting',
     'render_footer'
 ]
\ No newline at end of file
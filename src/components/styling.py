@@ -170,6 +170,25 @@ def apply_dark_theme():
             border-left: 5px solid #8E2DE2;
         }
         
+        .status-warning {
+            background: linear-gradient(135deg, rgba(247, 151, 30, 0.2) 0%, rgba(255, 210, 0, 0.2) 100%);
+            color: #f7971e;
+            padding: 1.2rem;
+            border-radius: 12px;
+            margin: 1rem 0;
+            border: 1px solid rgba(247, 151, 30, 0.3);
+            border-left: 5px solid #f7971e;
+        }
+        
+        .archive-hit {
+            background: rgba(0, 212, 255, 0.05);
+            padding: 1rem 1.2rem;
+            border-radius: 12px;
+            margin: 0.75rem 0;
+            border: 1px solid rgba(0, 212, 255, 0.15);
+            line-height: 1.5;
+        }
+        
         /* Text styling */
         h1, h2, h3, h4, h5, h6 {
             color: #ffffff !important;
@@ -1,8 +1,10 @@
 """
 UI components for the Streamlit interface.
 """
+import html
+import time
 import streamlit as st
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
 
 
 def render_header():
@@ -101,16 +103,63 @@ def render_url_input() -> str:
     return url
 
 
-def render_process_button() -> bool:
+def render_mode_selector() -> str:
+    """
+    Render the choice between summarizing one URL and comparing several.
+    
+    Returns:
+        str: "single" or "compare"
+    """
+    mode = st.radio(
+        "Mode",
+        ["📄 Single URL", "🔍 Compare Sources"],
+        horizontal=True,
+        label_visibility="collapsed",
+        key="mode_selector"
+    )
+    return "compare" if mode == "🔍 Compare Sources" else "single"
+
+
+def render_compare_input(max_urls: int) -> List[str]:
+    """
+    Render the URL list of a comparison and return the entered URLs.
+    
+    Args:
+        max_urls (int): Most URLs one comparison may include
+        
+    Returns:
+        List[str]: The entered URLs, without blank lines and repeats
+    """
+    st.markdown("### 🔗 Enter Content URLs")
+    
+    text = st.text_area(
+        f"Paste up to {max_urls} YouTube or website URLs, one per line:",
+        placeholder="https://example.com/article\nhttps://www.youtube.com/watch?v=...",
+        height=180,
+        key="compare_input"
+    )
+    
+    urls = []
+    for line in text.splitlines():
+        url = line.strip()
+        if url and url not in urls:
+            urls.append(url)
+    return urls
+
+
+def render_process_button(label: str = "🚀 Generate AI Summary") -> bool:
     """
     Render the process button and return whether it was clicked.
     
+    Args:
+        label (str): Button label
+        
     Returns:
         bool: True if button was clicked
     """
     col_btn1, col_btn2, col_btn3 = st.columns([1, 2, 1])
     with col_btn2:
-        return st.button("🚀 Generate AI Summary", use_container_width=True)
+        return st.button(label, use_container_width=True)
 
 
 def render_status_message(message_type: str, message: str):
@@ -118,23 +167,92 @@ def render_status_message(message_type: str, message: str):
     Render a status message with appropriate styling.
     
     Args:
-        message_type (str): Type of message ('success', 'error', 'info')
+        message_type (str): Type of message ('success', 'error', 'info', 'warning')
         message (str): The message to display
     """
     st.markdown(f'<div class="status-{message_type}">{message}</div>', unsafe_allow_html=True)
 
 
-def render_summary(summary_text: str):
+def render_summary(summary_text: str, heading: str = "📋 AI Summary"):
     """
     Render the summary text in a styled container.
     
     Args:
         summary_text (str): The summary text to display
+        heading (str): Heading shown above the summary
     """
-    st.markdown("### 📋 AI Summary")
+    st.markdown(f"### {heading}")
     st.markdown(f'<div class="summary-card">{summary_text}</div>', unsafe_allow_html=True)
 
 
+def render_summary_stream(tokens: Iterable[str], refresh_interval: float = 0.05) -> str:
+    """
+    Render a summary incrementally as its tokens arrive.
+    
+    Args:
+        tokens (Iterable[str]): Summary tokens in generation order
+        refresh_interval (float): Minimum seconds between redraws
+        
+    Returns:
+        str: The complete summary text
+    """
+    st.markdown("### 📋 AI Summary")
+    placeholder = st.empty()
+    
+    summary_text = ""
+    last_render = 0.0
+    for token in tokens:
+        summary_text += token
+        now = time.monotonic()
+        if now - last_render >= refresh_interval:
+            placeholder.markdown(f'<div class="summary-card">{summary_text}▌</div>', unsafe_allow_html=True)
+            last_render = now
+    
+    placeholder.markdown(f'<div class="summary-card">{summary_text}</div>', unsafe_allow_html=True)
+    return summary_text
+
+
+def render_source_progress(placeholder: Any, index: int, record: Dict[str, Any]):
+    """
+    Show the current stage of one source of a comparison.
+    
+    Args:
+        placeholder (Any): Streamlit placeholder from st.empty() reserved for the source
+        index (int): Position of the source, starting at 0
+        record (Dict[str, Any]): The source's record from compare_urls()
+    """
+    stages = {
+        "queued": ("info", "⏳ Waiting"),
+        "loading": ("info", "📥 Loading content"),
+        "summarizing": ("info", "🧠 Summarizing"),
+        "done": ("success", "✅ Summarized"),
+        "error": ("error", "❌ Failed")
+    }
+    message_type, label = stages.get(record.get("stage"), stages["queued"])
+    message = f"Source {index + 1}: {label} · {html.escape(record['url'])}"
+    if record.get("stage") == "error" and record.get("error"):
+        message += f" · {html.escape(record['error'])}"
+    elif record.get("stage") == "done" and record.get("elapsed_seconds") is not None:
+        message += f" · {record['elapsed_seconds']:.1f}s"
+    placeholder.markdown(f'<div class="status-{message_type}">{message}</div>', unsafe_allow_html=True)
+
+
+def render_metric_card(metric: Dict[str, Any]):
+    """
+    Render a single metric card.
+    
+    Args:
+        metric (Dict[str, Any]): Metric dictionary with icon, value and label
+    """
+    st.markdown(f"""
+    <div class="metric-card">
+        <div style="font-size: 2.5rem; color: #00d4ff;">{metric['icon']}</div>
+        <div style="font-size: 1.8rem; font-weight: bold; color: #ffffff;">{metric['value']}</div>
+        <div style="color: #b0b0b0;">{metric['label']}</div>
+    </div>
+    """, unsafe_allow_html=True)
+
+
 def render_metrics(metrics: List[Dict[str, Any]], content_type: str = ""):
     """
     Render metrics in a grid layout.
@@ -173,13 +291,44 @@ def render_metrics(metrics: List[Dict[str, Any]], content_type: str = ""):
     # Add remaining metrics
     for i, metric in enumerate(metrics[:2]):  # Only take first 2 metrics to fill remaining columns
         with cols[i + 2]:
-            st.markdown(f"""
-            <div class="metric-card">
-                <div style="font-size: 2.5rem; color: #00d4ff;">{metric['icon']}</div>
-                <div style="font-size: 1.8rem; font-weight: bold; color: #ffffff;">{metric['value']}</div>
-                <div style="color: #b0b0b0;">{metric['label']}</div>
-            </div>
-            """, unsafe_allow_html=True)
+            render_metric_card(metric)
+
+
+def render_trace_breakdown(metrics: List[Dict[str, Any]]):
+    """
+    Render per-stage timings of a request in a collapsible panel.
+    
+    Args:
+        metrics (List[Dict[str, Any]]): Metrics from format_trace_for_display()
+    """
+    with st.expander("⏱️ Request Breakdown"):
+        for row_start in range(0, len(metrics), 4):
+            cols = st.columns(4)
+            for col, metric in zip(cols, metrics[row_start:row_start + 4]):
+                with col:
+                    render_metric_card(metric)
+
+
+def render_archive_hits(hits: List[Dict[str, Any]], heading: str):
+    """
+    Render archived summaries found by a search.
+    
+    Args:
+        hits (List[Dict[str, Any]]): Hits with title, source, score and summary
+        heading (str): Heading shown above the hits
+    """
+    st.markdown(f"### {heading}")
+    for hit in hits:
+        source = html.escape(hit["source"] or "")
+        title = html.escape(hit["title"] or hit["source"] or "Untitled")
+        link = f'<a href="{source}" target="_blank">{title}</a>' if source.startswith("http") else title
+        st.markdown(f"""
+        <div class="archive-hit">
+            <div style="font-weight: bold; color: #ffffff;">{link}</div>
+            <div style="color: #00d4ff; font-size: 0.85rem;">{hit['score']:.0%} similar</div>
+            <div>{html.escape(hit['summary'])}</div>
+        </div>
+        """, unsafe_allow_html=True)
 
 
 def render_troubleshooting():
@@ -3,11 +3,39 @@ Service modules for the Content Summarizer application.
 """
 
 from .content_loader import ContentLoader, ContentLoaderError
-from .summarization import SummarizationService, SummarizationError
+from .summarization import SummarizationService, SummarizationError, SummaryStream
+from .rate_limiter import RateGovernor, RateLimitError, get_rate_governor, rate_limit_session
+from .pipeline import compare_urls, summarize_urls
+from .job_queue import Job, JobQueue, JobQueueError, JobWorker, get_job_queue
+from .summary_archive import ArchiveHit, SummaryArchive, SummaryArchiveError, get_summary_archive
+from .prompts import PromptLibrary, PromptLibraryError, PromptVersion, get_prompt_library
+from .registry import ServiceRegistry, get_service_registry
 
 __all__ = [
     'ContentLoader',
     'ContentLoaderError',
     'SummarizationService', 
-    'SummarizationError'
+    'SummarizationError',
+    'SummaryStream',
+    'RateGovernor',
+    'RateLimitError',
+    'get_rate_governor',
+    'rate_limit_session',
+    'Job',
+    'JobQueue',
+    'JobQueueError',
+    'JobWorker',
+    'get_job_queue',
+    'ArchiveHit',
+    'SummaryArchive',
+    'SummaryArchiveError',
+    'get_summary_archive',
+    'PromptLibrary',
+    'PromptLibraryError',
+    'PromptVersion',
+    'get_prompt_library',
+    'ServiceRegistry',
+    'get_service_registry',
+    'compare_urls',
+    'summarize_urls'
 ]
\ No newline at end of file
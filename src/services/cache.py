@@ -0,0 +1,488 @@
+"""
+Two-tier caching for fetched documents and generated summaries.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Any, Dict, Optional
+from config.settings import Config
+from src.utils.url_utils import normalize_url
+from src.utils.tracing import record_cache
+from .near_duplicates import NearDuplicateIndex
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache with per-entry TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a value, refreshing its recency.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[Any]: Cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any):
+        """
+        Store a value, evicting the least recently used entries if full.
+
+        Args:
+            key (str): Cache key
+            value (Any): Value to store
+        """
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """
+    On-disk cache tier backed by SQLite.
+
+    Values are stored as JSON text. Entries expire after the TTL and the least
+    recently accessed rows are evicted once the entry limit is exceeded.
+    """
+
+    def __init__(self, db_path: str, max_entries: int, ttl_seconds: int):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_access ON cache(last_access)")
+        self._conn.commit()
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """
+        Get a value from the disk tier.
+
+        Args:
+            namespace (str): Logical cache namespace
+            key (str): Cache key
+
+        Returns:
+            Optional[Any]: Decoded value, or None if missing or expired
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE cache SET last_access = ? WHERE namespace = ? AND key = ?",
+                (now, namespace, key)
+            )
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any):
+        """
+        Store a value in the disk tier.
+
+        Args:
+            namespace (str): Logical cache namespace
+            key (str): Cache key
+            value (Any): JSON-serializable value
+        """
+        now = time.time()
+        payload = json.dumps(value, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, payload, now + self.ttl_seconds, now)
+            )
+            self._conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+            self._conn.execute(
+                """
+                DELETE FROM cache WHERE rowid IN (
+                    SELECT rowid FROM cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+
+class TieredCache:
+    """Memory LRU tier in front of an optional SQLite tier, with hit/miss counters."""
+
+    def __init__(self, namespace: str, memory: LRUCache, disk: Optional[SQLiteCache] = None):
+        self.namespace = namespace
+        self.memory = memory
+        self.disk = disk
+        self._counter_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look a key up in memory first, then on disk (promoting disk hits).
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[Any]: Cached value, or None on a miss
+        """
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(self.namespace, key)
+            if value is not None:
+                self.memory.set(key, value)
+                with self._counter_lock:
+                    self.disk_hits += 1
+        with self._counter_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        record_cache(self.namespace, value is not None)
+        return value
+
+    def peek(self, key: str) -> Optional[Any]:
+        """
+        Look a key up in memory, then on disk, without touching the counters.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[Any]: Cached value, or None on a miss
+        """
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(self.namespace, key)
+            if value is not None:
+                self.memory.set(key, value)
+        return value
+
+    def set(self, key: str, value: Any):
+        """
+        Store a value in all tiers.
+
+        Args:
+            key (str): Cache key
+            value (Any): JSON-serializable value
+        """
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(self.namespace, key, value)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get hit/miss counters for this cache.
+
+        Returns:
+            Dict[str, int]: Hits, misses, disk hits and current memory size
+        """
+        with self._counter_lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "memory_entries": len(self.memory)
+            }
+
+
+def serialize_documents(docs: List[Any]) -> List[Dict[str, Any]]:
+    """Convert LangChain documents to plain dictionaries."""
+    return [
+        {"page_content": doc.page_content, "metadata": dict(getattr(doc, "metadata", {}) or {})}
+        for doc in docs
+    ]
+
+
+def deserialize_documents(items: List[Dict[str, Any]]) -> List[Any]:
+    """Rebuild LangChain documents from plain dictionaries."""
+    from langchain_core.documents import Document
+    return [Document(page_content=item["page_content"], metadata=item["metadata"]) for item in items]
+
+
+class ContentCache:
+    """
+    Cache for fetched documents and generated summaries.
+
+    Documents are keyed by normalized URL. Summaries are content-addressed: the key
+    is a hash of the document text, the model and the prompt, so the same text
+    reached through different URLs shares one summary. YouTube transcripts and
+    video metadata are cached separately, keyed by video ID, so either can be
+    reused when the other has to be fetched again. With NEAR_DUPLICATE_ENABLED,
+    summaries are also found by the fingerprint of their text, so a mirrored
+    copy with small differences reuses the summary of the first copy.
+    """
+    
+    NEAR_DUPLICATES_NAMESPACE = "near_duplicates"
+
+    DOCUMENTS_NAMESPACE = "documents"
+    SUMMARIES_NAMESPACE = "summaries"
+    TRANSCRIPTS_NAMESPACE = "transcripts"
+    VIDEO_INFO_NAMESPACE = "video_info"
+
+    def __init__(
+        self,
+        max_entries: int = None,
+        ttl_seconds: int = None,
+        db_path: str = None,
+        db_max_entries: int = None
+    ):
+        self.config = Config()
+        max_entries = max_entries or self.config.CACHE_MAX_ENTRIES
+        ttl_seconds = ttl_seconds or self.config.CACHE_TTL_SECONDS
+        db_path = self.config.CACHE_DB_PATH if db_path is None else db_path
+        db_max_entries = db_max_entries or self.config.CACHE_DB_MAX_ENTRIES
+
+        disk = SQLiteCache(db_path, db_max_entries, ttl_seconds) if db_path else None
+        self.documents = TieredCache(self.DOCUMENTS_NAMESPACE, LRUCache(max_entries, ttl_seconds), disk)
+        self.summaries = TieredCache(self.SUMMARIES_NAMESPACE, LRUCache(max_entries, ttl_seconds), disk)
+        self.transcripts = TieredCache(self.TRANSCRIPTS_NAMESPACE, LRUCache(max_entries, ttl_seconds), disk)
+        self.video_info = TieredCache(self.VIDEO_INFO_NAMESPACE, LRUCache(max_entries, ttl_seconds), disk)
+        self.near_duplicates = NearDuplicateIndex(db_path=db_path) if self.config.NEAR_DUPLICATE_ENABLED else None
+
+    def get_documents(self, url: str) -> Optional[List[Any]]:
+        """
+        Get cached documents for a URL.
+
+        Args:
+            url (str): Source URL
+
+        Returns:
+            Optional[List[Any]]: Cached documents, or None on a miss
+        """
+        items = self.documents.get(normalize_url(url))
+        if items is None:
+            return None
+        return deserialize_documents(items)
+
+    def put_documents(self, url: str, docs: List[Any]):
+        """
+        Cache documents fetched from a URL.
+
+        Args:
+            url (str): Source URL
+            docs (List[Any]): Loaded documents
+        """
+        self.documents.set(normalize_url(url), serialize_documents(docs))
+
+    def get_transcript(self, video_id: str, language: str = "en") -> Optional[List[Any]]:
+        """
+        Get cached transcript documents for a YouTube video.
+
+        Args:
+            video_id (str): YouTube video ID
+            language (str): Transcript language code
+
+        Returns:
+            Optional[List[Any]]: Cached transcript documents, or None on a miss
+        """
+        items = self.transcripts.get(f"{video_id}/{language}")
+        if items is None:
+            return None
+        return deserialize_documents(items)
+
+    def put_transcript(self, video_id: str, docs: List[Any], language: str = "en"):
+        """
+        Cache transcript documents for a YouTube video.
+
+        Args:
+            video_id (str): YouTube video ID
+            docs (List[Any]): Transcript documents, without video metadata
+            language (str): Transcript language code
+        """
+        self.transcripts.set(f"{video_id}/{language}", serialize_documents(docs))
+
+    def get_video_info(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached metadata for a YouTube video.
+
+        Args:
+            video_id (str): YouTube video ID
+
+        Returns:
+            Optional[Dict[str, Any]]: Cached metadata, or None on a miss
+        """
+        info = self.video_info.get(video_id)
+        return dict(info) if info is not None else None
+
+    def put_video_info(self, video_id: str, info: Dict[str, Any]):
+        """
+        Cache metadata for a YouTube video.
+
+        Args:
+            video_id (str): YouTube video ID
+            info (Dict[str, Any]): Title, author, publish date and similar fields
+        """
+        self.video_info.set(video_id, info)
+
+    @staticmethod
+    def summary_key(
+        documents: List[Any],
+        model: str,
+        prompt: str,
+        word_count: int,
+        strategy: str = "stuff",
+        prompt_version: str = None
+    ) -> str:
+        """
+        Build a content-addressed key for a summary.
+
+        Args:
+            documents (List[Any]): Documents being summarized
+            model (str): Model name
+            prompt (str): Prompt template text
+            word_count (int): Target word count
+            strategy (str): Summarization strategy
+            prompt_version (str, optional): Name of the prompt version
+
+        Returns:
+            str: Hex digest identifying the summary request
+        """
+        digest = hashlib.sha256()
+        for doc in documents:
+            digest.update(doc.page_content.encode("utf-8"))
+            digest.update(b"\x00")
+        digest.update(f"\x01{model}\x01{prompt}\x01{word_count}\x01{strategy}".encode("utf-8"))
+        if prompt_version is not None:
+            digest.update(f"\x01{prompt_version}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_summary(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached summary result.
+
+        Args:
+            key (str): Key from summary_key()
+
+        Returns:
+            Optional[Dict[str, Any]]: Cached summary result, or None on a miss
+        """
+        result = self.summaries.get(key)
+        return dict(result) if result is not None else None
+
+    def put_summary(self, key: str, result: Dict[str, Any]):
+        """
+        Cache a summary result.
+
+        Args:
+            key (str): Key from summary_key()
+            result (Dict[str, Any]): Summary result dictionary
+        """
+        self.summaries.set(key, result)
+
+    def get_near_duplicate_summary(self, fingerprint: int, variant: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached summary of a document nearly identical to the one fingerprinted.
+
+        Args:
+            fingerprint (int): Document fingerprint from simhash()
+            variant (int): Request variant from NearDuplicateIndex.variant()
+
+        Returns:
+            Optional[Dict[str, Any]]: Cached summary result with a
+                ``near_duplicate`` entry (source and similarity of the matched
+                document), or None on a miss
+        """
+        if self.near_duplicates is None:
+            return None
+        match = self.near_duplicates.lookup(fingerprint, variant)
+        # Probes are counted as near-duplicate lookups, not summary cache traffic
+        result = self.summaries.peek(match.summary_key) if match is not None else None
+        record_cache(self.NEAR_DUPLICATES_NAMESPACE, result is not None)
+        if result is None:
+            return None
+        result = dict(result)
+        result["near_duplicate"] = {
+            "source": result.get("source"),
+            "similarity": round(match.similarity, 4),
+            "fingerprint": f"{match.fingerprint:016x}"
+        }
+        return result
+
+    def put_fingerprint(self, fingerprint: int, variant: int, key: str):
+        """
+        Index a cached summary by the fingerprint of its document.
+
+        Args:
+            fingerprint (int): Document fingerprint from simhash()
+            variant (int): Request variant from NearDuplicateIndex.variant()
+            key (str): Key from summary_key() the summary is cached under
+        """
+        if self.near_duplicates is not None:
+            self.near_duplicates.add(fingerprint, variant, key)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get hit/miss counters for all caches.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Counters keyed by cache name
+        """
+        return {
+            self.DOCUMENTS_NAMESPACE: self.documents.stats(),
+            self.SUMMARIES_NAMESPACE: self.summaries.stats(),
+            self.TRANSCRIPTS_NAMESPACE: self.transcripts.stats(),
+            self.VIDEO_INFO_NAMESPACE: self.video_info.stats(),
+            self.NEAR_DUPLICATES_NAMESPACE: self.near_duplicates.stats() if self.near_duplicates is not None else {}
+        }
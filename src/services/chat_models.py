@@ -0,0 +1,351 @@
+"""
+LangChain chat model adapters for rate limiting and model routing.
+
+These wrap the per-model ChatGroq clients built by SummarizationService:
+RoutedChatModel sends each call to a model of the request's route, and
+GovernedChatModel runs each call through the RateGovernor. They live apart
+from the router and the governor because subclassing BaseChatModel imports
+most of LangChain, which only the summarizer needs.
+"""
+import asyncio
+import time
+from typing import List, Any, Dict, Iterator, AsyncIterator, Optional
+from langchain_core.callbacks import CallbackManagerForLLMRun, AsyncCallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from src.utils.tracing import span, increment
+from .model_router import ModelRouterError, current_route
+from .rate_limiter import DEFAULT_RETRY_AFTER_SECONDS, SERVER_ERROR_BACKOFF_SECONDS, Permit
+from .token_budget import estimate_tokens
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    """Whether an API error is a 429 rate-limit response."""
+    return getattr(error, "status_code", None) == 429 or type(error).__name__ == "RateLimitError"
+
+
+def _retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    """
+    How long to wait before retrying a failed call, or None if it should not be retried.
+
+    429 responses wait for their Retry-After header; server and connection
+    errors back off exponentially.
+    """
+    status = getattr(error, "status_code", None)
+    if _is_rate_limited(error):
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        try:
+            return max(0.0, float(headers.get("retry-after")))
+        except (TypeError, ValueError):
+            return DEFAULT_RETRY_AFTER_SECONDS * (2 ** attempt)
+    if (status is not None and status >= 500) or "Connection" in type(error).__name__ or "Timeout" in type(error).__name__:
+        return SERVER_ERROR_BACKOFF_SECONDS * (2 ** attempt)
+    return None
+
+
+def _usage_tokens(message: Any) -> Optional[int]:
+    """Total tokens the API reported for a response, if any."""
+    usage = getattr(message, "usage_metadata", None)
+    if usage and usage.get("total_tokens"):
+        return int(usage["total_tokens"])
+    return None
+
+
+class GovernedChatModel(BaseChatModel):
+    """
+    Chat model that runs every call of the wrapped model through a RateGovernor.
+
+    Each call reserves its estimated prompt tokens plus ``completion_tokens``
+    from the token budget, and settles the reservation with the usage the API
+    reports. Rate-limited and failed calls are retried up to ``max_retries``
+    times; a 429 pauses every caller for its Retry-After. Streaming calls are
+    only retried before their first chunk.
+    """
+
+    llm: BaseChatModel
+    governor: Any
+    completion_tokens: int = 512
+    max_retries: int = 3
+
+    @property
+    def _llm_type(self) -> str:
+        return f"governed-{self.llm._llm_type}"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return self.llm._identifying_params
+
+    def _estimate(self, messages: List[BaseMessage]) -> int:
+        return estimate_tokens("\n".join(str(message.content) for message in messages)) + self.completion_tokens
+
+    def _acquire(self, messages: List[BaseMessage]) -> Permit:
+        with span("llm.rate_limit") as attributes:
+            permit = self.governor.acquire(self._estimate(messages))
+            attributes["waited_ms"] = round(permit.waited * 1000, 3)
+        return permit
+
+    async def _aacquire(self, messages: List[BaseMessage]) -> Permit:
+        with span("llm.rate_limit") as attributes:
+            permit = await self.governor.aacquire(self._estimate(messages))
+            attributes["waited_ms"] = round(permit.waited * 1000, 3)
+        return permit
+
+    def _on_failure(self, error: Exception, attempt: int) -> Optional[float]:
+        """Record a failed attempt and return the retry delay, or None to give up."""
+        delay = _retry_delay(error, attempt) if attempt < self.max_retries else None
+        if delay is not None and _is_rate_limited(error):
+            # Everyone waits out the Retry-After, not just this caller
+            self.governor.pause(delay)
+            increment("llm_throttled")
+            return 0.0
+        return delay
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        attempt = 0
+        while True:
+            permit = self._acquire(messages)
+            usage = None
+            try:
+                result = self.llm._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+                usage = _usage_tokens(result.generations[0].message) if result.generations else None
+                return result
+            except Exception as e:
+                delay = self._on_failure(e, attempt)
+                if delay is None:
+                    raise
+            finally:
+                # Also runs when the call is cancelled, which is not an Exception
+                permit.release(usage)
+            time.sleep(delay)
+            attempt += 1
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        attempt = 0
+        while True:
+            permit = await self._aacquire(messages)
+            usage = None
+            try:
+                result = await self.llm._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+                usage = _usage_tokens(result.generations[0].message) if result.generations else None
+                return result
+            except Exception as e:
+                delay = self._on_failure(e, attempt)
+                if delay is None:
+                    raise
+            finally:
+                # Also runs when the call is cancelled, which is not an Exception
+                permit.release(usage)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        attempt = 0
+        while True:
+            permit = self._acquire(messages)
+            usage = None
+            started = False
+            try:
+                for chunk in self.llm._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    started = True
+                    usage = _usage_tokens(chunk.message) or usage
+                    yield chunk
+                return
+            except Exception as e:
+                delay = None if started else self._on_failure(e, attempt)
+                if delay is None:
+                    raise
+            finally:
+                permit.release(usage)
+            time.sleep(delay)
+            attempt += 1
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        attempt = 0
+        while True:
+            permit = await self._aacquire(messages)
+            usage = None
+            started = False
+            try:
+                async for chunk in self.llm._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    started = True
+                    usage = _usage_tokens(chunk.message) or usage
+                    yield chunk
+                return
+            except Exception as e:
+                delay = None if started else self._on_failure(e, attempt)
+                if delay is None:
+                    raise
+            finally:
+                permit.release(usage)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+class RoutedChatModel(BaseChatModel):
+    """
+    Chat model that sends each call to a model of the active route.
+
+    The route comes from use_route(); calls made outside one are routed on
+    their own size. A failed call is retried on the next candidate that fits
+    it, and every attempt is recorded with the router. Streaming calls only
+    fall back before their first chunk. A 429 is raised at once and not
+    counted against the model: the rate limit is the account's, so other
+    candidates would hit it too, and GovernedChatModel waits out its
+    Retry-After.
+    """
+
+    models: Dict[str, BaseChatModel]
+    router: Any
+
+    @property
+    def _llm_type(self) -> str:
+        return "routed-chat-model"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"models": sorted(self.models)}
+
+    def _plan_call(self, messages: List[BaseMessage]):
+        """The active route and the candidates for this call, with its token estimate."""
+        prompt_tokens = estimate_tokens("\n".join(str(message.content) for message in messages))
+        route = current_route()
+        if route is None:
+            route = self.router.route(prompt_tokens, 0)
+        call_tokens = prompt_tokens + route.output_tokens
+        candidates = [m for m in self.router.candidates_for(route, call_tokens) if m.name in self.models]
+        if not candidates:
+            raise ModelRouterError("No configured model is available for this call")
+        return route, candidates, call_tokens
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        route, candidates, call_tokens = self._plan_call(messages)
+        last_error = None
+        for model in candidates:
+            started = time.perf_counter()
+            try:
+                result = self.models[model.name]._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except Exception as e:
+                if _is_rate_limited(e):
+                    raise
+                self.router.record(model.name, time.perf_counter() - started, call_tokens, error=True)
+                last_error = e
+                continue
+            self.router.record(model.name, time.perf_counter() - started, call_tokens)
+            route.record_use(model.name)
+            return result
+        raise last_error
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        route, candidates, call_tokens = self._plan_call(messages)
+        last_error = None
+        for model in candidates:
+            started = time.perf_counter()
+            try:
+                result = await self.models[model.name]._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except Exception as e:
+                if _is_rate_limited(e):
+                    raise
+                self.router.record(model.name, time.perf_counter() - started, call_tokens, error=True)
+                last_error = e
+                continue
+            self.router.record(model.name, time.perf_counter() - started, call_tokens)
+            route.record_use(model.name)
+            return result
+        raise last_error
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        route, candidates, call_tokens = self._plan_call(messages)
+        last_error = None
+        for model in candidates:
+            started = time.perf_counter()
+            streamed = False
+            try:
+                for chunk in self.models[model.name]._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    if not streamed:
+                        streamed = True
+                        route.record_use(model.name)
+                    yield chunk
+            except Exception as e:
+                if _is_rate_limited(e):
+                    raise
+                self.router.record(model.name, time.perf_counter() - started, call_tokens, error=True)
+                if streamed:
+                    raise
+                last_error = e
+                continue
+            self.router.record(model.name, time.perf_counter() - started, call_tokens)
+            return
+        raise last_error
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        route, candidates, call_tokens = self._plan_call(messages)
+        last_error = None
+        for model in candidates:
+            started = time.perf_counter()
+            streamed = False
+            try:
+                async for chunk in self.models[model.name]._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    if not streamed:
+                        streamed = True
+                        route.record_use(model.name)
+                    yield chunk
+            except Exception as e:
+                if _is_rate_limited(e):
+                    raise
+                self.router.record(model.name, time.perf_counter() - started, call_tokens, error=True)
+                if streamed:
+                    raise
+                last_error = e
+                continue
+            self.router.record(model.name, time.perf_counter() - started, call_tokens)
+            return
+        raise last_error
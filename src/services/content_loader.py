@@ -1,10 +1,22 @@
 """
 Content loading services for different types of URLs.
 """
-from typing import List, Any, Optional
-from langchain_community.document_loaders import YoutubeLoader, UnstructuredURLLoader
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Union
 from config.settings import Config
-from src.utils.url_utils import is_youtube_url
+from src.utils.url_utils import ParsedURL, parse_url
+from src.utils.tracing import span, increment
+from .cache import ContentCache, serialize_documents, deserialize_documents
+from .extractors import ContentExtractor, create_extractor
+from .http_fetcher import FetchResult, HttpFetcher
+from .single_flight import SingleFlight
+from .transcript_store import Transcript, TranscriptStore, TranscriptStoreError
+
+
+# Media types handed to the HTML extractor; anything else is partitioned by type
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
 
 
 class ContentLoaderError(Exception):
@@ -15,15 +27,150 @@ class ContentLoaderError(Exception):
 class ContentLoader:
     """Service class for loading content from various sources."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[ContentCache] = None,
+        fetcher: Optional[HttpFetcher] = None,
+        extractor: Optional[ContentExtractor] = None,
+        transcript_store: Optional[TranscriptStore] = None,
+        single_flight: Optional[SingleFlight] = None
+    ):
         self.config = Config()
+        self.cache = cache
+        self.transcript_store = transcript_store
+        self.single_flight = single_flight or SingleFlight()
+        self.fetcher = fetcher or HttpFetcher(revalidate=cache is not None)
+        self.extractor = extractor or create_extractor()
+        
+        self._video_info_executor = ThreadPoolExecutor(
+            max_workers=self.config.YOUTUBE_METADATA_WORKERS,
+            thread_name_prefix="youtube-info"
+        )
+        self._pending_video_info: Dict[str, Future] = {}
+        self._video_info_lock = threading.Lock()
+    
+    def _fetch_youtube_transcript(self, video_id: str) -> List[Any]:
+        """
+        Fetch (or reuse) the transcript documents of a YouTube video.
+        
+        Transcripts are looked up in the in-memory cache, then in the
+        persistent transcript store, and only then downloaded.
+        
+        Args:
+            video_id (str): YouTube video ID
+            
+        Returns:
+            List[Any]: Transcript documents without video metadata
+        """
+        language = self.config.YOUTUBE_TRANSCRIPT_LANGUAGE
+        if self.cache is not None:
+            cached_docs = self.cache.get_transcript(video_id, language)
+            if cached_docs is not None:
+                return cached_docs
+        
+        transcript = self.transcript_store.get(video_id, language) if self.transcript_store is not None else None
+        if transcript is not None:
+            docs = [transcript.to_document()]
+        else:
+            # langchain_community's document loaders take seconds to import
+            from langchain_community.document_loaders.youtube import TranscriptFormat, YoutubeLoader
+            
+            loader = YoutubeLoader(
+                video_id,
+                add_video_info=False,
+                language=[language],
+                transcript_format=TranscriptFormat.LINES
+            )
+            with span("youtube.transcript", video_id=video_id):
+                segments = [
+                    (line.page_content, line.metadata.get("start", 0.0), line.metadata.get("duration", 0.0))
+                    for line in loader.load()
+                ]
+            if not segments:
+                return []
+            transcript = Transcript.from_segments(video_id, language, segments)
+            # The transcript API does not expose its wire size; count the payload
+            increment("bytes_fetched", len(transcript.text.encode("utf-8")))
+            if self.transcript_store is not None:
+                try:
+                    self.transcript_store.put(transcript)
+                except TranscriptStoreError:
+                    pass
+            docs = [transcript.to_document()]
+        
+        if self.cache is not None and self.validate_documents(docs):
+            self.cache.put_transcript(video_id, docs, language)
+        return docs
+    
+    def _fetch_youtube_video_info(self, video_id: str) -> Dict[str, Any]:
+        """
+        Fetch the metadata of a YouTube video with pytube.
+        
+        Mirrors the fields YoutubeLoader adds with add_video_info=True.
+        
+        Args:
+            video_id (str): YouTube video ID
+            
+        Returns:
+            Dict[str, Any]: Title, description, author, publish date and similar fields
+        """
+        from pytube import YouTube
+        
+        yt = YouTube(f"https://www.youtube.com/watch?v={video_id}")
+        info = {
+            "title": yt.title or "Unknown",
+            "description": yt.description or "Unknown",
+            "view_count": yt.views or 0,
+            "thumbnail_url": yt.thumbnail_url or "Unknown",
+            "publish_date": yt.publish_date.strftime("%Y-%m-%d %H:%M:%S") if yt.publish_date else "Unknown",
+            "length": yt.length or 0,
+            "author": yt.author or "Unknown"
+        }
+        
+        if self.cache is not None:
+            self.cache.put_video_info(video_id, info)
+        return info
+    
+    def _request_youtube_video_info(self, video_id: str) -> Future:
+        """
+        Start fetching video metadata in the background.
+        
+        A fetch that is still running for the same video (for example one an
+        earlier request stopped waiting for) is shared instead of repeated.
+        
+        Args:
+            video_id (str): YouTube video ID
+            
+        Returns:
+            Future: Resolves to the metadata dictionary
+        """
+        with self._video_info_lock:
+            future = self._pending_video_info.get(video_id)
+            if future is not None:
+                return future
+            future = self._video_info_executor.submit(self._fetch_youtube_video_info, video_id)
+            self._pending_video_info[video_id] = future
+        # Registered outside the lock: the callback runs immediately if the fetch already finished
+        future.add_done_callback(lambda done: self._forget_video_info_request(video_id, done))
+        return future
+    
+    def _forget_video_info_request(self, video_id: str, future: Future):
+        """Drop a finished metadata fetch from the in-flight table."""
+        with self._video_info_lock:
+            if self._pending_video_info.get(video_id) is future:
+                del self._pending_video_info[video_id]
     
-    def load_youtube_content(self, url: str) -> List[Any]:
+    def load_youtube_content(self, url: Union[str, ParsedURL]) -> List[Any]:
         """
         Load content from YouTube URL.
         
+        The transcript and the video metadata are fetched concurrently and
+        cached separately. Metadata is optional: if it fails, or is still not
+        available YOUTUBE_METADATA_TIMEOUT_SECONDS after the transcript
+        arrived, the transcript is returned without it.
+        
         Args:
-            url (str): YouTube URL to load content from
+            url (Union[str, ParsedURL]): YouTube URL to load content from
             
         Returns:
             List[Any]: List of loaded documents
@@ -31,26 +178,49 @@ class ContentLoader:
         Raises:
             ContentLoaderError: If content loading fails
         """
+        parsed_url = url if isinstance(url, ParsedURL) else parse_url(url)
+        video_id = parsed_url.video_id
+        if not video_id:
+            raise ContentLoaderError("Failed to load YouTube content: no video ID found in the URL")
+        
+        video_info = self.cache.get_video_info(video_id) if self.cache is not None else None
+        video_info_future = self._request_youtube_video_info(video_id) if video_info is None else None
+        
         try:
-            # Try loading with video info first
-            loader = YoutubeLoader.from_youtube_url(url, add_video_info=True)
-            docs = loader.load()
-            return docs
-        except Exception:
-            try:
-                # Fallback to loading without video info
-                loader = YoutubeLoader.from_youtube_url(url, add_video_info=False)
-                docs = loader.load()
-                return docs
-            except Exception as e:
-                raise ContentLoaderError(f"Failed to load YouTube content: {str(e)}")
+            docs = self._fetch_youtube_transcript(video_id)
+        except Exception as e:
+            raise ContentLoaderError(f"Failed to load YouTube content: {str(e)}")
+        
+        if video_info_future is not None:
+            with span("youtube.metadata_wait") as attributes:
+                try:
+                    video_info = video_info_future.result(timeout=self.config.YOUTUBE_METADATA_TIMEOUT_SECONDS)
+                except Exception as e:
+                    # Metadata only enriches the documents; the transcript is enough
+                    attributes["skipped"] = type(e).__name__
+                    video_info = None
+        
+        if video_info:
+            from langchain_core.documents import Document
+            docs = [
+                Document(page_content=doc.page_content, metadata={**doc.metadata, **video_info})
+                for doc in docs
+            ]
+        return docs
     
-    def load_website_content(self, url: str) -> List[Any]:
+    def load_website_content(self, url: Union[str, ParsedURL]) -> List[Any]:
         """
         Load content from website URL.
         
+        The page is fetched through the pooled HTTP fetcher (timeouts, retries,
+        size cap). With a cache, a page the server reports unchanged (304) is
+        served from the document cache, and fetched in full if it is no longer
+        there. HTML pages have their main text pulled out by the configured
+        extractor; other content types (PDF, plain text, office documents) are
+        partitioned by unstructured according to their Content-Type.
+        
         Args:
-            url (str): Website URL to load content from
+            url (Union[str, ParsedURL]): Website URL to load content from
             
         Returns:
             List[Any]: List of loaded documents
@@ -58,23 +228,70 @@ class ContentLoader:
         Raises:
             ContentLoaderError: If content loading fails
         """
+        cache_key = url.canonical_url if isinstance(url, ParsedURL) else url
+        url = url.url if isinstance(url, ParsedURL) else url
         try:
-            loader = UnstructuredURLLoader(
-                urls=[url],
-                ssl_verify=False,
-                headers=self.config.DEFAULT_HEADERS
-            )
-            docs = loader.load()
-            return docs
+            with span("fetch") as attributes:
+                result = self.fetcher.fetch(url, cache_key=cache_key if self.cache is not None else None)
+                if result.not_modified:
+                    cached_docs = self.cache.get_documents(result.cache_key) if self.cache is not None else None
+                    if cached_docs is not None:
+                        attributes.update(bytes=0, not_modified=True)
+                        return cached_docs
+                    result = self.fetcher.fetch(url, cache_key=cache_key, conditional=False)
+                attributes.update(bytes=len(result.content), not_modified=False)
+            increment("bytes_fetched", len(result.content))
+            media_type = self._media_type(result)
+            if media_type in HTML_CONTENT_TYPES:
+                with span("extract", extractor=self.extractor.name):
+                    text = self.extractor.extract(result.text, url)
+            else:
+                with span("extract", extractor="unstructured", content_type=media_type):
+                    text = self._partition_document(result, media_type)
+            from langchain_core.documents import Document
+            return [Document(page_content=text, metadata={"source": url})]
         except Exception as e:
             raise ContentLoaderError(f"Failed to load website content: {str(e)}")
     
-    def load_content(self, url: str) -> List[Any]:
+    @staticmethod
+    def _media_type(result: FetchResult) -> str:
+        """
+        Media type of a fetched body, from its Content-Type header.
+        
+        A body without a Content-Type is taken for HTML if it starts with markup.
+        
+        Returns:
+            str: Lowercased media type without parameters, "" if unknown
+        """
+        media_type = result.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if not media_type and result.content.lstrip()[:1] == b"<":
+            return "text/html"
+        return media_type
+    
+    @staticmethod
+    def _partition_document(result: FetchResult, media_type: str) -> str:
+        """Extract the text of a non-HTML body with unstructured's auto partitioner."""
+        from io import BytesIO
+        from unstructured.partition.auto import partition
+        
+        elements = partition(
+            file=BytesIO(result.content),
+            content_type=media_type or None,
+            encoding=result.encoding
+        )
+        return "\n\n".join(str(element) for element in elements)
+    
+    def load_content(self, url: Union[str, ParsedURL]) -> List[Any]:
         """
         Load content from URL (auto-detects type).
         
+        Website documents are cached by canonical URL when a cache is
+        configured; YouTube transcripts and metadata are cached per video ID
+        by load_youtube_content(). Concurrent loads of the same canonical URL
+        share one fetch, and its failure, through the single-flight coordinator.
+        
         Args:
-            url (str): URL to load content from
+            url (Union[str, ParsedURL]): URL, or an already parsed URL, to load content from
             
         Returns:
             List[Any]: List of loaded documents
@@ -82,10 +299,48 @@ class ContentLoader:
         Raises:
             ContentLoaderError: If content loading fails
         """
-        if is_youtube_url(url):
-            return self.load_youtube_content(url)
-        else:
-            return self.load_website_content(url)
+        parsed_url = url if isinstance(url, ParsedURL) else parse_url(url)
+        return self.single_flight.do(
+            f"load:{parsed_url.canonical_url}",
+            lambda: self._load_parsed_content(parsed_url),
+            serialize=serialize_documents,
+            deserialize=deserialize_documents,
+            error_type=ContentLoaderError
+        )
+    
+    def _load_parsed_content(self, parsed_url: ParsedURL) -> List[Any]:
+        """Load content for a parsed URL, using the document cache for websites."""
+        if parsed_url.kind == "youtube":
+            return self.load_youtube_content(parsed_url)
+        
+        if self.cache is not None:
+            cached_docs = self.cache.get_documents(parsed_url.canonical_url)
+            if cached_docs is not None:
+                return cached_docs
+        
+        docs = self.load_website_content(parsed_url)
+        
+        if self.cache is not None and self.validate_documents(docs):
+            self.cache.put_documents(parsed_url.canonical_url, docs)
+        return docs
+    
+    async def aload_content(self, url: Union[str, ParsedURL]) -> List[Any]:
+        """
+        Asynchronously load content from URL (auto-detects type).
+        
+        The YouTube loader and the HTTP fetcher only offer blocking APIs, so the
+        load runs in a worker thread and the event loop stays free meanwhile.
+        
+        Args:
+            url (Union[str, ParsedURL]): URL, or an already parsed URL, to load content from
+            
+        Returns:
+            List[Any]: List of loaded documents
+            
+        Raises:
+            ContentLoaderError: If content loading fails
+        """
+        return await asyncio.to_thread(self.load_content, url)
     
     def validate_documents(self, docs: List[Any]) -> bool:
         """
@@ -0,0 +1,255 @@
+"""
+Extractive summarization: rank sentences and keep the most salient ones.
+
+Sentences are ranked with TF-IDF centroid similarity or TextRank, computed
+with NumPy over a sparse term matrix held as (row, column, weight) arrays, so
+memory and time grow with the number of words rather than sentences squared.
+It serves two purposes: cutting very long inputs down to a token budget before
+the LLM sees them, and producing a summary with no LLM at all.
+"""
+import re
+from dataclasses import dataclass
+from typing import List, Any, Optional, Tuple
+import numpy as np
+from config.settings import Config
+from .token_budget import estimate_documents_tokens, estimate_tokens
+
+
+EXTRACTIVE_METHODS = ("textrank", "tfidf")
+
+_SENTENCE_END = re.compile(r"(?:(?<=[.!?])|(?<=[.!?][\"')\]]))\s+(?=[\"'(\[]?[A-Z0-9])|\n+")
+_TERM = re.compile(r"[^\W\d_]{2,}")
+_STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below between
+both but by can could did do does doing down during each few for from further had has have having he her here
+hers herself him himself his how i if in into is it its itself just let me more most my myself no nor not now of
+off on once only or other our ours ourselves out over own really same she should so some such than that the their
+theirs them themselves then there these they this those through to too under until up very was we were what when
+where which while who whom why will with would you your yours yourself yourselves going get got like know
+""".split())
+
+# Captions have no punctuation; long runs are cut into windows of this many words
+MAX_SENTENCE_WORDS = 40
+# Headings and fragments shorter than this are not used as summary sentences
+MIN_SUMMARY_SENTENCE_WORDS = 5
+DAMPING = 0.85
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-6
+
+
+class ExtractiveError(Exception):
+    """Custom exception for extractive summarization errors."""
+    pass
+
+
+@dataclass
+class ExtractiveSelection:
+    """Sentences kept by an extractive pass and what they cost."""
+
+    text: str
+    sentences_kept: int
+    sentences_total: int
+    tokens_before: int
+    tokens_after: int
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences.
+
+    Line breaks also end a sentence, and runs longer than MAX_SENTENCE_WORDS
+    (unpunctuated captions) are cut into windows of that many words.
+
+    Args:
+        text (str): Text to split
+
+    Returns:
+        List[str]: Non-empty sentences in text order
+    """
+    sentences = []
+    for sentence in _SENTENCE_END.split(text):
+        words = sentence.split()
+        for start in range(0, len(words), MAX_SENTENCE_WORDS):
+            sentences.append(" ".join(words[start:start + MAX_SENTENCE_WORDS]))
+    return sentences
+
+
+class ExtractiveSummarizer:
+    """
+    Rank sentences by salience and select the best ones within a budget.
+    """
+
+    def __init__(self, method: Optional[str] = None):
+        """
+        Initialize the summarizer.
+
+        Args:
+            method (str, optional): "textrank" or "tfidf"; defaults to
+                EXTRACTIVE_METHOD
+
+        Raises:
+            ExtractiveError: If the method is unknown
+        """
+        self.config = Config()
+        self.method = method or self.config.EXTRACTIVE_METHOD
+        if self.method not in EXTRACTIVE_METHODS:
+            raise ExtractiveError(f"Unknown extractive method: {self.method}")
+
+    @staticmethod
+    def _term_matrix(sentences: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        """
+        Build the L2-normalized TF-IDF matrix of the sentences in sparse form.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, int]: Row indexes, column
+                indexes and weights of the non-zero entries, and the vocabulary size
+        """
+        vocabulary = {}
+        rows: List[int] = []
+        columns: List[int] = []
+        for row, sentence in enumerate(sentences):
+            for term in _TERM.findall(sentence.lower()):
+                if term not in _STOP_WORDS:
+                    rows.append(row)
+                    columns.append(vocabulary.setdefault(term, len(vocabulary)))
+        size = len(vocabulary)
+        if not size:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0), 0
+
+        # Merge repeated terms of a sentence into one entry with its count
+        keys, counts = np.unique(
+            np.asarray(rows, dtype=np.int64) * size + np.asarray(columns, dtype=np.int64), return_counts=True
+        )
+        rows_array, columns_array = np.divmod(keys, size)
+        document_frequency = np.bincount(columns_array, minlength=size)
+        idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1.0
+        weights = (1 + np.log(counts)) * idf[columns_array]
+
+        norms = np.sqrt(np.bincount(rows_array, weights=weights * weights, minlength=len(sentences)))
+        weights = weights / norms[rows_array]
+        return rows_array, columns_array, weights, size
+
+    def score_sentences(self, sentences: List[str]) -> np.ndarray:
+        """
+        Score each sentence's salience.
+
+        "tfidf" scores a sentence by its cosine similarity to the centroid of
+        all sentences. "textrank" runs PageRank over the sentence similarity
+        graph; the graph is never materialized, each iteration multiplies by
+        the term matrix and its transpose instead.
+
+        Args:
+            sentences (List[str]): Sentences to score
+
+        Returns:
+            np.ndarray: One score per sentence, higher is more salient
+        """
+        count = len(sentences)
+        rows, columns, weights, size = self._term_matrix(sentences)
+        if not size:
+            return np.zeros(count)
+
+        if self.method == "tfidf":
+            centroid = np.bincount(columns, weights=weights, minlength=size) / count
+            return np.bincount(rows, weights=weights * centroid[columns], minlength=count)
+
+        has_terms = (np.bincount(rows, minlength=count) > 0).astype(float)
+
+        def similarity_times(vector: np.ndarray) -> np.ndarray:
+            # (X @ X.T) @ vector without the self-similarity diagonal
+            projected = np.bincount(columns, weights=weights * vector[rows], minlength=size)
+            product = np.bincount(rows, weights=weights * projected[columns], minlength=count)
+            return product - has_terms * vector
+
+        degree = similarity_times(np.ones(count))
+        inverse_degree = np.divide(1.0, degree, out=np.zeros(count), where=degree > 0)
+        scores = np.full(count, 1.0 / count)
+        for _ in range(MAX_ITERATIONS):
+            updated = (1 - DAMPING) / count + DAMPING * similarity_times(scores * inverse_degree)
+            converged = np.abs(updated - scores).sum() < TOLERANCE
+            scores = updated
+            if converged:
+                break
+        return scores
+
+    def _rank(self, documents: List[Any]) -> Tuple[List[str], np.ndarray]:
+        """Split the documents into sentences and return them with their ranking."""
+        sentences = []
+        for doc in documents:
+            sentences.extend(split_sentences(doc.page_content))
+        if not sentences:
+            raise ExtractiveError("No sentences to rank")
+        scores = self.score_sentences(sentences)
+        # Stable sort keeps earlier sentences first among equal scores
+        return sentences, np.argsort(-scores, kind="stable")
+
+    def select(self, documents: List[Any], max_tokens: int) -> ExtractiveSelection:
+        """
+        Keep the highest-ranked sentences that fit in a token budget.
+
+        Kept sentences are returned in their original order.
+
+        Args:
+            documents (List[Any]): Documents to condense
+            max_tokens (int): Token budget for the kept sentences
+
+        Returns:
+            ExtractiveSelection: Kept text and token counts
+
+        Raises:
+            ExtractiveError: If the documents contain no text
+        """
+        sentences, order = self._rank(documents)
+        lengths = np.fromiter((estimate_tokens(sentence) for sentence in sentences), dtype=np.int64, count=len(sentences))
+        kept = np.zeros(len(sentences), dtype=bool)
+        used = 0
+        for index in order:
+            if used + lengths[index] <= max_tokens:
+                kept[index] = True
+                used += lengths[index]
+        text = " ".join(sentence for sentence, keep in zip(sentences, kept) if keep)
+        return ExtractiveSelection(
+            text=text,
+            sentences_kept=int(kept.sum()),
+            sentences_total=len(sentences),
+            tokens_before=estimate_documents_tokens(documents),
+            tokens_after=estimate_tokens(text)
+        )
+
+    def summarize(self, documents: List[Any], word_count: int) -> ExtractiveSelection:
+        """
+        Produce a summary of about word_count words without an LLM.
+
+        The best-ranked full sentences are kept in their original order;
+        headings and fragments are skipped.
+
+        Args:
+            documents (List[Any]): Documents to summarize
+            word_count (int): Target summary length in words
+
+        Returns:
+            ExtractiveSelection: Summary text and token counts
+
+        Raises:
+            ExtractiveError: If the documents contain no text
+        """
+        sentences, order = self._rank(documents)
+        kept = np.zeros(len(sentences), dtype=bool)
+        words = 0
+        for index in order:
+            length = len(sentences[index].split())
+            if length < MIN_SUMMARY_SENTENCE_WORDS or (words and words + length > word_count):
+                continue
+            kept[index] = True
+            words += length
+            if words >= word_count:
+                break
+        text = " ".join(sentence for sentence, keep in zip(sentences, kept) if keep)
+        return ExtractiveSelection(
+            text=text,
+            sentences_kept=int(kept.sum()),
+            sentences_total=len(sentences),
+            tokens_before=estimate_documents_tokens(documents),
+            tokens_after=estimate_tokens(text)
+        )
@@ -0,0 +1,280 @@
+"""
+HTML main-content extraction engines.
+"""
+import re
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional
+from config.settings import Config
+
+
+# Class/id fragments that suggest main content or page chrome
+POSITIVE_HINTS = re.compile(
+    r"(?<![a-z0-9])(?:article|body|content|entry|main|post|story|text)(?![a-z0-9])",
+    re.IGNORECASE
+)
+NEGATIVE_HINTS = re.compile(
+    r"(?<![a-z0-9])(?:ads?|advert\w*|banner|breadcrumbs?|comments?|cookies?|consent|footer|header|menu|modal|"
+    r"nav|navbar|navigation|newsletter|popup|promo|related|share|sharing|sidebar|social|sponsor(?:ed)?|"
+    r"subscribe|widget)(?![a-z0-9])",
+    re.IGNORECASE
+)
+
+# Elements that never hold article text
+REMOVED_TAGS = ("script", "style", "noscript", "iframe", "svg", "form", "button", "nav", "aside", "footer", "header")
+
+# Elements whose text makes up the extracted content
+TEXT_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "pre", "blockquote", "td")
+
+CANDIDATE_TAGS = ("article", "main", "section", "div", "td")
+
+
+class ExtractionError(Exception):
+    """Raised when no text can be extracted from a page."""
+    pass
+
+
+class ContentExtractor(ABC):
+    """Interface for turning an HTML page into plain text."""
+
+    name = "base"
+
+    @abstractmethod
+    def extract(self, html: str, url: str = "") -> str:
+        """
+        Extract the main text content from an HTML page.
+
+        Args:
+            html (str): Page HTML
+            url (str): Page URL, for extractors that use it
+
+        Returns:
+            str: Extracted text, paragraphs separated by blank lines
+
+        Raises:
+            ExtractionError: If extraction fails
+        """
+
+
+def _make_soup(html: str):
+    """Parse HTML with lxml when available, falling back to the stdlib parser."""
+    from bs4 import BeautifulSoup, FeatureNotFound
+    try:
+        return BeautifulSoup(html, "lxml")
+    except FeatureNotFound:
+        return BeautifulSoup(html, "html.parser")
+
+
+class ReadabilityExtractor(ContentExtractor):
+    """
+    Lightweight readability-style extractor built on BeautifulSoup.
+
+    Page chrome (scripts, navigation, footers, ...) is dropped, candidate
+    containers are scored by the amount of paragraph text they hold, their
+    class/id hints and their link density, and the text of the best
+    candidate is returned.
+    """
+
+    name = "readability"
+
+    @staticmethod
+    def _hints(element) -> str:
+        """Join an element's class and id attributes."""
+        return " ".join(element.get("class") or []) + " " + (element.get("id") or "")
+
+    def _class_weight(self, element) -> int:
+        """Score an element's class and id attributes."""
+        hints = self._hints(element)
+        weight = 0
+        if POSITIVE_HINTS.search(hints):
+            weight += 25
+        if NEGATIVE_HINTS.search(hints):
+            weight -= 25
+        return weight
+
+    @staticmethod
+    def _link_density(element) -> float:
+        """Fraction of an element's text that sits inside links."""
+        text_length = len(element.get_text(" ", strip=True))
+        if text_length == 0:
+            return 1.0
+        link_length = sum(len(link.get_text(" ", strip=True)) for link in element.find_all("a"))
+        return link_length / text_length
+
+    def _score_candidates(self, soup) -> Dict[Any, float]:
+        """Score containers by the paragraphs directly inside them."""
+        scores: Dict[Any, float] = {}
+        for paragraph in soup.find_all(("p", "pre", "blockquote")):
+            text = paragraph.get_text(" ", strip=True)
+            if len(text) < 25:
+                continue
+            paragraph_score = 1 + text.count(",") + min(len(text) // 100, 3)
+
+            parent = paragraph.parent
+            grandparent = parent.parent if parent is not None else None
+            for ancestor, share in ((parent, 1.0), (grandparent, 0.5)):
+                if ancestor is None or ancestor.name not in CANDIDATE_TAGS:
+                    continue
+                if ancestor not in scores:
+                    scores[ancestor] = self._class_weight(ancestor)
+                scores[ancestor] += paragraph_score * share
+
+        return {
+            element: score * (1 - self._link_density(element))
+            for element, score in scores.items()
+        }
+
+    @staticmethod
+    def _select_roots(scores: Dict[Any, float]) -> List[Any]:
+        """Pick the best candidate plus siblings that also look like content."""
+        top = max(scores, key=scores.get)
+        if top.parent is None:
+            return [top]
+
+        threshold = max(10.0, scores[top] * 0.2)
+        roots = []
+        for sibling in top.parent.find_all(True, recursive=False):
+            if sibling is top or scores.get(sibling, 0) >= threshold:
+                roots.append(sibling)
+            elif sibling.name == "p" and len(sibling.get_text(" ", strip=True)) >= 80:
+                roots.append(sibling)
+        return roots
+
+    @staticmethod
+    def _collect_text(root) -> List[str]:
+        """Collect non-empty text blocks in document order."""
+        if root.name in TEXT_TAGS:
+            text = " ".join(root.get_text(" ", strip=True).split())
+            return [text] if text else []
+
+        blocks = []
+        for element in root.find_all(TEXT_TAGS):
+            # Skip containers whose text is already covered by a nested text tag
+            if element.find(TEXT_TAGS):
+                continue
+            text = " ".join(element.get_text(" ", strip=True).split())
+            if text:
+                blocks.append(text)
+        return blocks
+
+    def extract(self, html: str, url: str = "") -> str:
+        try:
+            soup = _make_soup(html)
+        except Exception as e:
+            raise ExtractionError(f"Failed to parse HTML: {str(e)}")
+
+        for element in soup.find_all(REMOVED_TAGS):
+            element.decompose()
+        for element in soup.find_all(True):
+            if getattr(element, "decomposed", False) or element.name in ("html", "body"):
+                continue
+            hints = self._hints(element)
+            if NEGATIVE_HINTS.search(hints) and not POSITIVE_HINTS.search(hints):
+                element.decompose()
+
+        scores = self._score_candidates(soup)
+        if scores:
+            roots = self._select_roots(scores)
+        else:
+            roots = [soup.body or soup]
+
+        title = soup.title.get_text(" ", strip=True) if soup.title else ""
+        blocks = [block for root in roots for block in self._collect_text(root)]
+        if title and not (blocks and (blocks[0] in title or title in blocks[0])):
+            blocks.insert(0, title)
+        return "\n\n".join(blocks)
+
+
+class UnstructuredExtractor(ContentExtractor):
+    """Extractor backed by the unstructured HTML partitioner."""
+
+    name = "unstructured"
+
+    def extract(self, html: str, url: str = "") -> str:
+        try:
+            from unstructured.partition.html import partition_html
+            elements = partition_html(text=html)
+        except Exception as e:
+            raise ExtractionError(f"unstructured failed to partition HTML: {str(e)}")
+        return "\n\n".join(str(element) for element in elements)
+
+
+class FallbackExtractor(ContentExtractor):
+    """
+    Use a fast primary extractor and fall back when its output looks poor.
+
+    Extraction is considered poor when it fails or yields fewer than
+    ``min_chars`` characters of text.
+    """
+
+    name = "fallback"
+
+    def __init__(self, primary: ContentExtractor, fallback: ContentExtractor, min_chars: int = None):
+        self.primary = primary
+        self.fallback = fallback
+        self.min_chars = Config.EXTRACTION_MIN_CHARS if min_chars is None else min_chars
+
+    def is_good_extraction(self, text: str) -> bool:
+        """
+        Check whether extracted text is substantial enough to use.
+
+        Args:
+            text (str): Extracted text
+
+        Returns:
+            bool: True if the text meets the minimum length
+        """
+        return len(text.strip()) >= self.min_chars
+
+    def extract(self, html: str, url: str = "") -> str:
+        text: Optional[str] = None
+        try:
+            text = self.primary.extract(html, url)
+        except ExtractionError:
+            pass
+        if text is not None and self.is_good_extraction(text):
+            return text
+
+        try:
+            fallback_text = self.fallback.extract(html, url)
+        except ExtractionError:
+            if text:
+                return text
+            raise
+        if text and len(text) > len(fallback_text):
+            return text
+        return fallback_text
+
+
+EXTRACTORS = {
+    ReadabilityExtractor.name: ReadabilityExtractor,
+    UnstructuredExtractor.name: UnstructuredExtractor
+}
+
+
+def create_extractor(name: str = None) -> ContentExtractor:
+    """
+    Create the configured HTML extractor.
+
+    "readability" (the default) uses the fast extractor with unstructured as
+    a fallback for low-quality results; "unstructured" always partitions with
+    unstructured.
+
+    Args:
+        name (str, optional): Extractor name, defaults to Config.HTML_EXTRACTOR
+
+    Returns:
+        ContentExtractor: The extractor instance
+
+    Raises:
+        ContentLoaderError: If the name is unknown
+    """
+    name = name or Config.HTML_EXTRACTOR
+    if name not in EXTRACTORS:
+        # Imported here because content_loader imports this module
+        from .content_loader import ContentLoaderError
+        raise ContentLoaderError(
+            f"Unknown HTML extractor: {name} (expected one of: {', '.join(sorted(EXTRACTORS))})"
+        )
+    if name == ReadabilityExtractor.name:
+        return FallbackExtractor(ReadabilityExtractor(), UnstructuredExtractor())
+    return EXTRACTORS[name]()
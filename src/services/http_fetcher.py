@@ -0,0 +1,203 @@
+"""
+Pooled HTTP fetching for website content.
+"""
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+from config.settings import Config
+from .cache import LRUCache
+
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class HttpFetchError(Exception):
+    """Raised when a page cannot be fetched."""
+    pass
+
+
+@dataclass
+class FetchResult:
+    """A fetched HTTP response body."""
+
+    url: str
+    status_code: int
+    content: bytes
+    encoding: Optional[str]
+    headers: Dict[str, str] = field(default_factory=dict)
+    not_modified: bool = False
+    # Where the caller cached what it made of this URL; set on 304 responses
+    cache_key: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        """Response body decoded with the declared (or a UTF-8) encoding."""
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+class HttpFetcher:
+    """
+    Fetch web pages over a shared keep-alive connection pool.
+
+    Connections are reused across requests and threads, limited per host,
+    bounded by connect/read timeouts and retried with exponential backoff on
+    connection errors and retryable status codes, and bodies larger than the
+    configured cap are rejected.
+
+    With revalidation on, the ETag and Last-Modified of responses fetched
+    with a ``cache_key`` are remembered, and later fetches of the URL send
+    them as conditional headers. A 304 answer comes back with an empty body,
+    ``not_modified`` set and that ``cache_key``: the caller keeps the content
+    (e.g. in the document cache), the fetcher only keeps the validators.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = None,
+        read_timeout: float = None,
+        max_retries: int = None,
+        backoff_factor: float = None,
+        max_connections_per_host: int = None,
+        pool_size: int = None,
+        max_response_bytes: int = None,
+        headers: Dict[str, str] = None,
+        verify_ssl: bool = None,
+        revalidate: bool = None
+    ):
+        self.config = Config()
+        self.timeout = (
+            connect_timeout or self.config.CONNECT_TIMEOUT_SECONDS,
+            read_timeout or self.config.TIMEOUT_SECONDS
+        )
+        self.max_response_bytes = max_response_bytes or self.config.MAX_RESPONSE_BYTES
+        self.verify_ssl = self.config.SSL_VERIFY if verify_ssl is None else verify_ssl
+
+        retry = Retry(
+            total=self.config.MAX_RETRIES if max_retries is None else max_retries,
+            backoff_factor=self.config.RETRY_BACKOFF_SECONDS if backoff_factor is None else backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        # pool_block makes pool_maxsize a hard per-host connection limit
+        adapter = HTTPAdapter(
+            pool_connections=pool_size or self.config.HTTP_POOL_SIZE,
+            pool_maxsize=max_connections_per_host or self.config.HTTP_MAX_CONNECTIONS_PER_HOST,
+            max_retries=retry,
+            pool_block=True
+        )
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or self.config.DEFAULT_HEADERS)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Validators only; revalidating is pointless without a cache of the content
+        revalidate = self.config.CACHE_ENABLED if revalidate is None else revalidate
+        self._validators = LRUCache(self.config.CACHE_MAX_ENTRIES, self.config.CACHE_TTL_SECONDS) if revalidate else None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _conditional_headers(validator: Optional[Dict[str, str]]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from a previous response's validators."""
+        if validator is None:
+            return {}
+        headers = {}
+        if validator.get("ETag"):
+            headers["If-None-Match"] = validator["ETag"]
+        if validator.get("Last-Modified"):
+            headers["If-Modified-Since"] = validator["Last-Modified"]
+        return headers
+
+    def _read_body(self, response: requests.Response) -> bytes:
+        """Read a streamed response body, enforcing the size cap."""
+        declared_length = response.headers.get("Content-Length")
+        if declared_length and declared_length.isdigit() and int(declared_length) > self.max_response_bytes:
+            raise HttpFetchError(
+                f"Response too large: {declared_length} bytes exceeds limit of {self.max_response_bytes}"
+            )
+
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            body.extend(chunk)
+            if len(body) > self.max_response_bytes:
+                raise HttpFetchError(f"Response exceeds limit of {self.max_response_bytes} bytes")
+        return bytes(body)
+
+    def fetch(self, url: str, cache_key: str = None, conditional: bool = True) -> FetchResult:
+        """
+        Fetch a URL.
+
+        Args:
+            url (str): URL to fetch
+            cache_key (str, optional): Key under which the caller caches what it
+                makes of the response; only responses fetched with one are revalidated
+            conditional (bool): Send the validators of an earlier response, if any
+
+        Returns:
+            FetchResult: The response body and headers, or an empty body with
+                ``not_modified`` set if the earlier response is still current
+
+        Raises:
+            HttpFetchError: On network errors, timeouts, error status codes or oversized bodies
+        """
+        validator = None
+        if conditional and self._validators is not None:
+            validator = self._validators.get(url)
+        try:
+            with self.session.get(
+                url,
+                headers=self._conditional_headers(validator),
+                timeout=self.timeout,
+                verify=self.verify_ssl,
+                stream=True
+            ) as response:
+                if response.status_code == 304:
+                    if validator is None:
+                        # Nothing to be current against; ask for the full body
+                        return self.fetch(url, cache_key, conditional=False)
+                    return FetchResult(
+                        url=url,
+                        status_code=304,
+                        content=b"",
+                        encoding=None,
+                        headers=CaseInsensitiveDict(response.headers),
+                        not_modified=True,
+                        cache_key=validator["cache_key"]
+                    )
+
+                if response.status_code >= 400:
+                    raise HttpFetchError(f"HTTP {response.status_code} fetching {url}")
+
+                # requests assumes ISO-8859-1 for text/* without a charset; leave
+                # those undeclared so the UTF-8 default applies instead
+                declares_charset = "charset" in response.headers.get("Content-Type", "").lower()
+                result = FetchResult(
+                    url=response.url,
+                    status_code=response.status_code,
+                    content=self._read_body(response),
+                    encoding=response.encoding if declares_charset else None,
+                    headers=CaseInsensitiveDict(response.headers)
+                )
+        except requests.RequestException as e:
+            raise HttpFetchError(f"Request failed for {url}: {str(e)}")
+
+        if self._validators is not None and cache_key is not None and (
+            result.headers.get("ETag") or result.headers.get("Last-Modified")
+        ):
+            self._validators.set(url, {
+                "ETag": result.headers.get("ETag"),
+                "Last-Modified": result.headers.get("Last-Modified"),
+                "cache_key": cache_key
+            })
+        return result
+
+    def close(self):
+        """Close all pooled connections."""
+        with self._lock:
+            self.session.close()
@@ -0,0 +1,563 @@
+"""
+Persistent job queue and workers for load-and-summarize jobs.
+
+Jobs are rows in a SQLite database, so no broker is needed and a job outlives
+the page, session or app process that submitted it. Worker processes claim
+queued jobs under a lease they keep renewing while they work; a job whose
+lease runs out (its worker died) is queued again. Failed jobs are retried
+with exponential backoff up to a maximum number of attempts.
+"""
+import json
+import os
+import signal
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import List, Any, Dict, Optional
+from config.settings import Config
+from src.utils.tracing import METRIC_PREFIX, get_metrics_registry, span, start_trace
+from src.utils.url_utils import classify_url, parse_url
+from .content_loader import ContentLoader, ContentLoaderError
+from .rate_limiter import rate_limit_session
+from .summarization import SummarizationService, SummarizationError
+
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+RETRY_BACKOFF_SECONDS = 2.0
+# Minimum seconds between partial-summary writes while a summary streams
+PROGRESS_INTERVAL_SECONDS = 0.5
+
+_COLUMNS = (
+    "job_id, url, word_count, session, status, stage, attempts, max_attempts, "
+    "partial_summary, result, error, created_at, updated_at"
+)
+
+
+class JobQueueError(Exception):
+    """Custom exception for job queue errors."""
+    pass
+
+
+class _JobFailed(Exception):
+    """Raised by a worker for a job failure that retrying cannot fix."""
+    pass
+
+
+@dataclass
+class Job:
+    """A load-and-summarize job and its progress."""
+
+    job_id: str
+    url: str
+    word_count: Optional[int]
+    session: Optional[str]
+    status: str
+    stage: Optional[str]
+    attempts: int
+    max_attempts: int
+    partial_summary: str
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    created_at: float
+    updated_at: float
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "Job":
+        """Build a job from a row selected with the module's column list."""
+        values = list(row)
+        values[9] = json.loads(values[9]) if values[9] else None
+        return cls(*values)
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job has succeeded or failed for good."""
+        return self.status in TERMINAL_STATUSES
+
+
+class JobQueue:
+    """
+    SQLite-backed queue of load-and-summarize jobs.
+
+    Every process opens its own connection to the same database file; claims
+    run in an IMMEDIATE transaction, so each job goes to exactly one worker.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+        lease_seconds: Optional[float] = None,
+        retention_seconds: Optional[float] = None
+    ):
+        """
+        Open (and create if needed) the job database.
+
+        Args:
+            db_path (str, optional): Database file, defaults to JOB_QUEUE_DB_PATH
+            max_attempts (int, optional): Attempts per job before it fails,
+                defaults to JOB_MAX_ATTEMPTS
+            lease_seconds (float, optional): How long a claim lasts without a
+                heartbeat, defaults to JOB_LEASE_SECONDS
+            retention_seconds (float, optional): How long finished jobs are
+                kept, defaults to JOB_RETENTION_SECONDS
+        """
+        self.config = Config()
+        self.db_path = db_path or self.config.JOB_QUEUE_DB_PATH
+        self.max_attempts = max(1, max_attempts or self.config.JOB_MAX_ATTEMPTS)
+        self.lease_seconds = lease_seconds or self.config.JOB_LEASE_SECONDS
+        self.retention_seconds = self.config.JOB_RETENTION_SECONDS if retention_seconds is None else retention_seconds
+        self._lock = threading.Lock()
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        # Autocommit mode; multi-statement updates open their own transactions
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                canonical_url TEXT,
+                word_count INTEGER,
+                session TEXT,
+                status TEXT NOT NULL,
+                stage TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                partial_summary TEXT NOT NULL DEFAULT '',
+                result TEXT,
+                error TEXT,
+                worker TEXT,
+                available_at REAL NOT NULL,
+                lease_expires_at REAL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._transaction(self._add_canonical_urls)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(status, available_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_canonical_url ON jobs(canonical_url, status)")
+
+    def _transaction(self, work):
+        """Run work(now) in an IMMEDIATE transaction and return its result."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                value = work(time.time())
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return value
+
+    def _add_canonical_urls(self, now: float):
+        """Add and fill the canonical_url column in databases created without it."""
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")]
+        if "canonical_url" in columns:
+            return
+        self._conn.execute("ALTER TABLE jobs ADD COLUMN canonical_url TEXT")
+        rows = self._conn.execute("SELECT job_id, url FROM jobs").fetchall()
+        self._conn.executemany(
+            "UPDATE jobs SET canonical_url = ? WHERE job_id = ?",
+            [(parse_url(url).canonical_url, job_id) for job_id, url in rows]
+        )
+
+    def _select(self, job_id: str) -> Optional[Job]:
+        """Load one job. Caller must hold the lock."""
+        row = self._conn.execute(f"SELECT {_COLUMNS} FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return Job.from_row(row) if row else None
+
+    def submit(self, url: str, word_count: Optional[int] = None, session: Optional[str] = None) -> Job:
+        """
+        Queue a job, or return the unfinished job already queued for the same request.
+
+        Requests are the same when their URLs share a canonical form (see
+        parse_url()), so youtu.be and watch?v= links to one video, or a page
+        with and without a trailing slash, share a job.
+
+        Args:
+            url (str): URL to load and summarize
+            word_count (int, optional): Target summary word count
+            session (str, optional): Submitting session, used for fair LLM scheduling
+
+        Returns:
+            Job: The queued or already running job
+        """
+        canonical_url = parse_url(url).canonical_url
+
+        def work(now: float) -> Job:
+            self._conn.execute(
+                "DELETE FROM jobs WHERE status IN ('succeeded', 'failed') AND updated_at < ?",
+                (now - self.retention_seconds,)
+            )
+            row = self._conn.execute(
+                f"""
+                SELECT {_COLUMNS} FROM jobs
+                WHERE canonical_url = ? AND word_count IS ? AND status IN ('queued', 'running')
+                ORDER BY created_at LIMIT 1
+                """,
+                (canonical_url, word_count)
+            ).fetchone()
+            if row is not None:
+                return Job.from_row(row)
+            job_id = uuid.uuid4().hex
+            self._conn.execute(
+                """
+                INSERT INTO jobs (
+                    job_id, url, canonical_url, word_count, session, status, max_attempts, available_at, created_at, updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, 'queued', ?, ?, ?, ?)
+                """,
+                (job_id, url, canonical_url, word_count, session, self.max_attempts, now, now, now)
+            )
+            return self._select(job_id)
+
+        return self._transaction(work)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Look up a job.
+
+        Args:
+            job_id (str): Job identifier
+
+        Returns:
+            Optional[Job]: The job, or None if it does not exist or was pruned
+        """
+        with self._lock:
+            return self._select(job_id)
+
+    def claim(self, worker: str) -> Optional[Job]:
+        """
+        Take the oldest job that is ready to run.
+
+        Jobs whose worker stopped renewing its lease are queued again first,
+        or failed if they have used all their attempts.
+
+        Args:
+            worker (str): Identifier of the claiming worker
+
+        Returns:
+            Optional[Job]: The claimed job, or None if nothing is ready
+        """
+        def work(now: float) -> Optional[Job]:
+            self._conn.execute(
+                """
+                UPDATE jobs SET status = 'failed', error = 'The worker running the job stopped', updated_at = ?
+                WHERE status = 'running' AND lease_expires_at < ? AND attempts >= max_attempts
+                """,
+                (now, now)
+            )
+            self._conn.execute(
+                """
+                UPDATE jobs SET status = 'queued', stage = NULL, available_at = ?, updated_at = ?
+                WHERE status = 'running' AND lease_expires_at < ?
+                """,
+                (now, now, now)
+            )
+            row = self._conn.execute(
+                "SELECT job_id FROM jobs WHERE status = 'queued' AND available_at <= ? ORDER BY available_at LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                """
+                UPDATE jobs SET status = 'running', stage = 'starting', worker = ?, attempts = attempts + 1,
+                    partial_summary = '', lease_expires_at = ?, updated_at = ?
+                WHERE job_id = ?
+                """,
+                (worker, now + self.lease_seconds, now, row[0])
+            )
+            return self._select(row[0])
+
+        return self._transaction(work)
+
+    def update(self, job_id: str, worker: str, stage: Optional[str] = None, partial_summary: Optional[str] = None) -> bool:
+        """
+        Renew a running job's lease and optionally record its progress.
+
+        Args:
+            job_id (str): Job identifier
+            worker (str): Worker that claimed the job
+            stage (str, optional): Current stage, e.g. "loading"
+            partial_summary (str, optional): Summary text generated so far
+
+        Returns:
+            bool: False if the job is no longer this worker's to run
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                UPDATE jobs SET lease_expires_at = ?, updated_at = ?,
+                    stage = COALESCE(?, stage), partial_summary = COALESCE(?, partial_summary)
+                WHERE job_id = ? AND worker = ? AND status = 'running'
+                """,
+                (now + self.lease_seconds, now, stage, partial_summary, job_id, worker)
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker: str, result: Dict[str, Any]) -> bool:
+        """
+        Mark a running job as succeeded.
+
+        Args:
+            job_id (str): Job identifier
+            worker (str): Worker that claimed the job
+            result (Dict[str, Any]): JSON-serializable job result
+
+        Returns:
+            bool: False if the job is no longer this worker's to finish
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                UPDATE jobs SET status = 'succeeded', stage = NULL, result = ?, error = NULL,
+                    partial_summary = '', lease_expires_at = NULL, updated_at = ?
+                WHERE job_id = ? AND worker = ? AND status = 'running'
+                """,
+                (json.dumps(result, default=str), now, job_id, worker)
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: str, worker: str, error: str, retryable: bool = True) -> Optional[Job]:
+        """
+        Record a failed attempt, queuing the job again if attempts remain.
+
+        Retries wait RETRY_BACKOFF_SECONDS, doubling with every attempt.
+
+        Args:
+            job_id (str): Job identifier
+            worker (str): Worker that claimed the job
+            error (str): Failure message
+            retryable (bool): Whether another attempt could succeed
+
+        Returns:
+            Optional[Job]: The updated job, or None if it was not this worker's
+        """
+        def work(now: float) -> Optional[Job]:
+            job = self._select(job_id)
+            if job is None or job.status != "running":
+                return None
+            if retryable and job.attempts < job.max_attempts:
+                delay = RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+                status, available_at = "queued", now + delay
+            else:
+                status, available_at = "failed", now
+            cursor = self._conn.execute(
+                """
+                UPDATE jobs SET status = ?, stage = NULL, error = ?, available_at = ?,
+                    lease_expires_at = NULL, updated_at = ?
+                WHERE job_id = ? AND worker = ? AND status = 'running'
+                """,
+                (status, error, available_at, now, job_id, worker)
+            )
+            return self._select(job_id) if cursor.rowcount == 1 else None
+
+        return self._transaction(work)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Count jobs by status.
+
+        Returns:
+            Dict[str, int]: Number of jobs in each of JOB_STATUSES
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in JOB_STATUSES}
+        counts.update(dict(rows))
+        return counts
+
+    def render_metrics(self) -> List[str]:
+        """Prometheus lines for the queue, for MetricsRegistry.add_collector()."""
+        name = f"{METRIC_PREFIX}_jobs"
+        lines = [f"# HELP {name} Jobs in the job queue by status.", f"# TYPE {name} gauge"]
+        for status, count in self.stats().items():
+            lines.append(f'{name}{{status="{status}"}} {count}')
+        return lines
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class JobWorker:
+    """
+    Claims jobs from a JobQueue and runs them with the summarization services.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        content_loader: ContentLoader,
+        summarization_service: SummarizationService,
+        worker_id: Optional[str] = None
+    ):
+        self.config = Config()
+        self.queue = queue
+        self.content_loader = content_loader
+        self.summarization_service = summarization_service
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+
+    def _heartbeat(self, job: Job, stop: threading.Event):
+        """Renew the job's lease until stop is set."""
+        while not stop.wait(self.queue.lease_seconds / 3):
+            self.queue.update(job.job_id, self.worker_id)
+
+    def _process(self, job: Job) -> Dict[str, Any]:
+        """
+        Load and summarize the job's URL, publishing progress to the queue.
+
+        Mirrors the UI's in-process flow, streaming the summary so pollers
+        can show it as it is generated.
+        """
+        with span("validate"):
+            is_valid, parsed_url, error_message = classify_url(job.url)
+        if not is_valid:
+            raise _JobFailed(error_message)
+
+        self.queue.update(job.job_id, self.worker_id, stage="loading")
+        with span("load", content_type=parsed_url.kind):
+            docs = self.content_loader.load_content(parsed_url)
+        if not self.content_loader.validate_documents(docs):
+            raise _JobFailed("No content was extracted from the URL")
+
+        self.queue.update(job.job_id, self.worker_id, stage="summarizing")
+        stream = self.summarization_service.stream_summary(docs, job.word_count)
+        summary = ""
+        last_update = time.monotonic()
+        for token in stream:
+            summary += token
+            if time.monotonic() - last_update >= PROGRESS_INTERVAL_SECONDS:
+                self.queue.update(job.job_id, self.worker_id, partial_summary=summary)
+                last_update = time.monotonic()
+
+        result = dict(stream.result)
+        result["content_type"] = parsed_url.kind
+        return result
+
+    def run_job(self, job: Job) -> Optional[Job]:
+        """
+        Run one claimed job and record its outcome.
+
+        Invalid URLs and pages without content fail at once; other errors are
+        retried while the job has attempts left.
+
+        Args:
+            job (Job): Job returned by JobQueue.claim()
+
+        Returns:
+            Optional[Job]: The job's final state, or None if it is no longer
+                this worker's
+        """
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, stop_heartbeat), daemon=True)
+        heartbeat.start()
+        result = error = None
+        retryable = True
+        try:
+            with start_trace("job", url=job.url, job_id=job.job_id, attempt=job.attempts) as trace, \
+                    rate_limit_session(job.session or job.job_id):
+                try:
+                    result = self._process(job)
+                except _JobFailed as e:
+                    error, retryable = str(e), False
+                except (ContentLoaderError, SummarizationError) as e:
+                    error = str(e)
+                except Exception as e:
+                    error = f"Unexpected error: {str(e)}"
+                if error is not None:
+                    trace.mark_error(error)
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+
+        if error is not None:
+            return self.queue.fail(job.job_id, self.worker_id, error, retryable)
+        result["trace"] = trace.to_dict()
+        self.queue.complete(job.job_id, self.worker_id, result)
+        return self.queue.get(job.job_id)
+
+    def run(self, stop: Any, poll_interval: Optional[float] = None):
+        """
+        Claim and run jobs until stop is set.
+
+        Args:
+            stop (Any): threading or multiprocessing Event ending the loop
+            poll_interval (float, optional): Seconds to wait when the queue is
+                empty, defaults to JOB_POLL_INTERVAL_SECONDS
+        """
+        poll_interval = poll_interval or self.config.JOB_POLL_INTERVAL_SECONDS
+        while not stop.is_set():
+            job = self.queue.claim(self.worker_id)
+            if job is None:
+                stop.wait(poll_interval)
+                continue
+            self.run_job(job)
+
+
+def run_worker_process(worker_id: str, stop: Any, pool_size: int = 1):
+    """
+    Entry point of a worker process.
+
+    The Groq rate limits are split evenly across the pool, since every
+    process has its own rate governor. The process finishes its current job
+    and exits once stop is set, or once its supervisor is gone.
+
+    Args:
+        worker_id (str): Identifier recorded on claimed jobs
+        stop (Any): multiprocessing Event shared with the supervisor
+        pool_size (int): Number of worker processes sharing the API limits
+    """
+    # Ctrl+C reaches the whole process group; the supervisor sets stop instead
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if pool_size > 1:
+        Config.GROQ_REQUESTS_PER_MINUTE = Config.GROQ_REQUESTS_PER_MINUTE // pool_size
+        Config.GROQ_TOKENS_PER_MINUTE = Config.GROQ_TOKENS_PER_MINUTE // pool_size
+
+    supervisor = os.getppid()
+
+    def watch_supervisor():
+        while not stop.wait(1.0):
+            if os.getppid() != supervisor:
+                stop.set()
+
+    threading.Thread(target=watch_supervisor, name="supervisor-watch", daemon=True).start()
+
+    from .registry import get_service_registry
+    content_loader, summarization_service = get_service_registry().get_services()
+    queue = JobQueue()
+    try:
+        JobWorker(queue, content_loader, summarization_service, worker_id).run(stop)
+    finally:
+        queue.close()
+
+
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Get the process-wide job queue, opening it from the configuration.
+
+    Returns:
+        JobQueue: The shared queue
+    """
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue()
+            get_metrics_registry().add_collector(_job_queue.render_metrics)
+        return _job_queue
@@ -0,0 +1,306 @@
+"""
+Routing of LLM calls across a pool of Groq models.
+
+Each request is routed once, from its estimated size, requested summary length
+and latency/cost tier, to an ordered list of candidate models. RoutedChatModel
+(src/services/chat_models.py) then sends every call of the request to the first candidate that fits the
+call, falling back to the next one on errors, and feeds per-model latency and
+error statistics back to the router.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import List, Any, Dict, Iterator, Optional
+from config.settings import Config
+from src.utils.tracing import METRIC_PREFIX, Histogram, get_metrics_registry, render_histograms
+
+
+MODEL_TIERS = ("fast", "balanced", "quality")
+
+# Weight of the newest sample in the per-model latency average
+LATENCY_EWMA_WEIGHT = 0.2
+# Consecutive errors after which a model is only used as a last resort
+FAILURES_BEFORE_COOLDOWN = 3
+
+_current_route: ContextVar[Optional["ModelRoute"]] = ContextVar("model_route", default=None)
+
+
+class ModelRouterError(Exception):
+    """Raised when the model pool is misconfigured."""
+    pass
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """A model in the pool."""
+
+    name: str
+    tier: str = "balanced"
+    max_tokens: int = 6000  # prompt plus completion tokens allowed per call
+
+
+def parse_model_pool(spec: str, default_model: str = None, default_max_tokens: int = None) -> List[ModelSpec]:
+    """
+    Parse a model pool of comma-separated ``name[:tier[:max_tokens]]`` entries.
+
+    Args:
+        spec (str): Pool specification, e.g.
+            "llama-3.1-8b-instant:fast:6000,llama-3.3-70b-versatile:quality:12000"
+        default_model (str, optional): Model used when the spec is empty
+        default_max_tokens (int, optional): Per-call budget for entries without one
+
+    Returns:
+        List[ModelSpec]: The pool, in configuration order
+
+    Raises:
+        ModelRouterError: If an entry is malformed
+    """
+    default_max_tokens = default_max_tokens or Config.STUFF_MAX_TOKENS
+    entries = [entry.strip() for entry in (spec or "").split(",") if entry.strip()]
+    if not entries:
+        return [ModelSpec(default_model or Config.GROQ_MODEL, "balanced", default_max_tokens)]
+
+    models = []
+    for entry in entries:
+        parts = entry.split(":")
+        if len(parts) > 3 or not parts[0]:
+            raise ModelRouterError(f"Invalid model pool entry: {entry}")
+        tier = parts[1] if len(parts) > 1 and parts[1] else "balanced"
+        if tier not in MODEL_TIERS:
+            raise ModelRouterError(f"Unknown model tier '{tier}' in: {entry}")
+        try:
+            max_tokens = int(parts[2]) if len(parts) > 2 else default_max_tokens
+        except ValueError:
+            raise ModelRouterError(f"Invalid token budget in model pool entry: {entry}")
+        models.append(ModelSpec(parts[0], tier, max_tokens))
+    return models
+
+
+class ModelStats:
+    """Latency and error statistics of one model."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.last_error_at = 0.0
+        self.ms_per_1k_tokens: Optional[float] = None
+        self.latency = Histogram()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "consecutive_errors": self.consecutive_errors,
+            "ms_per_1k_tokens": round(self.ms_per_1k_tokens, 3) if self.ms_per_1k_tokens is not None else None,
+            "mean_latency_ms": round(self.latency.sum / self.latency.count * 1000, 3) if self.latency.count else None
+        }
+
+
+class ModelRoute:
+    """The candidate models of one request and the models that served its calls."""
+
+    def __init__(self, candidates: List[ModelSpec], output_tokens: int, tier: str):
+        self.candidates = candidates
+        self.output_tokens = output_tokens
+        self.tier = tier
+        self.used: List[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def model(self) -> ModelSpec:
+        """The preferred model; the request is planned against its budget."""
+        return self.candidates[0]
+
+    @property
+    def model_used(self) -> str:
+        """The model that served the last call, or the preferred one before any call."""
+        with self._lock:
+            return self.used[-1] if self.used else self.model.name
+
+    def record_use(self, name: str):
+        with self._lock:
+            self.used.append(name)
+
+
+@contextmanager
+def use_route(route: ModelRoute) -> Iterator[ModelRoute]:
+    """
+    Send the LLM calls made in this context to the route's candidates.
+
+    Args:
+        route (ModelRoute): Route returned by ModelRouter.route()
+    """
+    token = _current_route.set(route)
+    try:
+        yield route
+    finally:
+        try:
+            _current_route.reset(token)
+        except ValueError:
+            # A streaming generator closed from another context, e.g. by the
+            # garbage collector; that context never saw the route
+            pass
+
+
+def current_route() -> Optional[ModelRoute]:
+    """The route set by the innermost use_route(), if any."""
+    return _current_route.get()
+
+
+class ModelRouter:
+    """
+    Pick models for requests and learn their latency.
+
+    A request's candidates are the models whose per-call budget fits the
+    whole request, closest tier first, then lowest predicted latency (from
+    the measured milliseconds per thousand tokens), then smallest budget,
+    since larger-context models cost more. The remaining models follow,
+    largest budget first. If no model fits, the largest one leads and the
+    request is chunked. Models that failed FAILURES_BEFORE_COOLDOWN times in
+    a row are moved to the end until ``cooldown_seconds`` have passed.
+    """
+
+    def __init__(self, models: List[ModelSpec] = None, cooldown_seconds: float = None):
+        self.config = Config()
+        self.models = models or parse_model_pool(self.config.GROQ_MODEL_POOL, self.config.GROQ_MODEL)
+        self.cooldown_seconds = self.config.MODEL_COOLDOWN_SECONDS if cooldown_seconds is None else cooldown_seconds
+        self._stats: Dict[str, ModelStats] = {model.name: ModelStats() for model in self.models}
+        self._lock = threading.Lock()
+
+    def _cooling_down(self, name: str, now: float) -> bool:
+        stats = self._stats[name]
+        return stats.consecutive_errors >= FAILURES_BEFORE_COOLDOWN and now - stats.last_error_at < self.cooldown_seconds
+
+    def predicted_ms(self, name: str, tokens: int) -> Optional[float]:
+        """Predicted latency of a call of ``tokens`` total tokens, or None before any sample."""
+        with self._lock:
+            rate = self._stats[name].ms_per_1k_tokens
+        return rate * tokens / 1000 if rate is not None else None
+
+    def route(self, input_tokens: int, output_tokens: int, tier: str = None) -> ModelRoute:
+        """
+        Rank the pool for a request.
+
+        Args:
+            input_tokens (int): Estimated prompt tokens of the whole request
+            output_tokens (int): Estimated summary tokens
+            tier (str, optional): "fast", "balanced" or "quality"; defaults to SUMMARY_TIER
+
+        Returns:
+            ModelRoute: Candidates in order of preference
+
+        Raises:
+            ModelRouterError: If the tier is unknown
+        """
+        tier = tier or self.config.SUMMARY_TIER
+        if tier not in MODEL_TIERS:
+            raise ModelRouterError(f"Unknown model tier: {tier}")
+        total = input_tokens + output_tokens
+        rank = MODEL_TIERS.index(tier)
+
+        def preference(model: ModelSpec):
+            predicted = self.predicted_ms(model.name, total)
+            # Models without samples rank as fastest, so each gets measured
+            return (abs(MODEL_TIERS.index(model.tier) - rank), predicted or 0.0, model.max_tokens)
+
+        fitting = sorted((m for m in self.models if m.max_tokens >= total), key=preference)
+        others = sorted(
+            (m for m in self.models if m.max_tokens < total),
+            key=lambda m: (-m.max_tokens, abs(MODEL_TIERS.index(m.tier) - rank))
+        )
+        candidates = fitting + others
+
+        now = time.monotonic()
+        with self._lock:
+            healthy = [m for m in candidates if not self._cooling_down(m.name, now)]
+            cooling = [m for m in candidates if self._cooling_down(m.name, now)]
+        return ModelRoute(healthy + cooling, output_tokens, tier)
+
+    def candidates_for(self, route: ModelRoute, call_tokens: int) -> List[ModelSpec]:
+        """
+        Candidates of a route that can take one call, in order of preference.
+
+        Args:
+            route (ModelRoute): Route of the request the call belongs to
+            call_tokens (int): Estimated prompt plus completion tokens of the call
+
+        Returns:
+            List[ModelSpec]: Models that fit the call, or all candidates if none does
+        """
+        fitting = [model for model in route.candidates if model.max_tokens >= call_tokens]
+        return fitting or list(route.candidates)
+
+    def record(self, name: str, seconds: float, tokens: int, error: bool = False):
+        """
+        Record the outcome of a call.
+
+        Args:
+            name (str): Model name
+            seconds (float): Call duration
+            tokens (int): Prompt plus completion tokens of the call
+            error (bool): Whether the call failed
+        """
+        with self._lock:
+            stats = self._stats.setdefault(name, ModelStats())
+            stats.calls += 1
+            if error:
+                stats.errors += 1
+                stats.consecutive_errors += 1
+                stats.last_error_at = time.monotonic()
+                return
+            stats.consecutive_errors = 0
+            stats.latency.observe(seconds)
+            sample = seconds * 1000 / max(1, tokens) * 1000
+            if stats.ms_per_1k_tokens is None:
+                stats.ms_per_1k_tokens = sample
+            else:
+                stats.ms_per_1k_tokens += LATENCY_EWMA_WEIGHT * (sample - stats.ms_per_1k_tokens)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-model statistics.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Calls, errors and latency by model name
+        """
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._stats.items()}
+
+    def render_metrics(self) -> List[str]:
+        """Prometheus lines for the router, for MetricsRegistry.add_collector()."""
+        with self._lock:
+            lines = []
+            name = f"{METRIC_PREFIX}_model_calls_total"
+            lines += [f"# HELP {name} LLM calls by model and result.", f"# TYPE {name} counter"]
+            for model, stats in sorted(self._stats.items()):
+                lines.append(f'{name}{{model="{model}",result="ok"}} {stats.calls - stats.errors}')
+                lines.append(f'{name}{{model="{model}",result="error"}} {stats.errors}')
+            name = f"{METRIC_PREFIX}_model_call_duration_seconds"
+            lines += [f"# HELP {name} Duration of successful LLM calls by model.", f"# TYPE {name} histogram"]
+            render_histograms(lines, name, "model", {model: stats.latency for model, stats in self._stats.items()})
+        return lines
+
+
+_model_router: Optional[ModelRouter] = None
+_model_router_lock = threading.Lock()
+
+
+def get_model_router() -> ModelRouter:
+    """
+    Get the process-wide router, creating it from the configuration.
+
+    Sharing one router lets latency measured for one session steer the
+    routing of all of them.
+
+    Returns:
+        ModelRouter: The shared router
+    """
+    global _model_router
+    with _model_router_lock:
+        if _model_router is None:
+            _model_router = ModelRouter()
+            get_metrics_registry().add_collector(_model_router.render_metrics)
+        return _model_router
@@ -0,0 +1,420 @@
+"""
+Near-duplicate detection for reusing summaries across mirrored content.
+
+Documents are fingerprinted with a 64-bit SimHash over word-pair shingles,
+computed with vectorized NumPy hashing. Two fingerprints within a few bits of
+each other come from nearly the same text, so a syndicated article or a
+mirrored press release maps to the summary already generated for its first
+copy.
+
+The index finds fingerprints within the Hamming distance allowed by the
+similarity threshold with LSH banding: the 64 bits are split into one more
+band than the allowed distance, so any match agrees exactly with the query on
+at least one band. For each band the fingerprints are kept rotated so the
+band is their top bits and sorted, so the entries sharing a query's band are
+one contiguous slice found with searchsorted and compared without gathers.
+Recent additions sit in a small unsorted tail that is scanned directly, which
+keeps lookups well under a millisecond at millions of fingerprints.
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import List, Any, Dict, Optional
+import numpy as np
+from config.settings import Config
+
+
+FINGERPRINT_BITS = 64
+# Single words make different articles on one topic look alike, while longer
+# shingles let a handful of edits flip many bits of a short article
+SHINGLE_WORDS = 2
+# SimHash is unreliable on short texts, which are also cheap to summarize
+MIN_FINGERPRINT_WORDS = 50
+# Shingles hashed per block, bounding the bit matrix to a few megabytes
+HASH_BLOCK_SHINGLES = 65536
+# Bands are never narrower than 4 bits, or every bucket would hold most entries
+MAX_BANDS = 16
+# Unsorted recent entries scanned directly before they are merged into the bands
+MAX_TAIL_ENTRIES = 4096
+# Seconds between checks for fingerprints added by other processes
+REFRESH_INTERVAL_SECONDS = 1.0
+
+_WORD = re.compile(r"[^\W_]+")
+_SHINGLE_MULTIPLIERS = (np.uint64(0x9E3779B97F4A7C15), np.uint64(0xC2B2AE3D27D4EB4F))
+
+
+class NearDuplicateError(Exception):
+    """Custom exception for near-duplicate index errors."""
+    pass
+
+
+@dataclass
+class NearDuplicateMatch:
+    """An indexed fingerprint close enough to a query to share its summary."""
+
+    summary_key: str
+    fingerprint: int
+    distance: int
+
+    @property
+    def similarity(self) -> float:
+        """Fraction of fingerprint bits the two documents agree on."""
+        return 1.0 - self.distance / FINGERPRINT_BITS
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """Scramble 64-bit values with the splitmix64 finalizer."""
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def _rotate_right(values: Any, bits: int) -> Any:
+    """Rotate 64-bit values right by the given number of bits."""
+    bits %= FINGERPRINT_BITS
+    if not bits:
+        return values
+    return (values >> np.uint64(bits)) | (values << np.uint64(FINGERPRINT_BITS - bits))
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    """Count the set bits of each 64-bit value."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    return np.unpackbits(values.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+def simhash(text: str) -> Optional[int]:
+    """
+    Compute the 64-bit SimHash of a text.
+
+    Words are lowercased and hashed once each with CRC-32; shingles of
+    SHINGLE_WORDS consecutive words are combined and mixed to 64 bits, and
+    every bit of the fingerprint is the majority vote of that bit over all
+    shingles. Fingerprints are stable across processes and runs.
+
+    Args:
+        text (str): Text to fingerprint
+
+    Returns:
+        Optional[int]: The fingerprint, or None for texts shorter than
+            MIN_FINGERPRINT_WORDS words
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) < MIN_FINGERPRINT_WORDS:
+        return None
+
+    word_hashes = {word: zlib.crc32(word.encode("utf-8")) for word in set(words)}
+    hashes = np.fromiter((word_hashes[word] for word in words), dtype=np.uint64, count=len(words))
+    shingles = len(words) - SHINGLE_WORDS + 1
+    combined = np.zeros(shingles, dtype=np.uint64)
+    for offset, multiplier in enumerate(_SHINGLE_MULTIPLIERS):
+        combined = combined + hashes[offset:offset + shingles] * multiplier
+    combined = _mix(combined)
+
+    votes = np.zeros(FINGERPRINT_BITS, dtype=np.int64)
+    for start in range(0, shingles, HASH_BLOCK_SHINGLES):
+        block = combined[start:start + HASH_BLOCK_SHINGLES].astype("<u8")
+        bits = np.unpackbits(block.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+        votes += bits.sum(axis=0, dtype=np.int64)
+    majority = np.packbits(2 * votes > shingles, bitorder="little")
+    return int(majority.view("<u8")[0])
+
+
+def fingerprint_documents(documents: List[Any]) -> Optional[int]:
+    """
+    Compute the SimHash of a list of documents' combined text.
+
+    Args:
+        documents (List[Any]): Documents to fingerprint
+
+    Returns:
+        Optional[int]: The fingerprint, or None if the text is too short
+    """
+    return simhash("\n".join(doc.page_content for doc in documents))
+
+
+class NearDuplicateIndex:
+    """
+    LSH index from document fingerprints to the summaries generated for them.
+
+    Entries carry a variant, a hash of the request parameters a summary
+    depends on besides the text (prompt and word count), and only entries of
+    the same variant match. With a database path the entries are stored in
+    SQLite, so every process sharing the file sees the others' summaries
+    within REFRESH_INTERVAL_SECONDS; each process keeps its own in-memory
+    copy for lookups. Beyond max_entries the oldest quarter is dropped.
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        db_path: Optional[str] = None
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            threshold (float, optional): Minimum similarity (fraction of equal
+                fingerprint bits) for a match, defaults to NEAR_DUPLICATE_THRESHOLD
+            max_entries (int, optional): Entries kept, defaults to
+                NEAR_DUPLICATE_MAX_ENTRIES
+            db_path (str, optional): SQLite file shared between processes;
+                the index is memory-only without one
+
+        Raises:
+            NearDuplicateError: If the threshold is not between 0 and 1
+        """
+        self.config = Config()
+        self.threshold = self.config.NEAR_DUPLICATE_THRESHOLD if threshold is None else threshold
+        if not 0.0 < self.threshold <= 1.0:
+            raise NearDuplicateError(f"Near-duplicate threshold must be in (0, 1], got {self.threshold}")
+        self.max_entries = max(1, max_entries or self.config.NEAR_DUPLICATE_MAX_ENTRIES)
+        self.max_distance = int((1.0 - self.threshold) * FINGERPRINT_BITS + 1e-9)
+
+        # One more band than the allowed distance guarantees a shared band;
+        # past MAX_BANDS the widest matches may be missed
+        band_count = min(self.max_distance + 1, MAX_BANDS)
+        width, wider = divmod(FINGERPRINT_BITS, band_count)
+        # (rotation bringing the band to the top bits, mask of the bits below it)
+        self._bands = []
+        end = 0
+        for band in range(band_count):
+            bits = width + (1 if band < wider else 0)
+            end += bits
+            self._bands.append((end, np.uint64((1 << (FINGERPRINT_BITS - bits)) - 1)))
+
+        self._lock = threading.Lock()
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._fingerprints = np.zeros(0, dtype=np.uint64)
+        self._variants = np.zeros(0, dtype=np.uint32)
+        # Raw SHA-256 summary keys, one row of 32 bytes per entry
+        self._keys = np.zeros((0, 32), dtype=np.uint8)
+        self._size = 0
+        self._next_id = 1
+        self._sorted_size = 0
+        self._band_fingerprints: List[np.ndarray] = [np.zeros(0, dtype=np.uint64) for _ in self._bands]
+        self._band_order: List[np.ndarray] = [np.zeros(0, dtype=np.uint32) for _ in self._bands]
+        self._refreshed_at = 0.0
+
+        self._conn = None
+        if db_path:
+            db_dir = os.path.dirname(db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS fingerprints (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    fingerprint INTEGER NOT NULL,
+                    variant INTEGER NOT NULL,
+                    summary_key BLOB NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+            with self._lock:
+                self._refresh()
+
+    @staticmethod
+    def variant(prompt: str, model: str = None, tier: str = None, strategy: str = None) -> int:
+        """
+        Hash the request parameters a summary depends on besides the text.
+
+        Args:
+            prompt (str): Prompt template text, which includes the word count
+            model (str, optional): Model the request is routed to
+            tier (str, optional): Model tier the request is routed to
+            strategy (str, optional): Summarization strategy
+
+        Returns:
+            int: Variant to pass to add() and lookup()
+        """
+        parts = [prompt, model or "", tier or "", strategy or ""]
+        return zlib.crc32("\x00".join(parts).encode("utf-8"))
+
+    def _append(self, ids: np.ndarray, fingerprints: np.ndarray, variants: np.ndarray, keys: np.ndarray):
+        """Append entries to the arrays, growing them geometrically. Caller must hold the lock."""
+        count = len(ids)
+        needed = self._size + count
+        if needed > len(self._ids):
+            capacity = max(needed, 2 * len(self._ids), 1024)
+            for name in ("_ids", "_fingerprints", "_variants", "_keys"):
+                old = getattr(self, name)
+                grown = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+                grown[:self._size] = old[:self._size]
+                setattr(self, name, grown)
+        self._ids[self._size:needed] = ids
+        self._fingerprints[self._size:needed] = fingerprints
+        self._variants[self._size:needed] = variants
+        self._keys[self._size:needed] = keys
+        self._size = needed
+        self._next_id = int(ids[-1]) + 1
+
+        if needed > self.max_entries:
+            self._evict(needed - max(1, self.max_entries * 3 // 4))
+        elif needed - self._sorted_size > MAX_TAIL_ENTRIES:
+            self._merge_tail()
+
+    def _evict(self, count: int):
+        """Drop the oldest entries and rebuild the bands. Caller must hold the lock."""
+        cutoff = int(self._ids[count - 1])
+        keep = slice(count, self._size)
+        self._ids = self._ids[keep].copy()
+        self._fingerprints = self._fingerprints[keep].copy()
+        self._variants = self._variants[keep].copy()
+        self._keys = self._keys[keep].copy()
+        self._size = len(self._ids)
+        self._sort_bands()
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM fingerprints WHERE id <= ?", (cutoff,))
+            self._conn.commit()
+
+    def _sort_bands(self):
+        """Sort every band over all entries, emptying the tail. Caller must hold the lock."""
+        fingerprints = self._fingerprints[:self._size]
+        self._band_fingerprints = []
+        self._band_order = []
+        for rotation, _ in self._bands:
+            rotated = _rotate_right(fingerprints, rotation)
+            order = np.argsort(rotated, kind="stable").astype(np.uint32)
+            self._band_fingerprints.append(rotated[order])
+            self._band_order.append(order)
+        self._sorted_size = self._size
+
+    def _merge_tail(self):
+        """Merge the unsorted tail into the sorted bands. Caller must hold the lock."""
+        tail = np.arange(self._sorted_size, self._size, dtype=np.uint32)
+        fingerprints = self._fingerprints[self._sorted_size:self._size]
+        for band, (rotation, _) in enumerate(self._bands):
+            rotated = _rotate_right(fingerprints, rotation)
+            order = np.argsort(rotated, kind="stable")
+            rotated = rotated[order]
+            # One linear pass instead of re-sorting the whole band
+            positions = np.searchsorted(self._band_fingerprints[band], rotated, side="right")
+            self._band_fingerprints[band] = np.insert(self._band_fingerprints[band], positions, rotated)
+            self._band_order[band] = np.insert(self._band_order[band], positions, tail[order])
+        self._sorted_size = self._size
+
+    def _refresh(self):
+        """Load entries other processes have stored since the last refresh. Caller must hold the lock."""
+        self._refreshed_at = time.monotonic()
+        rows = self._conn.execute(
+            "SELECT id, fingerprint, variant, summary_key FROM fingerprints WHERE id >= ? ORDER BY id",
+            (self._next_id,)
+        ).fetchall()
+        if not rows:
+            return
+        ids, fingerprints, variants, keys = zip(*rows)
+        self._append(
+            np.asarray(ids, dtype=np.int64),
+            # SQLite integers are signed; fingerprints are stored as their int64 bit pattern
+            np.asarray(fingerprints, dtype=np.int64).view(np.uint64),
+            np.asarray(variants, dtype=np.uint32),
+            np.frombuffer(b"".join(keys), dtype=np.uint8).reshape(-1, 32)
+        )
+
+    def add(self, fingerprint: int, variant: int, summary_key: str):
+        """
+        Index the summary generated for a fingerprinted document.
+
+        Args:
+            fingerprint (int): Document fingerprint from simhash()
+            variant (int): Request variant from variant()
+            summary_key (str): Hex summary cache key
+        """
+        key = bytes.fromhex(summary_key)
+        with self._lock:
+            if self._conn is not None:
+                signed = int(np.array(fingerprint, dtype=np.uint64).view(np.int64))
+                self._conn.execute(
+                    "INSERT INTO fingerprints (fingerprint, variant, summary_key) VALUES (?, ?, ?)",
+                    (signed, variant, key)
+                )
+                self._conn.commit()
+                self._refresh()
+                return
+            self._append(
+                np.asarray([self._next_id], dtype=np.int64),
+                np.asarray([fingerprint], dtype=np.uint64),
+                np.asarray([variant], dtype=np.uint32),
+                np.frombuffer(key, dtype=np.uint8).reshape(1, 32)
+            )
+
+    def lookup(self, fingerprint: int, variant: int) -> Optional[NearDuplicateMatch]:
+        """
+        Find the closest indexed fingerprint within the similarity threshold.
+
+        Args:
+            fingerprint (int): Document fingerprint from simhash()
+            variant (int): Request variant from variant()
+
+        Returns:
+            Optional[NearDuplicateMatch]: The closest match (the newest one
+                among equally close matches), or None
+        """
+        query = np.uint64(fingerprint)
+        with self._lock:
+            if self._conn is not None and time.monotonic() - self._refreshed_at >= REFRESH_INTERVAL_SECONDS:
+                self._refresh()
+            if not self._size:
+                return None
+
+            distances = _popcount(self._fingerprints[self._sorted_size:self._size] ^ query)
+            within = np.flatnonzero(distances <= self.max_distance)
+            indexes = [within.astype(np.uint32) + np.uint32(self._sorted_size)]
+            matched = [distances[within]]
+            for (rotation, mask), rotated_fingerprints, order in zip(self._bands, self._band_fingerprints, self._band_order):
+                rotated = _rotate_right(query, rotation)
+                start = np.searchsorted(rotated_fingerprints, rotated & ~mask, side="left")
+                end = np.searchsorted(rotated_fingerprints, rotated | mask, side="right")
+                distances = _popcount(rotated_fingerprints[start:end] ^ rotated)
+                within = np.flatnonzero(distances <= self.max_distance)
+                indexes.append(order[start + within])
+                matched.append(distances[within])
+            indexes = np.concatenate(indexes)
+            distances = np.concatenate(matched)
+            same_variant = self._variants[indexes] == variant
+            if not same_variant.any():
+                return None
+            indexes = indexes[same_variant]
+            distances = distances[same_variant]
+            position = np.lexsort((-self._ids[indexes], distances))[0]
+            best = indexes[position]
+            return NearDuplicateMatch(
+                summary_key=self._keys[best].tobytes().hex(),
+                fingerprint=int(self._fingerprints[best]),
+                distance=int(distances[position])
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the index size.
+
+        Returns:
+            Dict[str, int]: Entries, entries in the unsorted tail and bands
+        """
+        with self._lock:
+            return {
+                "entries": self._size,
+                "unsorted_entries": self._size - self._sorted_size,
+                "bands": len(self._bands)
+            }
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM fingerprints")
+                self._conn.commit()
+            self._size = 0
+            self._sort_bands()
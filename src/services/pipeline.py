@@ -0,0 +1,201 @@
+"""
+Asynchronous load-and-summarize pipeline.
+"""
+import asyncio
+import time
+from typing import List, Any, Dict, AsyncIterator, Callable, Optional
+from config.settings import Config
+from src.utils.url_utils import classify_url
+from src.utils.tracing import Trace, activate, span
+from .content_loader import ContentLoader, ContentLoaderError
+from .summarization import SummarizationService, SummarizationError
+
+
+async def _aload_url(url: str, content_loader: ContentLoader, record: Dict[str, Any]) -> Optional[List[Any]]:
+    """
+    Validate and load one URL inside the active trace.
+
+    The content type, canonical URL and any error are written to record.
+
+    Returns:
+        Optional[List[Any]]: The loaded documents, or None if the URL failed
+    """
+    with span("validate"):
+        is_valid, parsed_url, error_message = classify_url(url)
+    if not is_valid:
+        record.update({"content_type": None, "status": "error", "error": error_message})
+        return None
+    record.update({"content_type": parsed_url.kind, "canonical_url": parsed_url.canonical_url})
+    try:
+        with span("load", content_type=parsed_url.kind):
+            docs = await content_loader.aload_content(parsed_url)
+        if not content_loader.validate_documents(docs):
+            record.update({"status": "error", "error": "No content was extracted from the URL"})
+            return None
+        return docs
+    except ContentLoaderError as e:
+        record.update({"status": "error", "error": str(e)})
+    except Exception as e:
+        record.update({"status": "error", "error": f"Unexpected error: {str(e)}"})
+    return None
+
+
+async def summarize_urls(
+    urls: List[str],
+    content_loader: ContentLoader,
+    summarization_service: SummarizationService,
+    word_count: int = None,
+    prefetch: int = 1
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Load and summarize URLs, overlapping fetching with summarization.
+
+    A producer task fetches URLs in order into a bounded queue while the
+    consumer summarizes, so URL N+1 is being fetched while URL N is being
+    summarized. Results are yielded in input order.
+
+    Args:
+        urls (List[str]): URLs to process
+        content_loader (ContentLoader): Content loading service
+        summarization_service (SummarizationService): Summarization service
+        word_count (int, optional): Target word count for each summary
+        prefetch (int): How many loaded documents may wait for summarization
+
+    Yields:
+        Dict[str, Any]: Result record per URL with a "status" of "ok" or "error"
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, prefetch))
+    done = object()
+
+    async def produce():
+        for url in urls:
+            started = time.monotonic()
+            record = {"url": url}
+            trace = Trace("pipeline", url=url)
+            with activate(trace):
+                docs = await _aload_url(url, content_loader, record)
+            await queue.put((record, docs, started, trace))
+        await queue.put(done)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            record, docs, started, trace = item
+            if docs is not None:
+                with activate(trace):
+                    try:
+                        record.update(await summarization_service.asummarize_content(docs, word_count))
+                        record["status"] = "ok"
+                    except SummarizationError as e:
+                        record.update({"status": "error", "error": str(e)})
+                    except Exception as e:
+                        record.update({"status": "error", "error": f"Unexpected error: {str(e)}"})
+            if record.get("status") == "error":
+                trace.mark_error(record["error"])
+            trace.finish()
+            record["elapsed_seconds"] = round(time.monotonic() - started, 3)
+            record["trace_id"] = trace.trace_id
+            record["timings_ms"] = trace.stage_durations()
+            yield record
+        await producer
+    finally:
+        if not producer.done():
+            producer.cancel()
+
+
+async def compare_urls(
+    urls: List[str],
+    content_loader: ContentLoader,
+    summarization_service: SummarizationService,
+    word_count: int = None,
+    synthesis_word_count: int = None,
+    tier: str = None,
+    concurrency: int = None,
+    on_progress: Callable[[int, Dict[str, Any]], None] = None
+) -> Dict[str, Any]:
+    """
+    Summarize several URLs concurrently, then compare them in one synthesis.
+
+    Every URL is loaded and summarized in its own task, at most
+    ``concurrency`` at a time; the LLM calls are still paced by the rate
+    governor. Once all sources are done, the successful summaries are
+    combined by SummarizationService.asynthesize(). A failed source is
+    reported in its record and left out of the synthesis.
+
+    Args:
+        urls (List[str]): URLs to compare
+        content_loader (ContentLoader): Content loading service
+        summarization_service (SummarizationService): Summarization service
+        word_count (int, optional): Target word count for each source summary
+        synthesis_word_count (int, optional): Target word count for the synthesis
+        tier (str, optional): "fast", "balanced" or "quality", steering model routing
+        concurrency (int, optional): Sources processed at once, defaults to COMPARE_CONCURRENCY
+        on_progress (Callable, optional): Called with the index of a source and its record
+            each time the source moves to the "loading", "summarizing", "done" or "error" stage
+
+    Returns:
+        Dict[str, Any]: "sources" (one record per URL, in input order), "synthesis"
+            (None if it could not be written), "synthesis_error" and "elapsed_seconds"
+    """
+    config = Config()
+    started = time.monotonic()
+    slots = asyncio.Semaphore(max(1, concurrency or config.COMPARE_CONCURRENCY))
+    records: List[Dict[str, Any]] = [{"url": url, "stage": "queued"} for url in urls]
+
+    def report(index: int, stage: str):
+        records[index]["stage"] = stage
+        if on_progress is not None:
+            on_progress(index, records[index])
+
+    async def process(index: int, url: str):
+        record = records[index]
+        source_started = time.monotonic()
+        trace = Trace("compare", url=url)
+        async with slots:
+            with activate(trace):
+                report(index, "loading")
+                docs = await _aload_url(url, content_loader, record)
+                if docs is not None:
+                    report(index, "summarizing")
+                    try:
+                        record.update(await summarization_service.asummarize_content(docs, word_count, tier=tier))
+                        record["status"] = "ok"
+                    except SummarizationError as e:
+                        record.update({"status": "error", "error": str(e)})
+                    except Exception as e:
+                        record.update({"status": "error", "error": f"Unexpected error: {str(e)}"})
+        if record.get("status") == "error":
+            trace.mark_error(record["error"])
+        trace.finish()
+        record["elapsed_seconds"] = round(time.monotonic() - source_started, 3)
+        record["trace_id"] = trace.trace_id
+        record["timings_ms"] = trace.stage_durations()
+        report(index, "done" if record["status"] == "ok" else "error")
+
+    await asyncio.gather(*(process(index, url) for index, url in enumerate(urls)))
+
+    synthesis = None
+    synthesis_error = None
+    summarized = [record for record in records if record.get("status") == "ok"]
+    trace = Trace("synthesis", sources=len(summarized))
+    with activate(trace):
+        try:
+            synthesis = await summarization_service.asynthesize(summarized, synthesis_word_count, tier)
+            synthesis["trace_id"] = trace.trace_id
+        except SummarizationError as e:
+            synthesis_error = str(e)
+        except Exception as e:
+            synthesis_error = f"Unexpected error: {str(e)}"
+    if synthesis_error is not None:
+        trace.mark_error(synthesis_error)
+    trace.finish()
+
+    return {
+        "sources": records,
+        "synthesis": synthesis,
+        "synthesis_error": synthesis_error,
+        "elapsed_seconds": round(time.monotonic() - started, 3)
+    }
@@ -0,0 +1,502 @@
+"""
+Versioned prompt templates and a memoized summarize chain factory.
+
+A prompt version is a named set of the templates the summarizer uses:
+"summary" (stuff and the reduce step), "map", "refine" and "synthesis"
+(comparing the summaries of several sources). The built-in
+version is "v1". PROMPTS_FILE can add versions and choose the active ones.
+The file is re-read when it changes, so prompts can be swapped without a
+restart. With several active versions, each request gets one according to
+their weights, and a given document always gets the same one, which makes
+A/B comparisons possible from the ``prompt_version`` of each result.
+"""
+import json
+import logging
+import os
+import string
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Any, Dict, Optional, Tuple
+from config.settings import Config
+from src.utils.tracing import METRIC_PREFIX, get_metrics_registry, record_cache
+
+
+PROMPT_KINDS = ("summary", "map", "refine", "synthesis")
+DEFAULT_PROMPT_VERSION = "v1"
+
+# Variables each kind of template must use; "{word_count}" is optional
+REQUIRED_VARIABLES = {
+    "summary": ("text",),
+    "map": ("text",),
+    "refine": ("existing_answer", "text"),
+    "synthesis": ("text",)
+}
+
+# Seconds between checks of PROMPTS_FILE for changes
+RELOAD_INTERVAL_SECONDS = 1.0
+# Prompt templates and summarize chains kept in memory
+TEMPLATE_CACHE_SIZE = 256
+CHAIN_CACHE_SIZE = 64
+
+DEFAULT_TEMPLATES = {
+    "summary": """
+        Provide a comprehensive and well-structured summary of the following content in approximately {word_count} words.
+        Focus on the main points, key insights, and important details. Structure your response with clear paragraphs
+        and maintain the most crucial information while making it concise and readable.
+
+        Content: {text}
+
+        Summary:
+        """,
+    "map": """
+        The following is one part of a longer piece of content. Write a concise summary of this part,
+        keeping every main point, key insight and important detail so it can later be combined with
+        summaries of the other parts.
+
+        Content: {text}
+
+        Partial summary:
+        """,
+    "refine": """
+        Here is an existing summary of the content so far:
+        {existing_answer}
+
+        Refine it using the additional content below, producing a comprehensive and well-structured
+        summary of approximately {word_count} words. Keep the main points, key insights and important details.
+
+        Additional content: {text}
+
+        Refined summary:
+        """,
+    "synthesis": """
+        Below are summaries of several sources on the same topic, each labelled with its number and URL.
+        Write a comparative synthesis of approximately {word_count} words: where the sources agree, where
+        they differ or contradict each other, and what only one of them covers. Cite sources by their
+        label, e.g. [Source 2], and do not add facts that are not in the summaries.
+
+        Summaries:
+        {text}
+
+        Comparative synthesis:
+        """
+}
+
+_logger = logging.getLogger("content_summarizer.prompts")
+
+
+class PromptLibraryError(Exception):
+    """Custom exception for prompt library errors."""
+    pass
+
+
+@dataclass
+class PromptVersion:
+    """A named set of prompt templates."""
+    name: str
+    templates: Dict[str, str]
+    # Changes whenever the text of any template changes
+    revision: int = field(init=False)
+
+    def __post_init__(self):
+        self.revision = zlib.crc32("\x00".join(self.templates[kind] for kind in PROMPT_KINDS).encode("utf-8"))
+
+    def render(self, kind: str, word_count: Optional[int] = None) -> str:
+        """
+        Template text with the word count filled in.
+
+        Args:
+            kind (str): "summary", "map", "refine" or "synthesis"
+            word_count (int, optional): Target word count of the summary
+
+        Returns:
+            str: Template text with LangChain variables such as ``{text}`` left in
+        """
+        return self.templates[kind].replace("{word_count}", str(word_count))
+
+
+def validate_templates(name: str, templates: Dict[str, str], base: Optional[PromptVersion] = None) -> PromptVersion:
+    """
+    Build a prompt version, checking the variables of every template.
+
+    Args:
+        name (str): Version name
+        templates (Dict[str, str]): Templates by kind; kinds left out are taken from base
+        base (PromptVersion, optional): Version to take missing kinds from
+
+    Returns:
+        PromptVersion: The validated version
+
+    Raises:
+        PromptLibraryError: If a kind is unknown, missing or uses the wrong variables
+    """
+    unknown = set(templates) - set(PROMPT_KINDS)
+    if unknown:
+        raise PromptLibraryError(f"Prompt version {name} has unknown template kinds: {', '.join(sorted(unknown))}")
+    merged = {}
+    for kind in PROMPT_KINDS:
+        text = templates.get(kind)
+        if text is None and base is not None:
+            text = base.templates[kind]
+        if not isinstance(text, str) or not text.strip():
+            raise PromptLibraryError(f"Prompt version {name} has no {kind} template")
+        try:
+            variables = {variable for _, variable, _, _ in string.Formatter().parse(text) if variable is not None}
+        except ValueError as e:
+            raise PromptLibraryError(f"Prompt version {name} has an invalid {kind} template: {str(e)}")
+        required = set(REQUIRED_VARIABLES[kind])
+        if not required <= variables or not variables <= required | {"word_count"}:
+            raise PromptLibraryError(
+                f"The {kind} template of prompt version {name} must use "
+                f"{', '.join('{' + variable + '}' for variable in sorted(required))} "
+                "and may only add {word_count}; write other braces as {{ and }}"
+            )
+        merged[kind] = text
+    return PromptVersion(name=name, templates=merged)
+
+
+def parse_version_weights(spec: str) -> List[Tuple[str, float]]:
+    """
+    Parse an active-versions setting.
+
+    Args:
+        spec (str): One version name, or weighted versions such as "v1=90,v2=10"
+
+    Returns:
+        List[Tuple[str, float]]: Version names and their share of requests, summing to 1
+
+    Raises:
+        PromptLibraryError: If the setting is malformed
+    """
+    weights = []
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        try:
+            value = float(weight) if weight.strip() else 1.0
+        except ValueError:
+            raise PromptLibraryError(f"Invalid prompt version weight: {part.strip()}")
+        if value < 0:
+            raise PromptLibraryError(f"Invalid prompt version weight: {part.strip()}")
+        weights.append((name.strip(), value))
+    total = sum(value for _, value in weights)
+    if not weights or total <= 0:
+        raise PromptLibraryError(f"No prompt version selected by {spec!r}")
+    return [(name, value / total) for name, value in weights if value > 0]
+
+
+class PromptLibrary:
+    """
+    The available prompt versions and the ones requests currently use.
+
+    The active versions come from set_active() if it was called, otherwise
+    from the "active" entry of PROMPTS_FILE, otherwise from PROMPT_VERSION.
+    """
+
+    def __init__(self, path: Optional[str] = None, active: Optional[str] = None):
+        """
+        Load the built-in version and PROMPTS_FILE.
+
+        Args:
+            path (str, optional): JSON file of extra versions, defaults to PROMPTS_FILE
+            active (str, optional): Active versions, defaults to PROMPT_VERSION
+        """
+        self.path = Config.PROMPTS_FILE if path is None else path
+        self._lock = threading.Lock()
+        self._builtin = {DEFAULT_PROMPT_VERSION: validate_templates(DEFAULT_PROMPT_VERSION, DEFAULT_TEMPLATES)}
+        self._registered: Dict[str, PromptVersion] = {}
+        self._file_versions: Dict[str, PromptVersion] = {}
+        self._file_active: Optional[List[Tuple[str, float]]] = None
+        self._override_active: Optional[List[Tuple[str, float]]] = None
+        self._config_active = parse_version_weights(active or Config.PROMPT_VERSION)
+        self._file_mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._templates: "OrderedDict[Tuple[str, int, str, Optional[int]], Any]" = OrderedDict()
+        self._selections: Dict[str, int] = {}
+        self.last_error: Optional[str] = None
+        with self._lock:
+            self._reload(time.monotonic())
+
+    def _versions(self) -> Dict[str, PromptVersion]:
+        """All versions by name; later sources win. Caller must hold the lock."""
+        return {**self._builtin, **self._file_versions, **self._registered}
+
+    def _reload(self, now: float):
+        """Re-read PROMPTS_FILE if it changed. Caller must hold the lock."""
+        self._checked_at = now
+        if not self.path:
+            return
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+        if mtime == self._file_mtime:
+            return
+        self._file_mtime = mtime
+        if mtime is None:
+            self._file_versions, self._file_active = {}, None
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            base = self._builtin[DEFAULT_PROMPT_VERSION]
+            versions = {
+                name: validate_templates(name, templates, base)
+                for name, templates in (data.get("versions") or {}).items()
+            }
+            active = parse_version_weights(data["active"]) if data.get("active") else None
+            known = {**self._builtin, **versions, **self._registered}
+            for name, _ in active or []:
+                if name not in known:
+                    raise PromptLibraryError(f"Unknown active prompt version: {name}")
+        except (OSError, ValueError, AttributeError, PromptLibraryError) as e:
+            # A broken edit keeps the prompts that were working
+            self.last_error = f"Failed to load {self.path}: {str(e)}"
+            _logger.warning(self.last_error)
+            return
+        self._file_versions, self._file_active = versions, active
+        self.last_error = None
+
+    def _refresh(self):
+        """Check PROMPTS_FILE at most once per RELOAD_INTERVAL_SECONDS. Caller must hold the lock."""
+        now = time.monotonic()
+        if now - self._checked_at >= RELOAD_INTERVAL_SECONDS:
+            self._reload(now)
+
+    def _active(self) -> List[Tuple[str, float]]:
+        """The active versions that exist. Caller must hold the lock."""
+        versions = self._versions()
+        for active in (self._override_active, self._file_active, self._config_active):
+            if active and all(name in versions for name, _ in active):
+                return active
+        return [(DEFAULT_PROMPT_VERSION, 1.0)]
+
+    def register(self, name: str, templates: Dict[str, str]) -> PromptVersion:
+        """
+        Add or replace a prompt version at runtime.
+
+        Args:
+            name (str): Version name
+            templates (Dict[str, str]): Templates by kind; missing kinds come from the built-in version
+
+        Returns:
+            PromptVersion: The registered version
+
+        Raises:
+            PromptLibraryError: If a template is invalid
+        """
+        version = validate_templates(name, templates, self._builtin[DEFAULT_PROMPT_VERSION])
+        with self._lock:
+            self._registered[name] = version
+        return version
+
+    def set_active(self, spec: Optional[str]):
+        """
+        Choose the versions requests use, overriding PROMPTS_FILE and PROMPT_VERSION.
+
+        Args:
+            spec (str, optional): One version name, weighted versions such as
+                "v1=90,v2=10", or None to drop the override
+
+        Raises:
+            PromptLibraryError: If the setting is malformed or names an unknown version
+        """
+        active = parse_version_weights(spec) if spec is not None else None
+        with self._lock:
+            versions = self._versions()
+            for name, _ in active or []:
+                if name not in versions:
+                    raise PromptLibraryError(f"Unknown prompt version: {name}")
+            self._override_active = active
+
+    def versions(self) -> List[str]:
+        """
+        Get the names of all versions.
+
+        Returns:
+            List[str]: Version names, sorted
+        """
+        with self._lock:
+            self._refresh()
+            return sorted(self._versions())
+
+    def active(self) -> List[Tuple[str, float]]:
+        """
+        Get the active versions.
+
+        Returns:
+            List[Tuple[str, float]]: Version names and their share of requests
+        """
+        with self._lock:
+            self._refresh()
+            return list(self._active())
+
+    def get(self, name: str) -> PromptVersion:
+        """
+        Look up a version by name.
+
+        Args:
+            name (str): Version name
+
+        Returns:
+            PromptVersion: The version
+
+        Raises:
+            PromptLibraryError: If there is no such version
+        """
+        with self._lock:
+            self._refresh()
+            version = self._versions().get(name)
+        if version is None:
+            raise PromptLibraryError(f"Unknown prompt version: {name}")
+        return version
+
+    def select(self, content: Optional[str] = None) -> PromptVersion:
+        """
+        Pick the version for a request.
+
+        Args:
+            content (str, optional): Text of the request; with several active
+                versions, the same text always gets the same version
+
+        Returns:
+            PromptVersion: The selected version
+        """
+        with self._lock:
+            self._refresh()
+            active = self._active()
+            name = active[0][0]
+            if len(active) > 1:
+                point = (zlib.crc32(content.encode("utf-8")) if content else 0) / 2 ** 32
+                for name, share in active:
+                    point -= share
+                    if point < 0:
+                        break
+            self._selections[name] = self._selections.get(name, 0) + 1
+            return self._versions()[name]
+
+    def template(self, version: PromptVersion, kind: str, word_count: Optional[int] = None) -> Any:
+        """
+        Get a LangChain prompt template, built once per version, kind and word count.
+
+        Args:
+            version (PromptVersion): Prompt version
+            kind (str): "summary", "map", "refine" or "synthesis"
+            word_count (int, optional): Target word count of the summary
+
+        Returns:
+            PromptTemplate: The prompt template
+        """
+        key = (version.name, version.revision, kind, word_count if "{word_count}" in version.templates[kind] else None)
+        with self._lock:
+            prompt = self._templates.get(key)
+            if prompt is not None:
+                self._templates.move_to_end(key)
+                return prompt
+        from langchain.prompts import PromptTemplate
+        prompt = PromptTemplate(template=version.render(kind, word_count), input_variables=list(REQUIRED_VARIABLES[kind]))
+        with self._lock:
+            self._templates[key] = prompt
+            while len(self._templates) > TEMPLATE_CACHE_SIZE:
+                self._templates.popitem(last=False)
+        return prompt
+
+    def render_metrics(self) -> List[str]:
+        """Render per-version selection counts as Prometheus text lines."""
+        with self._lock:
+            selections = dict(self._selections)
+        name = f"{METRIC_PREFIX}_prompt_selections_total"
+        lines = [f"# HELP {name} Requests per prompt version.", f"# TYPE {name} counter"]
+        for version, count in sorted(selections.items()):
+            lines.append(f'{name}{{version="{version}"}} {count}')
+        return lines
+
+
+class ChainFactory:
+    """
+    Summarize chains built once per chat model, chain type, prompt version and word count.
+
+    Building a chain constructs and validates several LangChain objects.
+    Chains keep no state between calls, so one instance serves every
+    request and thread.
+    """
+
+    def __init__(self, library: PromptLibrary, max_entries: int = CHAIN_CACHE_SIZE):
+        """
+        Create an empty factory.
+
+        Args:
+            library (PromptLibrary): Library the chains' prompt templates come from
+            max_entries (int): Chains kept before the least recently used is dropped
+        """
+        self.library = library
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._chains: "OrderedDict[Tuple[int, str, str, int, int], Any]" = OrderedDict()
+
+    def get(self, llm: Any, chain_type: str, version: PromptVersion, word_count: int) -> Any:
+        """
+        Get the summarize chain for a request.
+
+        Args:
+            llm (Any): Chat model the chain calls
+            chain_type (str): "stuff" or "refine"
+            version (PromptVersion): Prompt version
+            word_count (int): Target word count of the summary
+
+        Returns:
+            Any: The LangChain summarize chain
+        """
+        # Entries hold the model, so its id is not reused while they exist
+        key = (id(llm), chain_type, version.name, version.revision, word_count)
+        with self._lock:
+            chain = self._chains.get(key)
+            if chain is not None:
+                self._chains.move_to_end(key)
+        record_cache("chains", chain is not None)
+        if chain is not None:
+            return chain
+
+        from langchain.chains.summarize import load_summarize_chain
+        prompt = self.library.template(version, "summary", word_count)
+        if chain_type == "refine":
+            chain = load_summarize_chain(
+                llm,
+                chain_type="refine",
+                question_prompt=prompt,
+                refine_prompt=self.library.template(version, "refine", word_count)
+            )
+        else:
+            chain = load_summarize_chain(llm, chain_type=chain_type, prompt=prompt)
+        with self._lock:
+            self._chains[key] = chain
+            while len(self._chains) > self.max_entries:
+                self._chains.popitem(last=False)
+        return chain
+
+    def clear(self):
+        """Drop every chain, e.g. after the chat model was replaced."""
+        with self._lock:
+            self._chains.clear()
+
+
+_prompt_library: Optional[PromptLibrary] = None
+_prompt_library_lock = threading.Lock()
+
+
+def get_prompt_library() -> PromptLibrary:
+    """
+    Get the process-wide prompt library.
+
+    Returns:
+        PromptLibrary: The shared library
+    """
+    global _prompt_library
+    with _prompt_library_lock:
+        if _prompt_library is None:
+            _prompt_library = PromptLibrary()
+            get_metrics_registry().add_collector(_prompt_library.render_metrics)
+        return _prompt_library
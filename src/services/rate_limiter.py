@@ -0,0 +1,389 @@
+"""
+Client-side rate limiting for LLM calls.
+
+Groq enforces requests-per-minute and tokens-per-minute limits per API key.
+RateGovernor keeps the process inside both budgets with two token buckets,
+hands out call slots fairly across sessions, and pauses everyone when the API
+answers 429 with a Retry-After header. GovernedChatModel
+(src/services/chat_models.py) wraps a chat model so that every call,
+including those made inside summarize chains, goes through the governor.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Any, Dict, Iterator, Optional
+from config.settings import Config
+from src.utils.tracing import DURATION_BUCKETS, METRIC_PREFIX, Histogram, current_trace, get_metrics_registry
+
+
+# Backoff for retried server errors; 429s wait for Retry-After instead
+SERVER_ERROR_BACKOFF_SECONDS = 0.5
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+
+_current_session: ContextVar[Optional[str]] = ContextVar("rate_limit_session", default=None)
+
+
+class RateLimitError(Exception):
+    """Raised when an LLM call cannot get a rate-limit slot in time."""
+    pass
+
+
+@contextmanager
+def rate_limit_session(session: str) -> Iterator[None]:
+    """
+    Attribute LLM calls made in this context to a session for fair queueing.
+
+    Args:
+        session (str): Session identifier, e.g. one per browser session
+    """
+    token = _current_session.set(session)
+    try:
+        yield
+    finally:
+        _current_session.reset(token)
+
+
+def _session_key() -> str:
+    """Fair-queueing key of the calling context."""
+    session = _current_session.get()
+    if session is not None:
+        return session
+    trace = current_trace()
+    return f"trace:{trace.trace_id}" if trace is not None else "default"
+
+
+class TokenBucket:
+    """
+    Bucket that refills continuously up to its capacity.
+
+    Consuming more than is available drives the level negative; the debt is
+    repaid by later refills. This lets a request larger than the whole
+    capacity through once the bucket is full instead of blocking forever.
+    """
+
+    def __init__(self, per_minute: float, period_seconds: float = 60.0):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / period_seconds
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` (capped at the capacity) is available."""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def consume(self, amount: float, now: float):
+        """Take ``amount`` from the bucket; a negative amount gives it back."""
+        self._refill(now)
+        self.level = min(self.capacity, self.level - amount)
+
+
+def _wake(future: "asyncio.Future"):
+    """Resolve a parked async waiter's future, unless it already gave up."""
+    if not future.done():
+        future.set_result(None)
+
+
+class _Waiter:
+    """A call queued for a rate-limit slot."""
+
+    def __init__(self, session: str, tokens: int):
+        self.session = session
+        self.tokens = tokens
+
+
+class Permit:
+    """
+    Slot granted by RateGovernor.acquire().
+
+    Release it when the call finishes, passing the actual token usage if the
+    API reported it so the token budget is corrected.
+    """
+
+    def __init__(self, governor: Optional["RateGovernor"], tokens: int, waited: float):
+        self.governor = governor
+        self.tokens = tokens
+        self.waited = waited
+        self._released = False
+
+    def release(self, actual_tokens: int = None):
+        """Return the concurrency slot and settle the token estimate."""
+        if self._released:
+            return
+        self._released = True
+        if self.governor is not None:
+            self.governor._release(self, actual_tokens)
+
+    def __enter__(self) -> "Permit":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+class RateGovernor:
+    """
+    Token-bucket governor for requests and tokens per minute.
+
+    Waiting calls are queued per session and served round-robin, one call per
+    session per turn, so a session that fans out many map calls cannot starve
+    the others. A limit of 0 disables that dimension. Only ``headroom`` of
+    each limit is used: token counts are estimates, and the API starts
+    refilling its buckets slightly later than the client does. ``period_seconds``
+    shortens the one-minute window, e.g. to exercise the limits quickly
+    against a fake endpoint.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = None,
+        tokens_per_minute: int = None,
+        max_concurrency: int = None,
+        max_wait_seconds: float = None,
+        period_seconds: float = 60.0,
+        headroom: float = None
+    ):
+        self.config = Config()
+        requests_per_minute = self.config.GROQ_REQUESTS_PER_MINUTE if requests_per_minute is None else requests_per_minute
+        tokens_per_minute = self.config.GROQ_TOKENS_PER_MINUTE if tokens_per_minute is None else tokens_per_minute
+        self.max_concurrency = self.config.LLM_MAX_CONCURRENCY if max_concurrency is None else max_concurrency
+        self.max_wait_seconds = max_wait_seconds or self.config.LLM_RATE_LIMIT_MAX_WAIT_SECONDS
+        headroom = headroom or self.config.LLM_RATE_LIMIT_HEADROOM
+        requests_per_minute *= headroom
+        tokens_per_minute *= headroom
+        self.requests = TokenBucket(requests_per_minute, period_seconds) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute, period_seconds) if tokens_per_minute > 0 else None
+
+        self._condition = threading.Condition()
+        # Futures that async waiters are parked on, woken with the condition
+        self._wakeups: List[Any] = []
+        self._queues: "OrderedDict[str, deque]" = OrderedDict()
+        self._queue_depth = 0
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._wait_histogram = Histogram()
+        self.throttled = 0
+        self.timeouts = 0
+
+    def _head(self) -> Optional[_Waiter]:
+        """The waiter whose turn it is: the oldest call of the next session."""
+        for queue in self._queues.values():
+            return queue[0]
+        return None
+
+    def _delay(self, waiter: _Waiter, now: float) -> Optional[float]:
+        """Seconds until the head waiter may run, or None if it must wait for a release."""
+        if self.max_concurrency > 0 and self._in_flight >= self.max_concurrency:
+            return None
+        delay = max(0.0, self._paused_until - now)
+        if self.requests is not None:
+            delay = max(delay, self.requests.wait_time(1, now))
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.wait_time(waiter.tokens, now))
+        return delay
+
+    def _notify(self):
+        """Wake every waiting thread and async waiter; call with the condition held."""
+        self._condition.notify_all()
+        for loop, future in self._wakeups:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                # The waiter's loop is closed; nobody is left to wake
+                pass
+
+    def _enqueue(self, waiter: _Waiter):
+        self._queues.setdefault(waiter.session, deque()).append(waiter)
+        self._queue_depth += 1
+
+    def _dequeue(self, waiter: _Waiter, served: bool):
+        queue = self._queues[waiter.session]
+        queue.remove(waiter)
+        self._queue_depth -= 1
+        if not queue:
+            del self._queues[waiter.session]
+        elif served:
+            # The session goes to the back of the rotation after each call
+            self._queues.move_to_end(waiter.session)
+
+    def _grant(self, waiter: _Waiter, now: float, started: float) -> Permit:
+        """Take the head waiter's slot; call with the condition held."""
+        self._dequeue(waiter, served=True)
+        if self.requests is not None:
+            self.requests.consume(1, now)
+        if self.tokens is not None:
+            self.tokens.consume(waiter.tokens, now)
+        self._in_flight += 1
+        waited = now - started
+        self._wait_histogram.observe(waited)
+        # The next session in the rotation may be able to go right away
+        self._notify()
+        return Permit(self, waiter.tokens, waited)
+
+    def _give_up(self, waiter: _Waiter):
+        """Drop a waiter that timed out; call with the condition held."""
+        self._dequeue(waiter, served=False)
+        self.timeouts += 1
+        self._notify()
+        raise RateLimitError(f"No LLM rate-limit slot became free within {self.max_wait_seconds:g} seconds")
+
+    def acquire(self, estimated_tokens: int, session: str = None) -> Permit:
+        """
+        Wait for a slot within the request, token and concurrency limits.
+
+        Args:
+            estimated_tokens (int): Expected prompt plus completion tokens
+            session (str, optional): Queue to wait in; defaults to the
+                caller's rate_limit_session(), then to its trace, so each
+                request queues separately
+
+        Returns:
+            Permit: The granted slot; release it when the call finishes
+
+        Raises:
+            RateLimitError: If no slot frees up within max_wait_seconds
+        """
+        waiter = _Waiter(session or _session_key(), max(1, int(estimated_tokens)))
+        started = time.monotonic()
+        deadline = started + self.max_wait_seconds
+        with self._condition:
+            self._enqueue(waiter)
+            while True:
+                now = time.monotonic()
+                delay = self._delay(waiter, now) if self._head() is waiter else None
+                if delay == 0:
+                    return self._grant(waiter, now, started)
+                remaining = deadline - now
+                if remaining <= 0:
+                    self._give_up(waiter)
+                self._condition.wait(remaining if delay is None else min(delay, remaining))
+
+    async def aacquire(self, estimated_tokens: int, session: str = None) -> Permit:
+        """
+        Async counterpart of acquire().
+
+        The caller waits on a future of its event loop rather than in a
+        thread, so cancelling it leaves the queue without taking a slot.
+        """
+        waiter = _Waiter(session or _session_key(), max(1, int(estimated_tokens)))
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        deadline = started + self.max_wait_seconds
+        with self._condition:
+            self._enqueue(waiter)
+        try:
+            while True:
+                with self._condition:
+                    now = time.monotonic()
+                    delay = self._delay(waiter, now) if self._head() is waiter else None
+                    if delay == 0:
+                        return self._grant(waiter, now, started)
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._give_up(waiter)
+                    wakeup = (loop, loop.create_future())
+                    self._wakeups.append(wakeup)
+                try:
+                    await asyncio.wait_for(wakeup[1], remaining if delay is None else min(delay, remaining))
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    with self._condition:
+                        self._wakeups.remove(wakeup)
+        except asyncio.CancelledError:
+            with self._condition:
+                # Granting and giving up both dequeue the waiter under the lock
+                if waiter in self._queues.get(waiter.session, ()):
+                    self._dequeue(waiter, served=False)
+                    self._notify()
+            raise
+
+    def _release(self, permit: Permit, actual_tokens: Optional[int]):
+        with self._condition:
+            self._in_flight -= 1
+            if actual_tokens is not None and self.tokens is not None:
+                self.tokens.consume(actual_tokens - permit.tokens, time.monotonic())
+            self._notify()
+
+    def pause(self, seconds: float):
+        """
+        Hold all calls for a while, e.g. for the Retry-After of a 429 response.
+
+        Args:
+            seconds (float): Seconds from now before the next call may start
+        """
+        with self._condition:
+            self.throttled += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._notify()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get governor counters.
+
+        Returns:
+            Dict[str, Any]: Queue depth, calls in flight, 429 responses, wait
+                timeouts and the mean wait in seconds
+        """
+        with self._condition:
+            count = self._wait_histogram.count
+            return {
+                "queue_depth": self._queue_depth,
+                "in_flight": self._in_flight,
+                "throttled": self.throttled,
+                "timeouts": self.timeouts,
+                "calls": count,
+                "mean_wait_seconds": self._wait_histogram.sum / count if count else 0.0
+            }
+
+    def render_metrics(self) -> List[str]:
+        """Prometheus lines for the governor, for MetricsRegistry.add_collector()."""
+        with self._condition:
+            histogram = self._wait_histogram
+            lines = []
+            for suffix, kind, help_text, value in (
+                ("llm_queue_depth", "gauge", "LLM calls waiting for a rate-limit slot.", self._queue_depth),
+                ("llm_in_flight", "gauge", "LLM calls currently running.", self._in_flight),
+                ("llm_throttled_total", "counter", "429 responses received from the LLM API.", self.throttled),
+                ("llm_rate_limit_timeouts_total", "counter", "LLM calls that gave up waiting for a slot.", self.timeouts)
+            ):
+                name = f"{METRIC_PREFIX}_{suffix}"
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+            name = f"{METRIC_PREFIX}_llm_rate_wait_seconds"
+            lines += [f"# HELP {name} Time LLM calls waited for a rate-limit slot.", f"# TYPE {name} histogram"]
+            for bound, count in zip(DURATION_BUCKETS, histogram.buckets):
+                lines.append(f'{name}_bucket{{le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{le="+Inf"}} {histogram.count}')
+            lines.append(f"{name}_sum {round(histogram.sum, 6)}")
+            lines.append(f"{name}_count {histogram.count}")
+        return lines
+
+
+_rate_governor: Optional[RateGovernor] = None
+_rate_governor_lock = threading.Lock()
+
+
+def get_rate_governor() -> RateGovernor:
+    """
+    Get the process-wide governor, creating it from the configuration.
+
+    API limits apply per key, so every service in the process shares one
+    governor and its metrics are exported with the other metrics.
+
+    Returns:
+        RateGovernor: The shared governor
+    """
+    global _rate_governor
+    with _rate_governor_lock:
+        if _rate_governor is None:
+            _rate_governor = RateGovernor()
+            get_metrics_registry().add_collector(_rate_governor.render_metrics)
+        return _rate_governor
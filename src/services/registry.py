@@ -0,0 +1,163 @@
+"""
+Process-wide registry for long-lived application services.
+"""
+import hashlib
+import threading
+from typing import Optional, Tuple
+from config.settings import Config
+from .cache import ContentCache
+from .content_loader import ContentLoader
+from .transcript_store import TranscriptStore
+from .summarization import SummarizationService
+from .summary_archive import get_summary_archive
+
+
+class ServiceRegistry:
+    """
+    Builds application services once per process and shares them across sessions.
+
+    Streamlit re-executes the script on every interaction, so services (and the
+    HTTP connection pool held by the Groq client) are kept here instead of being
+    rebuilt on each rerun. The registry rebuilds automatically when the
+    configuration it was built from changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._content_loader: Optional[ContentLoader] = None
+        self._summarization_service: Optional[SummarizationService] = None
+        self._cache: Optional[ContentCache] = None
+        self._fingerprint: Optional[str] = None
+        self._warm_up: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _config_fingerprint() -> str:
+        """
+        Compute a fingerprint of the settings that affect service construction.
+
+        Returns:
+            str: Hex digest identifying the current configuration
+        """
+        parts = [
+            Config.GROQ_API_KEY,
+            Config.GROQ_MODEL,
+            Config.GROQ_MODEL_POOL,
+            str(Config.CACHE_ENABLED),
+            str(Config.CACHE_MAX_ENTRIES),
+            str(Config.CACHE_TTL_SECONDS),
+            Config.CACHE_DB_PATH,
+            str(Config.CACHE_DB_MAX_ENTRIES),
+            Config.TRANSCRIPT_STORE_DIR,
+            str(Config.TRANSCRIPT_STORE_MAX_BYTES),
+            str(Config.ARCHIVE_ENABLED)
+        ]
+        return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+    def get_services(self) -> Tuple[ContentLoader, SummarizationService]:
+        """
+        Return the shared services, building them on first use.
+
+        Returns:
+            Tuple[ContentLoader, SummarizationService]: Shared service instances
+
+        Raises:
+            ContentLoaderError: If the content loader cannot be created
+            SummarizationError: If the summarization service cannot be created
+        """
+        fingerprint = self._config_fingerprint()
+        with self._lock:
+            if self._fingerprint != fingerprint or not self._is_built():
+                self._build(fingerprint)
+            return self._content_loader, self._summarization_service
+
+    def _is_built(self) -> bool:
+        """Check whether all services have been constructed."""
+        return self._content_loader is not None and self._summarization_service is not None
+
+    def _build(self, fingerprint: str):
+        """Construct fresh service instances. Caller must hold the lock."""
+        cache = ContentCache() if Config.CACHE_ENABLED else None
+        transcript_store = TranscriptStore() if Config.TRANSCRIPT_STORE_DIR else None
+        content_loader = ContentLoader(cache=cache, transcript_store=transcript_store)
+        summarization_service = SummarizationService(cache=cache, archive=get_summary_archive())
+        self._cache = cache
+        self._content_loader = content_loader
+        self._summarization_service = summarization_service
+        self._fingerprint = fingerprint
+
+    def warm_up(self):
+        """
+        Build the services in a background thread, once per build.
+
+        Building the summarization service imports LangChain and the Groq
+        client, which takes seconds; starting it before the page is drawn
+        hides that time behind the first paint. A build error is left for
+        the next get_services() call to raise.
+        """
+        with self._lock:
+            if self._warm_up is not None or self._is_built():
+                return
+            self._warm_up = threading.Thread(target=self._build_quietly, name="service-warm-up", daemon=True)
+            self._warm_up.start()
+
+    def _build_quietly(self):
+        """Build the services, ignoring errors."""
+        try:
+            self.get_services()
+        except Exception:
+            pass
+
+    def get_cache(self) -> Optional[ContentCache]:
+        """
+        Get the shared content cache, if caching is enabled.
+
+        Returns:
+            Optional[ContentCache]: The cache shared by the services
+        """
+        self.get_services()
+        return self._cache
+
+    def health_check(self) -> bool:
+        """
+        Check that the shared services are built and usable.
+
+        Returns:
+            bool: True if the summarization service reports itself available
+        """
+        with self._lock:
+            if not self._is_built():
+                return False
+            return self._summarization_service.is_available()
+
+    def rebuild(self) -> Tuple[ContentLoader, SummarizationService]:
+        """
+        Discard the current services and build new ones.
+
+        Returns:
+            Tuple[ContentLoader, SummarizationService]: Freshly built services
+        """
+        self.reset()
+        return self.get_services()
+
+    def reset(self):
+        """Drop the current services so the next access rebuilds them."""
+        with self._lock:
+            self._content_loader = None
+            self._summarization_service = None
+            self._cache = None
+            self._fingerprint = None
+            # Let the next warm_up() build the replacements in the background
+            self._warm_up = None
+
+
+_registry = ServiceRegistry()
+
+
+def get_service_registry() -> ServiceRegistry:
+    """
+    Get the process-wide service registry.
+
+    Returns:
+        ServiceRegistry: The shared registry instance
+    """
+    return _registry
@@ -0,0 +1,427 @@
+"""
+Coalescing of identical concurrent requests (single-flight).
+"""
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from config.settings import Config
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+# Seconds a host-level result stays readable for processes that waited on it
+RESULT_TTL_SECONDS = 60
+LOCK_POLL_SECONDS = 0.05
+
+
+class SingleFlightError(Exception):
+    """Raised to waiters when a shared request fails without a typed error."""
+    pass
+
+
+class Flight:
+    """One in-progress computation that other callers can wait on."""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._result: Any = None
+        self._error: Optional[BaseException] = None
+        self._callbacks: List[Callable[[], None]] = []
+        self._callbacks_lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def _settle(self):
+        """Mark the flight done and run the callbacks of async waiters."""
+        with self._callbacks_lock:
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def resolve(self, result: Any):
+        """Publish the result to all waiters."""
+        self._result = result
+        self._settle()
+
+    def reject(self, error: BaseException):
+        """Publish a failure to all waiters."""
+        self._error = error
+        self._settle()
+
+    def _outcome(self) -> Any:
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def wait(self, timeout: float = None) -> Any:
+        """
+        Block until the computation finishes.
+
+        Args:
+            timeout (float, optional): Seconds to wait before giving up
+
+        Returns:
+            Any: The shared result
+
+        Raises:
+            TimeoutError: If the computation does not finish in time
+            Exception: The error the computation failed with
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError("Timed out waiting for an identical in-flight request")
+        return self._outcome()
+
+    async def await_result(self, timeout: float = None) -> Any:
+        """
+        Async counterpart of wait().
+
+        The waiter parks on a future of its own event loop, which the thread
+        finishing the flight wakes with call_soon_threadsafe(), so waiting
+        holds no worker thread.
+
+        Args:
+            timeout (float, optional): Seconds to wait before giving up
+
+        Returns:
+            Any: The shared result
+
+        Raises:
+            TimeoutError: If the computation does not finish in time
+            Exception: The error the computation failed with
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def wake_up():
+            if not future.done():
+                future.set_result(None)
+
+        def on_done():
+            try:
+                loop.call_soon_threadsafe(wake_up)
+            except RuntimeError:
+                # The waiter's loop has closed; nobody is waiting any more
+                pass
+
+        with self._callbacks_lock:
+            if self._done.is_set():
+                return self._outcome()
+            self._callbacks.append(on_done)
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError("Timed out waiting for an identical in-flight request")
+        finally:
+            with self._callbacks_lock:
+                if on_done in self._callbacks:
+                    self._callbacks.remove(on_done)
+        return self._outcome()
+
+
+class SingleFlight:
+    """
+    Run at most one computation per key at a time and share its outcome.
+
+    Callers that arrive while a computation for the same key is running wait
+    for it and receive its result, or its error, instead of repeating the
+    work. Within one process this spans all threads (and so all Streamlit
+    sessions sharing the services). When ``lock_dir`` is set, do() and ado()
+    also coordinate across processes on the same host through file locks:
+    one process computes while the others block on the lock and then read the
+    published result.
+    """
+
+    def __init__(self, enabled: bool = None, lock_dir: str = None, wait_timeout: float = None):
+        self.config = Config()
+        self.enabled = self.config.SINGLE_FLIGHT_ENABLED if enabled is None else enabled
+        self.lock_dir = self.config.SINGLE_FLIGHT_LOCK_DIR if lock_dir is None else lock_dir
+        self.wait_timeout = wait_timeout or self.config.SINGLE_FLIGHT_TIMEOUT_SECONDS
+        if self.lock_dir and fcntl is None:
+            self.lock_dir = ""
+        if self.lock_dir:
+            os.makedirs(self.lock_dir, exist_ok=True)
+
+        self._flights: Dict[str, Flight] = {}
+        # Reentrant: finish() may run from a garbage-collection finalizer
+        self._lock = threading.RLock()
+        self.leaders = 0
+        self.followers = 0
+
+    def begin(self, key: str) -> Tuple[Flight, bool]:
+        """
+        Join the flight for a key, starting it if none is running.
+
+        The caller that starts the flight (the leader) must end it with
+        finish(); the others wait on the returned flight.
+
+        Args:
+            key (str): Request key
+
+        Returns:
+            Tuple[Flight, bool]: The flight and whether the caller leads it
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.followers += 1
+                return flight, False
+            flight = Flight()
+            self._flights[key] = flight
+            self.leaders += 1
+            return flight, True
+
+    def finish(self, key: str, flight: Flight, result: Any = None, error: BaseException = None):
+        """
+        End a flight started with begin() and release its waiters.
+
+        Only the first call for a flight takes effect.
+
+        Args:
+            key (str): Request key
+            flight (Flight): Flight returned by begin()
+            result (Any): Result to share on success
+            error (BaseException, optional): Error to share on failure
+        """
+        with self._lock:
+            if flight.done:
+                return
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            if error is not None:
+                flight.reject(error)
+            else:
+                flight.resolve(result)
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        serialize: Callable[[Any], Any] = None,
+        deserialize: Callable[[Any], Any] = None,
+        error_type: Type[Exception] = SingleFlightError
+    ) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key.
+
+        Args:
+            key (str): Request key, e.g. canonical URL plus summary parameters
+            fn (Callable[[], Any]): The computation
+            serialize (Callable[[Any], Any], optional): Converts the result to
+                JSON for other processes (file-lock mode)
+            deserialize (Callable[[Any], Any], optional): Inverse of serialize
+            error_type (Type[Exception]): Error raised for failures reported by
+                another process or on timeout
+
+        Returns:
+            Any: The result of fn, computed here or by another caller
+        """
+        if not self.enabled:
+            return fn()
+
+        flight, is_leader = self.begin(key)
+        if not is_leader:
+            return self._wait(flight, error_type)
+
+        try:
+            if self.lock_dir:
+                result = self._run_host_exclusive(key, fn, serialize, deserialize, error_type)
+            else:
+                result = fn()
+        except BaseException as e:
+            self.finish(key, flight, error=e if isinstance(e, Exception) else error_type("Request was interrupted"))
+            raise
+        self.finish(key, flight, result=result)
+        return result
+
+    async def ado(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        serialize: Callable[[Any], Any] = None,
+        deserialize: Callable[[Any], Any] = None,
+        error_type: Type[Exception] = SingleFlightError
+    ) -> Any:
+        """
+        Async counterpart of do(); ``fn`` returns an awaitable.
+
+        Waiting on another caller's flight parks on an event-loop future, so
+        a burst of identical requests ties up no threads; waiting on a
+        host-level file lock happens in a worker thread. The event loop is
+        never blocked.
+        """
+        if not self.enabled:
+            return await fn()
+
+        flight, is_leader = self.begin(key)
+        if not is_leader:
+            try:
+                return await flight.await_result(self.wait_timeout)
+            except TimeoutError as e:
+                raise error_type(str(e))
+
+        try:
+            if self.lock_dir:
+                handle, published = await asyncio.to_thread(self._acquire_host_lock, key, error_type)
+                try:
+                    if published is not None:
+                        result = self._read_published(published, deserialize, error_type)
+                    else:
+                        try:
+                            result = await fn()
+                        except Exception as e:
+                            self._publish(key, error=e)
+                            raise
+                        self._publish(key, value=serialize(result) if serialize else result)
+                finally:
+                    self._release_host_lock(handle)
+            else:
+                result = await fn()
+        except BaseException as e:
+            self.finish(key, flight, error=e if isinstance(e, Exception) else error_type("Request was interrupted"))
+            raise
+        self.finish(key, flight, result=result)
+        return result
+
+    def _wait(self, flight: Flight, error_type: Type[Exception]) -> Any:
+        """Wait for another caller's flight, converting a timeout to error_type."""
+        try:
+            return flight.wait(self.wait_timeout)
+        except TimeoutError as e:
+            raise error_type(str(e))
+
+    # Host-level coordination (file-lock mode)
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        """Lock and result file paths for a key."""
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.lock_dir, f"{digest}.lock"), os.path.join(self.lock_dir, f"{digest}.json")
+
+    def _acquire_host_lock(self, key: str, error_type: Type[Exception]) -> Tuple[Any, Optional[Dict[str, Any]]]:
+        """
+        Take the host-wide lock for a key.
+
+        Returns:
+            Tuple[Any, Optional[Dict[str, Any]]]: The open lock file and, if
+                another process finished the same request while this one
+                waited, its published outcome
+        """
+        lock_path, result_path = self._paths(key)
+        started = time.time()
+        handle = open(lock_path, "a+")
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return handle, None
+        except BlockingIOError:
+            pass
+
+        # Another process is computing this key; wait for it to release the lock
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    handle.close()
+                    raise error_type("Timed out waiting for an identical request in another process")
+                time.sleep(LOCK_POLL_SECONDS)
+
+        try:
+            with open(result_path, "r", encoding="utf-8") as result_file:
+                published = json.load(result_file)
+        except (OSError, ValueError):
+            published = None
+        # Only trust an outcome written while this process was waiting; otherwise
+        # the other process died without publishing and this one computes instead
+        if published is not None and published.get("finished_at", 0) >= started:
+            return handle, published
+        return handle, None
+
+    @staticmethod
+    def _release_host_lock(handle):
+        """Release and close a lock taken by _acquire_host_lock()."""
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        finally:
+            handle.close()
+
+    def _publish(self, key: str, value: Any = None, error: BaseException = None):
+        """Write the outcome for processes waiting on the key, and prune old outcomes."""
+        _, result_path = self._paths(key)
+        outcome = {"finished_at": time.time()}
+        if error is not None:
+            outcome["error"] = str(error)
+        else:
+            outcome["value"] = value
+        temp_path = f"{result_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as result_file:
+                json.dump(outcome, result_file, default=str)
+            os.replace(temp_path, result_path)
+        except (OSError, TypeError, ValueError):
+            # Waiters that find no fresh outcome compute the result themselves
+            return
+        self._prune()
+
+    def _prune(self):
+        """Delete published outcomes older than RESULT_TTL_SECONDS."""
+        cutoff = time.time() - RESULT_TTL_SECONDS
+        try:
+            with os.scandir(self.lock_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".json") and entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _read_published(published: Dict[str, Any], deserialize: Callable[[Any], Any], error_type: Type[Exception]) -> Any:
+        """Turn a published outcome into a result or an error."""
+        if "error" in published:
+            raise error_type(published["error"])
+        value = published.get("value")
+        return deserialize(value) if deserialize else value
+
+    def _run_host_exclusive(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        serialize: Callable[[Any], Any],
+        deserialize: Callable[[Any], Any],
+        error_type: Type[Exception]
+    ) -> Any:
+        """Run fn under the host-wide lock, or reuse the outcome another process published."""
+        handle, published = self._acquire_host_lock(key, error_type)
+        try:
+            if published is not None:
+                return self._read_published(published, deserialize, error_type)
+            try:
+                result = fn()
+            except Exception as e:
+                self._publish(key, error=e)
+                raise
+            self._publish(key, value=serialize(result) if serialize else result)
+            return result
+        finally:
+            self._release_host_lock(handle)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get coalescing counters for this process.
+
+        Returns:
+            Dict[str, int]: Computations led, requests that joined one, flights running now
+        """
+        with self._lock:
+            return {"leaders": self.leaders, "followers": self.followers, "in_flight": len(self._flights)}
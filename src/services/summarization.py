@@ -1,11 +1,33 @@
 """
 AI-powered summarization service.
 """
-from typing import List, Any, Dict
-from langchain.prompts import PromptTemplate
-from langchain_groq import ChatGroq
-from langchain.chains.summarize import load_summarize_chain
+import asyncio
+import contextvars
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Any, Dict, Optional, Iterator, Callable
 from config.settings import Config
+from .cache import ContentCache
+from .extractive import ExtractiveError, ExtractiveSelection, ExtractiveSummarizer
+from .model_router import ModelRouter, ModelRouterError, get_model_router, use_route
+from .near_duplicates import NearDuplicateIndex, fingerprint_documents
+from .prompts import ChainFactory, PromptLibrary, PromptLibraryError, PromptVersion, get_prompt_library
+from .rate_limiter import get_rate_governor
+from .single_flight import Flight, SingleFlight
+from .summary_archive import SummaryArchive, SummaryArchiveError, split_chunks
+from .text_normalizer import NormalizationResult, TextNormalizer
+from .token_budget import CHARS_PER_TOKEN, BudgetPlan, TokenBudgetPlanner, estimate_documents_tokens, estimate_output_tokens, estimate_tokens
+from src.utils.tracing import span, increment
+
+# LangChain, langchain_groq and the summarize chains take seconds to import, so
+# they are imported where they are first used instead of with the app
+if TYPE_CHECKING:
+    from langchain.prompts import PromptTemplate
+
+
+SUMMARY_STRATEGIES = ("stuff", "map_reduce", "refine", "extractive")
 
 
 class SummarizationError(Exception):
@@ -13,58 +35,647 @@ class SummarizationError(Exception):
     pass
 
 
+class _LeaderStreamAbandoned(SummarizationError):
+    """Raised to followers when the stream they were sharing stops early."""
+    pass
+
+
+class SummaryStream:
+    """
+    Iterable of summary tokens produced by SummarizationService.stream_summary().
+    
+    The full result dictionary is available as ``result`` once iteration has
+    finished. Calling cancel() stops the generation after the current token;
+    a cancelled stream is not cached and its ``result`` stays None.
+    """
+    
+    def __init__(self):
+        self.result: Optional[Dict[str, Any]] = None
+        self.chunk_count = 1
+        self._tokens: Optional[Iterator[str]] = None
+        self._on_complete: Optional[Callable[[str], Dict[str, Any]]] = None
+        self._cancel_event = threading.Event()
+    
+    @classmethod
+    def from_result(cls, result: Dict[str, Any]) -> "SummaryStream":
+        """Create a stream that yields an already available result in one piece."""
+        stream = cls()
+        stream.start(iter([result["summary"]]), lambda summary: result)
+        return stream
+    
+    def start(self, tokens: Iterator[str], on_complete: Callable[[str], Dict[str, Any]]):
+        """Attach the token source and the callback that builds the final result."""
+        self._tokens = tokens
+        self._on_complete = on_complete
+    
+    def cancel(self):
+        """Stop the generation after the current token."""
+        self._cancel_event.set()
+    
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel() was called."""
+        return self._cancel_event.is_set()
+    
+    def __iter__(self) -> Iterator[str]:
+        parts = []
+        try:
+            for token in self._tokens:
+                if self.cancelled:
+                    break
+                parts.append(token)
+                yield token
+        except SummarizationError:
+            raise
+        except Exception as e:
+            raise SummarizationError(f"Failed to generate summary: {str(e)}")
+        finally:
+            if hasattr(self._tokens, "close"):
+                self._tokens.close()
+        
+        if not self.cancelled:
+            self.result = self._on_complete("".join(parts))
+
+
 class SummarizationService:
     """Service class for AI-powered content summarization."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[ContentCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        router: Optional[ModelRouter] = None,
+        archive: Optional[SummaryArchive] = None,
+        prompts: Optional[PromptLibrary] = None
+    ):
         self.config = Config()
+        self.cache = cache
+        self.archive = archive
+        self.prompts = prompts or get_prompt_library()
+        self.chains = ChainFactory(self.prompts)
+        self.single_flight = single_flight or SingleFlight()
+        self.router = router or get_model_router()
+        self.budget_planner = TokenBudgetPlanner()
+        self.normalizer = TextNormalizer()
+        try:
+            self.extractive = ExtractiveSummarizer()
+        except ExtractiveError as e:
+            raise SummarizationError(str(e))
         self.llm = None
+        self.llm_error: Optional[str] = None
         self._initialize_llm()
     
     def _initialize_llm(self):
-        """Initialize the LLM with proper error handling."""
+        """
+        Initialize the LLM with proper error handling.
+        
+        One ChatGroq client is created per model in the router's pool, and
+        RoutedChatModel sends each call to the model its request was routed
+        to. With LLM_RATE_LIMIT_ENABLED, calls go through the process-wide rate
+        governor, which also takes over retries so that a 429 pauses every
+        caller instead of each client retrying on its own.
+        
+        When extractive summaries can stand in for the LLM (the "extractive"
+        strategy or EXTRACTIVE_FALLBACK_ENABLED), a missing key or failed
+        initialization is recorded in ``llm_error`` instead of raised.
+        """
         if not self.config.GROQ_API_KEY:
-            raise SummarizationError("Groq API Key not found in environment variables")
+            self._llm_unavailable("Groq API Key not found in environment variables")
+            return
         
         try:
-            self.llm = ChatGroq(
-                model=self.config.GROQ_MODEL,
-                groq_api_key=self.config.GROQ_API_KEY
+            from langchain_groq import ChatGroq
+            from .chat_models import GovernedChatModel, RoutedChatModel
+            
+            options = {"groq_api_base": self.config.GROQ_BASE_URL} if self.config.GROQ_BASE_URL else {}
+            if self.config.LLM_RATE_LIMIT_ENABLED:
+                options["max_retries"] = 0
+            self.llm = RoutedChatModel(
+                models={
+                    model.name: ChatGroq(model=model.name, groq_api_key=self.config.GROQ_API_KEY, **options)
+                    for model in self.router.models
+                },
+                router=self.router
             )
+            if self.config.LLM_RATE_LIMIT_ENABLED:
+                self.llm = GovernedChatModel(
+                    llm=self.llm,
+                    governor=get_rate_governor(),
+                    completion_tokens=estimate_output_tokens(self.config.SUMMARY_WORD_COUNT),
+                    max_retries=self.config.LLM_MAX_RETRIES
+                )
         except Exception as e:
-            raise SummarizationError(f"Failed to initialize Groq API: {str(e)}")
+            self._llm_unavailable(f"Failed to initialize Groq API: {str(e)}")
+    
+    def _llm_unavailable(self, reason: str):
+        """Record why the LLM cannot be used, or raise if nothing can replace it."""
+        if self.config.SUMMARY_STRATEGY != "extractive" and not self.config.EXTRACTIVE_FALLBACK_ENABLED:
+            raise SummarizationError(reason)
+        self.llm_error = reason
+    
+    def _prompt_version(self, version: str = None) -> PromptVersion:
+        """The named prompt version, or the one new requests currently get."""
+        if version is None:
+            return self.prompts.select()
+        try:
+            return self.prompts.get(version)
+        except PromptLibraryError as e:
+            raise SummarizationError(str(e))
     
-    def create_prompt_template(self, word_count: int = None) -> PromptTemplate:
+    def create_prompt_template(self, word_count: int = None, version: str = None) -> "PromptTemplate":
         """
         Create a prompt template for summarization.
         
         Args:
             word_count (int, optional): Target word count for summary
+            version (str, optional): Prompt version, defaults to the active one
             
         Returns:
             PromptTemplate: Configured prompt template
         """
         word_count = word_count or self.config.SUMMARY_WORD_COUNT
+        return self.prompts.template(self._prompt_version(version), "summary", word_count)
+    
+    def create_map_prompt_template(self, version: str = None) -> "PromptTemplate":
+        """
+        Create the prompt used to summarize a single chunk in the map stage.
         
-        prompt_text = f"""
-        Provide a comprehensive and well-structured summary of the following content in approximately {word_count} words. 
-        Focus on the main points, key insights, and important details. Structure your response with clear paragraphs
-        and maintain the most crucial information while making it concise and readable.
-
-        Content: {{text}}
-
-        Summary:
+        Args:
+            version (str, optional): Prompt version, defaults to the active one
+            
+        Returns:
+            PromptTemplate: Configured prompt template
+        """
+        return self.prompts.template(self._prompt_version(version), "map")
+    
+    def create_refine_prompt_template(self, word_count: int = None, version: str = None) -> "PromptTemplate":
+        """
+        Create the prompt used to refine a running summary with a new chunk.
+        
+        Args:
+            word_count (int, optional): Target word count for summary
+            version (str, optional): Prompt version, defaults to the active one
+            
+        Returns:
+            PromptTemplate: Configured prompt template
+        """
+        word_count = word_count or self.config.SUMMARY_WORD_COUNT
+        return self.prompts.template(self._prompt_version(version), "refine", word_count)
+    
+    @staticmethod
+    def estimate_tokens(documents: List[Any]) -> int:
+        """
+        Estimate the number of tokens in a list of documents.
+        
+        Args:
+            documents (List[Any]): Documents to measure
+            
+        Returns:
+            int: Approximate token count
+        """
+        return estimate_documents_tokens(documents)
+    
+    def plan_budget(self, documents: List[Any], word_count: int = None) -> BudgetPlan:
+        """
+        Estimate input/output tokens and decide how the documents fit the model context.
+        
+        Args:
+            documents (List[Any]): Documents to summarize
+            word_count (int, optional): Target word count for summary
+            
+        Returns:
+            BudgetPlan: "stuff", "trim", "chunk" or "reject", with token estimates
+        """
+        word_count = word_count or self.config.SUMMARY_WORD_COUNT
+        prompt = self.create_prompt_template(word_count)
+        return self.budget_planner.plan(documents, word_count, prompt.template)
+    
+    def choose_strategy(self, documents: List[Any], strategy: str = None, plan: BudgetPlan = None) -> str:
+        """
+        Pick a summarization strategy for the documents.
+        
+        With the "auto" strategy, documents the budget planner can fit in the
+        model context are summarized in one call ("stuff") and larger ones with
+        map-reduce. "extractive" never calls the LLM.
+        
+        Args:
+            documents (List[Any]): Documents to summarize
+            strategy (str, optional): Requested strategy, defaults to Config.SUMMARY_STRATEGY
+            plan (BudgetPlan, optional): Precomputed budget plan for the documents
+            
+        Returns:
+            str: One of "stuff", "map_reduce", "refine" or "extractive"
+            
+        Raises:
+            SummarizationError: If the requested strategy is unknown
+        """
+        strategy = strategy or self.config.SUMMARY_STRATEGY
+        if strategy in SUMMARY_STRATEGIES:
+            return strategy
+        if strategy != "auto":
+            raise SummarizationError(f"Unknown summarization strategy: {strategy}")
+        
+        plan = plan or self.plan_budget(documents)
+        if plan.action == "chunk":
+            return "map_reduce"
+        return "stuff"
+    
+    def split_documents(self, documents: List[Any]) -> List[Any]:
+        """
+        Split documents into chunks that fit comfortably in the model context.
+        
+        Args:
+            documents (List[Any]): Documents to split
+            
+        Returns:
+            List[Any]: Chunked documents
+        """
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+        
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=int(self.config.CHUNK_SIZE_TOKENS * CHARS_PER_TOKEN),
+            chunk_overlap=int(self.config.CHUNK_OVERLAP_TOKENS * CHARS_PER_TOKEN)
+        )
+        return splitter.split_documents(documents)
+    
+    def _summarize_stuff(self, documents: List[Any], version: PromptVersion, word_count: int) -> str:
+        """Summarize documents in a single LLM call."""
+        chain = self.chains.get(self.llm, "stuff", version, word_count)
+        result = chain.invoke({"input_documents": documents})
+        return result["output_text"]
+    
+    def _map_chunks(self, chunks: List[Any], version: PromptVersion) -> List[str]:
+        """Summarize chunks concurrently, preserving their order."""
+        map_prompt = self.prompts.template(version, "map")
+        
+        def summarize_chunk(chunk: Any) -> str:
+            response = self.llm.invoke(map_prompt.format(text=chunk.page_content))
+            return response.content
+        
+        max_workers = max(1, min(self.config.MAP_MAX_CONCURRENCY, len(chunks)))
+        # Worker threads keep the caller's context (trace, rate-limit session)
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(context.copy().run, summarize_chunk, chunk) for chunk in chunks]
+            return [future.result() for future in futures]
+    
+    def _map_partials(self, documents: List[Any], version: PromptVersion) -> tuple:
+        """
+        Run the map stage and collapse partial summaries until they fit in one call.
+        
+        Returns:
+            tuple: (partial summary documents, number of chunks mapped)
+        """
+        from langchain_core.documents import Document
+        
+        chunks = self.split_documents(documents)
+        partials = [
+            Document(page_content=text)
+            for text in self._map_chunks(chunks, version)
+        ]
+        
+        while len(partials) > 1 and self.estimate_tokens(partials) > self.config.STUFF_MAX_TOKENS:
+            collapsed = self._map_chunks(self.split_documents([
+                Document(page_content="\n\n".join(doc.page_content for doc in partials))
+            ]), version)
+            if len(collapsed) >= len(partials):
+                break
+            partials = [Document(page_content=text) for text in collapsed]
+        
+        return partials, len(chunks)
+    
+    def _summarize_map_reduce(self, documents: List[Any], version: PromptVersion, word_count: int) -> Dict[str, Any]:
+        """
+        Summarize chunks concurrently, then combine the partial summaries.
+        
+        Partial summaries that are still too large to combine in one call are
+        collapsed by repeating the map stage over them.
+        """
+        partials, chunk_count = self._map_partials(documents, version)
+        return {
+            "summary": self._summarize_stuff(partials, version, word_count),
+            "chunk_count": chunk_count
+        }
+    
+    def _summarize_refine(self, documents: List[Any], version: PromptVersion, word_count: int) -> Dict[str, Any]:
+        """Summarize chunks sequentially, refining a running summary."""
+        chunks = self.split_documents(documents)
+        chain = self.chains.get(self.llm, "refine", version, word_count)
+        result = chain.invoke({"input_documents": chunks})
+        return {
+            "summary": result["output_text"],
+            "chunk_count": len(chunks)
+        }
+    
+    def _prepare_request(
+        self,
+        documents: List[Any],
+        word_count: int = None,
+        strategy: str = None,
+        tier: str = None
+    ) -> Dict[str, Any]:
+        """
+        Validate a summarization request and resolve its parameters.
+        
+        Boilerplate, duplicate lines and transcript filler are stripped first,
+        and the cleaned text is fingerprinted for near-duplicate lookups.
+        Inputs over EXTRACTIVE_PREPASS_TOKENS are then cut to their most
+        salient sentences. The request is routed to a model, and the token budget is
+        planned against that model's per-call budget before any LLM call:
+        oversized input is rejected here and boilerplate is trimmed when that
+        makes it fit.
+        
+        Returns:
+            Dict[str, Any]: Resolved documents, word count, prompt and its version, strategy,
+                model route, normalization, extractive pre-pass, token
+                estimates, cache key, fingerprint and single-flight key
+            
+        Raises:
+            SummarizationError: If the service or the input is not usable
+        """
+        if not self.llm:
+            raise SummarizationError("LLM not properly initialized")
+        
+        if not documents:
+            raise SummarizationError("No documents provided for summarization")
+        
+        word_count = word_count or self.config.SUMMARY_WORD_COUNT
+        normalization = self._normalize(documents)
+        documents = normalization.documents
+        input_tokens = normalization.tokens_after
+        # With an A/B split, a page keeps its prompt version across requests
+        version = self.prompts.select(documents[0].metadata.get("source") or documents[0].page_content[:4096])
+        prompt = self.prompts.template(version, "summary", word_count)
+        
+        fingerprint = None
+        if self.cache is not None and self.cache.near_duplicates is not None:
+            with span("fingerprint"):
+                fingerprint = fingerprint_documents(documents)
+        
+        prepass = None
+        if self.config.EXTRACTIVE_PREPASS_TOKENS and input_tokens > self.config.EXTRACTIVE_PREPASS_TOKENS:
+            with span("extractive", prepass=True) as attributes:
+                prepass = self._select_sentences(documents, self.config.EXTRACTIVE_PREPASS_TOKENS)
+                attributes.update(sentences_kept=prepass.sentences_kept, sentences_total=prepass.sentences_total)
+            from langchain_core.documents import Document
+            documents = [Document(page_content=prepass.text, metadata=dict(documents[0].metadata))]
+            input_tokens = prepass.tokens_after
+        
+        with span("plan") as attributes:
+            input_tokens += estimate_tokens(prompt.template)
+            try:
+                route = self.router.route(input_tokens, estimate_output_tokens(word_count), tier)
+            except ModelRouterError as e:
+                raise SummarizationError(str(e))
+            plan = self.budget_planner.plan(
+                documents, word_count, prompt.template, route.model.max_tokens, input_tokens
+            )
+            attributes.update(action=plan.action, input_tokens=plan.input_tokens, model=route.model.name)
+        if plan.action == "reject":
+            raise SummarizationError(f"Content is too large to summarize: {plan.reason}")
+        strategy = self.choose_strategy(plan.documents, strategy, plan)
+        
+        # Identical requests share one key whether or not a cache is configured
+        flight_key = ContentCache.summary_key(
+            plan.documents, route.model.name, prompt.template, word_count, strategy, version.name
+        )
+        
+        return {
+            "documents": plan.documents,
+            "plan": plan,
+            "word_count": word_count,
+            "prompt": prompt,
+            "prompt_version": version,
+            "strategy": strategy,
+            "route": route,
+            "normalization": normalization,
+            "prepass": prepass,
+            "cache_key": flight_key if self.cache is not None else None,
+            "fingerprint": fingerprint,
+            "variant": NearDuplicateIndex.variant(
+                f"{version.name}\x00{prompt.template}", route.model_used, route.tier, strategy
+            ),
+            "flight_key": f"summary:{flight_key}"
+        }
+    
+    def _normalize(self, documents: List[Any]) -> NormalizationResult:
+        """Strip boilerplate and filler from the documents, recording the saving."""
+        with span("normalize") as attributes:
+            normalization = self.normalizer.normalize_documents(documents)
+            attributes.update(
+                tokens_before=normalization.tokens_before,
+                tokens_saved=normalization.tokens_saved,
+                duplicate_lines=normalization.duplicate_lines,
+                boilerplate_lines=normalization.boilerplate_lines
+            )
+        increment("tokens_saved", normalization.tokens_saved)
+        return normalization
+    
+    def _select_sentences(self, documents: List[Any], max_tokens: int) -> ExtractiveSelection:
+        """Keep the most salient sentences of the documents within a token budget."""
+        try:
+            return self.extractive.select(documents, max_tokens)
+        except ExtractiveError as e:
+            raise SummarizationError(f"Failed to rank sentences: {str(e)}")
+    
+    def summarize_extractive(
+        self,
+        documents: List[Any],
+        word_count: int = None,
+        fallback_reason: str = None
+    ) -> Dict[str, Any]:
+        """
+        Summarize content without an LLM by keeping its most salient sentences.
+        
+        Args:
+            documents (List[Any]): List of documents to summarize
+            word_count (int, optional): Target word count for summary
+            fallback_reason (str, optional): Why the LLM was not used, when
+                this summary stands in for a failed or unavailable LLM
+            
+        Returns:
+            Dict[str, Any]: Summary result with the same keys as
+                summarize_content(), plus ``fallback_reason`` for fallbacks
+            
+        Raises:
+            SummarizationError: If the documents contain no text
         """
+        if not documents:
+            raise SummarizationError("No documents provided for summarization")
+        return self._extractive_result(
+            documents, self._normalize(documents), word_count or self.config.SUMMARY_WORD_COUNT, fallback_reason
+        )
+    
+    def _extractive_result(
+        self,
+        documents: List[Any],
+        normalization: NormalizationResult,
+        word_count: int,
+        fallback_reason: str = None
+    ) -> Dict[str, Any]:
+        """Build an extractive summary result from already normalized documents."""
+        with span("extractive", fallback=fallback_reason is not None) as attributes:
+            try:
+                selection = self.extractive.summarize(normalization.documents, word_count)
+            except ExtractiveError as e:
+                raise SummarizationError(f"Failed to rank sentences: {str(e)}")
+            attributes.update(sentences_kept=selection.sentences_kept, sentences_total=selection.sentences_total)
         
-        return PromptTemplate(template=prompt_text, input_variables=["text"])
+        result = {
+            "summary": selection.text,
+            "document_count": len(documents),
+            "model_used": "extractive",
+            "model_tier": None,
+            "estimated_input_tokens": normalization.tokens_after,
+            "tokens_saved": normalization.tokens_saved,
+            "estimated_output_tokens": selection.tokens_after,
+            "budget_action": None,
+            "word_count_target": word_count,
+            "strategy": "extractive",
+            "chunk_count": 1,
+            "extractive_prepass": False,
+            "cached": False
+        }
+        if fallback_reason is not None:
+            result["fallback_reason"] = fallback_reason
+        return result
+    
+    def _extractive_shortcut(self, documents: List[Any], word_count: int = None, strategy: str = None) -> Optional[Dict[str, Any]]:
+        """Return an extractive result when the request does not use the LLM."""
+        if (strategy or self.config.SUMMARY_STRATEGY) == "extractive":
+            return self.summarize_extractive(documents, word_count)
+        if self.llm is None and self.llm_error is not None:
+            return self.summarize_extractive(documents, word_count, fallback_reason=self.llm_error)
+        return None
+    
+    def _fallback_result(self, documents: List[Any], request: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        """Replace a failed LLM summary with an extractive one, or raise the failure."""
+        message = f"Failed to generate summary: {str(error)}"
+        if not self.config.EXTRACTIVE_FALLBACK_ENABLED:
+            raise SummarizationError(message)
+        return self._extractive_result(documents, request["normalization"], request["word_count"], message)
+    
+    def _lookup_cached_result(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the cached result for a prepared request, a near duplicate or an equivalent archived document, if any."""
+        cached_result = None
+        if request["cache_key"] is not None:
+            cached_result = self.cache.get_summary(request["cache_key"])
+            if cached_result is None and request["fingerprint"] is not None:
+                cached_result = self.cache.get_near_duplicate_summary(request["fingerprint"], request["variant"])
+        if cached_result is None and self.archive is not None and self.config.ARCHIVE_SEMANTIC_CACHE_THRESHOLD > 0:
+            cached_result = self._lookup_archived_result(request)
+        if cached_result is not None:
+            cached_result["cached"] = True
+        return cached_result
     
-    def summarize_content(self, documents: List[Any], word_count: int = None) -> Dict[str, Any]:
+    def _lookup_archived_result(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Return the archived summary of a document semantically equivalent to the request's.
+        
+        The chunk embeddings are kept on the request, so archiving the new
+        summary does not embed the chunks again. Only summaries made with the
+        request's model, tier, strategy and prompt version match. Archive
+        failures only skip the lookup.
+        """
+        with span("archive.lookup") as attributes:
+            try:
+                request["chunk_vectors"] = self.archive.embed(split_chunks(request["normalization"].documents))
+                hit = self.archive.find_equivalent(
+                    request["chunk_vectors"],
+                    request["word_count"],
+                    self.config.ARCHIVE_SEMANTIC_CACHE_THRESHOLD,
+                    {
+                        "model_used": request["route"].model_used,
+                        "model_tier": request["route"].tier,
+                        "strategy": request["strategy"],
+                        "prompt_version": request["prompt_version"].name
+                    }
+                )
+            except SummaryArchiveError as e:
+                attributes["error"] = str(e)
+                return None
+            attributes["hit"] = hit is not None
+        if hit is None:
+            return None
+        result = dict(hit.entry.result)
+        result["semantic_match"] = {"source": hit.entry.source, "similarity": round(hit.score, 4)}
+        return result
+    
+    def _complete_request(self, documents: List[Any], request: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the summary result dictionary and store it in the cache and the archive."""
+        summary_result = {
+            "summary": result["summary"],
+            "document_count": len(documents),
+            "model_used": request["route"].model_used,
+            "model_tier": request["route"].tier,
+            "estimated_input_tokens": request["plan"].input_tokens,
+            "tokens_saved": request["normalization"].tokens_saved,
+            "estimated_output_tokens": request["plan"].output_tokens,
+            "budget_action": request["plan"].action,
+            "word_count_target": request["word_count"],
+            "strategy": request["strategy"],
+            "prompt_version": request["prompt_version"].name,
+            "chunk_count": result["chunk_count"],
+            "extractive_prepass": request["prepass"] is not None,
+            "source": documents[0].metadata.get("source"),
+            "cached": False
+        }
+        increment("tokens_in", request["plan"].input_tokens)
+        increment("tokens_out", estimate_tokens(result["summary"]))
+        
+        if request["cache_key"] is not None:
+            self.cache.put_summary(request["cache_key"], summary_result)
+            if request["fingerprint"] is not None:
+                self.cache.put_fingerprint(request["fingerprint"], request["variant"], request["cache_key"])
+        if self.archive is not None:
+            try:
+                self.archive.add(request["normalization"].documents, summary_result, request.get("chunk_vectors"))
+            except SummaryArchiveError:
+                pass
+        return summary_result
+    
+    def _run_strategy(self, documents: List[Any], request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the resolved summarization strategy."""
+        strategy = request["strategy"]
+        version = request["prompt_version"]
+        word_count = request["word_count"]
+        if strategy == "map_reduce":
+            return self._summarize_map_reduce(documents, version, word_count)
+        if strategy == "refine":
+            return self._summarize_refine(documents, version, word_count)
+        return {
+            "summary": self._summarize_stuff(documents, version, word_count),
+            "chunk_count": 1
+        }
+    
+    def summarize_content(
+        self,
+        documents: List[Any],
+        word_count: int = None,
+        strategy: str = None,
+        tier: str = None
+    ) -> Dict[str, Any]:
         """
         Summarize content from documents.
         
+        The strategy is picked automatically from the document size unless one is
+        requested: "stuff" sends everything in one call, "map_reduce" summarizes
+        chunks concurrently and combines them, "refine" walks the chunks in order.
+        Results are cached by document content, model, prompt and word count
+        when a cache is configured, and content nearly identical to an already
+        summarized document reuses that summary (see ``near_duplicate`` in the
+        result). With ARCHIVE_SEMANTIC_CACHE_THRESHOLD set, so does content
+        whose embedding matches an archived document (see ``semantic_match``).
+        Identical requests that arrive while one is being generated wait for
+        it and share its result or its error.
+        "extractive" keeps the most salient sentences without calling the LLM;
+        with EXTRACTIVE_FALLBACK_ENABLED it also replaces a failed LLM call.
+        
         Args:
             documents (List[Any]): List of documents to summarize
             word_count (int, optional): Target word count for summary
+            strategy (str, optional): "auto", "stuff", "map_reduce", "refine" or "extractive"
+            tier (str, optional): "fast", "balanced" or "quality", steering model routing
             
         Returns:
             Dict[str, Any]: Summary result with metadata
@@ -72,33 +683,482 @@ class SummarizationService:
         Raises:
             SummarizationError: If summarization fails
         """
+        extractive_result = self._extractive_shortcut(documents, word_count, strategy)
+        if extractive_result is not None:
+            return extractive_result
+        
+        request = self._prepare_request(documents, word_count, strategy, tier)
+        
+        cached_result = self._lookup_cached_result(request)
+        if cached_result is not None:
+            return cached_result
+        
+        def generate() -> Dict[str, Any]:
+            try:
+                with span("llm", strategy=request["strategy"]), use_route(request["route"]):
+                    result = self._run_strategy(request["documents"], request)
+            except Exception as e:
+                return self._fallback_result(documents, request, e)
+            return self._complete_request(documents, request, result)
+        
+        # Every caller gets its own copy of the shared result
+        return dict(self.single_flight.do(request["flight_key"], generate, error_type=SummarizationError))
+    
+    def _stream_tokens(self, documents: List[Any], request: Dict[str, Any], stream: "SummaryStream") -> Iterator[str]:
+        """Yield summary tokens for a prepared request."""
+        strategy = request["strategy"]
+        prompt = request["prompt"]
+        route = request["route"]
+        
+        if strategy == "refine":
+            # Refine only produces its answer after the last chunk, so there is
+            # nothing to stream before the full result is ready.
+            with span("llm", strategy=strategy, streaming=True), use_route(route):
+                result = self._summarize_refine(documents, request["prompt_version"], request["word_count"])
+            stream.chunk_count = result["chunk_count"]
+            yield result["summary"]
+            return
+        
+        if strategy == "map_reduce":
+            with span("llm.map", chunks=len(documents)), use_route(route):
+                documents, stream.chunk_count = self._map_partials(documents, request["prompt_version"])
+        
+        text = "\n\n".join(doc.page_content for doc in documents)
+        # The span also covers the consumer's time between tokens, e.g. rendering
+        with span("llm", strategy=strategy, streaming=True) as attributes, use_route(route):
+            started = time.perf_counter()
+            for message_chunk in self.llm.stream(prompt.format(text=text)):
+                if message_chunk.content:
+                    if "time_to_first_token_ms" not in attributes:
+                        attributes["time_to_first_token_ms"] = round((time.perf_counter() - started) * 1000, 3)
+                    yield message_chunk.content
+    
+    def stream_summary(
+        self,
+        documents: List[Any],
+        word_count: int = None,
+        strategy: str = None,
+        tier: str = None
+    ) -> "SummaryStream":
+        """
+        Summarize content from documents, yielding tokens as they are generated.
+        
+        Iterate over the returned stream to receive tokens; once it is exhausted
+        its ``result`` holds the same dictionary summarize_content() returns.
+        Cached summaries are yielded in one piece, and so are summaries of an
+        identical request already being streamed in this process: the stream
+        waits for that request to finish instead of generating again.
+        Extractive summaries, including fallbacks for an LLM call that fails
+        before its first token, are also yielded in one piece.
+        
+        Args:
+            documents (List[Any]): List of documents to summarize
+            word_count (int, optional): Target word count for summary
+            strategy (str, optional): "auto", "stuff", "map_reduce", "refine" or "extractive"
+            tier (str, optional): "fast", "balanced" or "quality", steering model routing
+            
+        Returns:
+            SummaryStream: Iterable of summary tokens
+            
+        Raises:
+            SummarizationError: If the request is invalid
+        """
+        extractive_result = self._extractive_shortcut(documents, word_count, strategy)
+        if extractive_result is not None:
+            return SummaryStream.from_result(extractive_result)
+        
+        request = self._prepare_request(documents, word_count, strategy, tier)
+        
+        cached_result = self._lookup_cached_result(request)
+        if cached_result is not None:
+            return SummaryStream.from_result(cached_result)
+        
+        if not self.single_flight.enabled:
+            return self._lead_stream(documents, request)
+        
+        key = request["flight_key"]
+        flight, is_leader = self.single_flight.begin(key)
+        if not is_leader:
+            return self._follow_stream(flight, documents, word_count, strategy, tier)
+        return self._lead_stream(documents, request, flight)
+    
+    def _lead_stream(self, documents: List[Any], request: Dict[str, Any], flight: Optional[Flight] = None) -> "SummaryStream":
+        """
+        Stream a summary from the LLM, publishing the outcome to the flight's followers.
+        
+        The flight is ended exactly once: with the result when the stream
+        completes, or with an error when generation fails, is cancelled or the
+        stream is dropped unfinished.
+        """
+        stream = SummaryStream()
+        key = request["flight_key"]
+        fallback: Dict[str, Any] = {}
+        
+        def settle(result: Dict[str, Any] = None, error: BaseException = None):
+            if flight is not None:
+                self.single_flight.finish(key, flight, result=result, error=error)
+        
+        def tokens() -> Iterator[str]:
+            emitted = False
+            try:
+                for token in self._stream_tokens(request["documents"], request, stream):
+                    emitted = True
+                    yield token
+            except Exception as e:
+                if not emitted and self.config.EXTRACTIVE_FALLBACK_ENABLED:
+                    fallback["result"] = self._fallback_result(documents, request, e)
+                    yield fallback["result"]["summary"]
+                    return
+                settle(error=e if isinstance(e, SummarizationError) else SummarizationError(f"Failed to generate summary: {str(e)}"))
+                raise
+            except BaseException:
+                settle(error=_LeaderStreamAbandoned("The shared summary stream stopped early"))
+                raise
+        
+        def complete(summary: str) -> Dict[str, Any]:
+            if "result" in fallback:
+                settle(result=fallback["result"])
+                return fallback["result"]
+            try:
+                result = self._complete_request(
+                    documents, request, {"summary": summary, "chunk_count": stream.chunk_count}
+                )
+            except Exception as e:
+                settle(error=e)
+                raise
+            settle(result=result)
+            return result
+        
+        if flight is not None:
+            # A cancelled stream never reaches complete(), and one that is never
+            # iterated never runs tokens(); either way followers must be released
+            weakref.finalize(stream, settle, error=_LeaderStreamAbandoned("The shared summary stream stopped early"))
+        stream.start(tokens(), complete)
+        return stream
+    
+    def _follow_stream(
+        self,
+        flight: Flight,
+        documents: List[Any],
+        word_count: int = None,
+        strategy: str = None,
+        tier: str = None
+    ) -> "SummaryStream":
+        """
+        Stream the result of an identical request another caller is generating.
+        
+        If that caller stops before finishing, this stream generates the
+        summary itself.
+        """
+        stream = SummaryStream()
+        shared: Dict[str, Any] = {}
+        
+        def tokens() -> Iterator[str]:
+            try:
+                result = flight.wait(self.single_flight.wait_timeout)
+            except _LeaderStreamAbandoned:
+                own_stream = self.stream_summary(documents, word_count, strategy, tier)
+                yield from own_stream
+                shared["result"] = own_stream.result
+                return
+            except TimeoutError as e:
+                raise SummarizationError(str(e))
+            shared["result"] = dict(result)
+            stream.chunk_count = result["chunk_count"]
+            yield result["summary"]
+        
+        stream.start(tokens(), lambda summary: shared["result"])
+        return stream
+    
+    async def _asummarize_stuff(self, documents: List[Any], version: PromptVersion, word_count: int) -> str:
+        """Summarize documents in a single non-blocking LLM call."""
+        chain = self.chains.get(self.llm, "stuff", version, word_count)
+        result = await chain.ainvoke({"input_documents": documents})
+        return result["output_text"]
+    
+    async def _amap_chunks(self, chunks: List[Any], version: PromptVersion) -> List[str]:
+        """Summarize chunks concurrently on the event loop, preserving their order."""
+        map_prompt = self.prompts.template(version, "map")
+        slots = asyncio.Semaphore(max(1, self.config.MAP_MAX_CONCURRENCY))
+        
+        async def summarize_chunk(chunk: Any) -> str:
+            async with slots:
+                response = await self.llm.ainvoke(map_prompt.format(text=chunk.page_content))
+            return response.content
+        
+        return list(await asyncio.gather(*(summarize_chunk(chunk) for chunk in chunks)))
+    
+    async def _asummarize_map_reduce(self, documents: List[Any], version: PromptVersion, word_count: int) -> Dict[str, Any]:
+        """Async counterpart of _summarize_map_reduce."""
+        from langchain_core.documents import Document
+        
+        chunks = self.split_documents(documents)
+        partials = [
+            Document(page_content=text)
+            for text in await self._amap_chunks(chunks, version)
+        ]
+        
+        while len(partials) > 1 and self.estimate_tokens(partials) > self.config.STUFF_MAX_TOKENS:
+            collapsed = await self._amap_chunks(self.split_documents([
+                Document(page_content="\n\n".join(doc.page_content for doc in partials))
+            ]), version)
+            if len(collapsed) >= len(partials):
+                break
+            partials = [Document(page_content=text) for text in collapsed]
+        
+        return {
+            "summary": await self._asummarize_stuff(partials, version, word_count),
+            "chunk_count": len(chunks)
+        }
+    
+    async def _asummarize_refine(self, documents: List[Any], version: PromptVersion, word_count: int) -> Dict[str, Any]:
+        """Async counterpart of _summarize_refine."""
+        chunks = self.split_documents(documents)
+        chain = self.chains.get(self.llm, "refine", version, word_count)
+        result = await chain.ainvoke({"input_documents": chunks})
+        return {
+            "summary": result["output_text"],
+            "chunk_count": len(chunks)
+        }
+    
+    async def _arun_strategy(self, documents: List[Any], request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the resolved summarization strategy without blocking the event loop."""
+        strategy = request["strategy"]
+        version = request["prompt_version"]
+        word_count = request["word_count"]
+        if strategy == "map_reduce":
+            return await self._asummarize_map_reduce(documents, version, word_count)
+        if strategy == "refine":
+            return await self._asummarize_refine(documents, version, word_count)
+        return {
+            "summary": await self._asummarize_stuff(documents, version, word_count),
+            "chunk_count": 1
+        }
+    
+    async def asummarize_content(
+        self,
+        documents: List[Any],
+        word_count: int = None,
+        strategy: str = None,
+        tier: str = None
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously summarize content from documents.
+        
+        Behaves like summarize_content() but uses the async ChatGroq API, so many
+        summaries can be in flight on one event loop. The CPU and disk work
+        around the LLM call (normalization, extractive ranking, fingerprinting,
+        cache and archive lookups and writes, embeddings) runs in worker threads
+        so it does not hold up the other requests on the loop.
+        
+        Args:
+            documents (List[Any]): List of documents to summarize
+            word_count (int, optional): Target word count for summary
+            strategy (str, optional): "auto", "stuff", "map_reduce", "refine" or "extractive"
+            tier (str, optional): "fast", "balanced" or "quality", steering model routing
+            
+        Returns:
+            Dict[str, Any]: Summary result with metadata
+            
+        Raises:
+            SummarizationError: If summarization fails
+        """
+        extractive_result = await asyncio.to_thread(self._extractive_shortcut, documents, word_count, strategy)
+        if extractive_result is not None:
+            return extractive_result
+        
+        request = await asyncio.to_thread(self._prepare_request, documents, word_count, strategy, tier)
+        
+        cached_result = await asyncio.to_thread(self._lookup_cached_result, request)
+        if cached_result is not None:
+            return cached_result
+        
+        async def generate() -> Dict[str, Any]:
+            try:
+                with span("llm", strategy=request["strategy"]), use_route(request["route"]):
+                    result = await self._arun_strategy(request["documents"], request)
+            except Exception as e:
+                return await asyncio.to_thread(self._fallback_result, documents, request, e)
+            return await asyncio.to_thread(self._complete_request, documents, request, result)
+        
+        return dict(await self.single_flight.ado(request["flight_key"], generate, error_type=SummarizationError))
+    
+    def _prepare_synthesis(
+        self,
+        results: List[Dict[str, Any]],
+        word_count: int = None,
+        tier: str = None
+    ) -> Dict[str, Any]:
+        """
+        Resolve the prompt, model route and cache key of a cross-source synthesis.
+        
+        Args:
+            results (List[Dict[str, Any]]): Summary results, each with a "summary" and
+                optionally the "url" or "source" it was made from
+            word_count (int, optional): Target word count of the synthesis
+            tier (str, optional): "fast", "balanced" or "quality", steering model routing
+            
+        Returns:
+            Dict[str, Any]: Labelled summaries text, prompt and its version, route,
+                word count, source list, input token estimate and cache key
+            
+        Raises:
+            SummarizationError: If the service or the input is not usable
+        """
         if not self.llm:
             raise SummarizationError("LLM not properly initialized")
         
-        if not documents:
-            raise SummarizationError("No documents provided for summarization")
+        summaries = [result for result in results if result.get("summary")]
+        if len(summaries) < 2:
+            raise SummarizationError("At least two summaries are needed for a comparison")
         
-        try:
-            prompt = self.create_prompt_template(word_count)
-            chain = load_summarize_chain(self.llm, chain_type="stuff", prompt=prompt)
+        word_count = word_count or self.config.COMPARE_SYNTHESIS_WORD_COUNT
+        sources = [result.get("url") or result.get("source") or f"source {index}" for index, result in enumerate(summaries, 1)]
+        text = "\n\n".join(
+            f"Source {index} ({source}):\n{result['summary'].strip()}"
+            for index, (source, result) in enumerate(zip(sources, summaries), 1)
+        )
+        # The same set of sources keeps its prompt version across requests
+        version = self.prompts.select("\n".join(sources))
+        prompt = self.prompts.template(version, "synthesis", word_count)
+        input_tokens = estimate_tokens(text) + estimate_tokens(prompt.template)
+        
+        with span("plan", strategy="synthesis") as attributes:
+            try:
+                route = self.router.route(input_tokens, estimate_output_tokens(word_count), tier)
+            except ModelRouterError as e:
+                raise SummarizationError(str(e))
+            attributes.update(input_tokens=input_tokens, model=route.model.name)
+        
+        cache_key = None
+        if self.cache is not None:
+            from langchain_core.documents import Document
+            cache_key = ContentCache.summary_key(
+                [Document(page_content=text)], route.model.name, prompt.template, word_count, "synthesis", version.name
+            )
+        
+        return {
+            "text": text,
+            "prompt": prompt,
+            "prompt_version": version,
+            "route": route,
+            "word_count": word_count,
+            "sources": sources,
+            "input_tokens": input_tokens,
+            "cache_key": cache_key
+        }
+    
+    def _complete_synthesis(self, request: Dict[str, Any], summary: str) -> Dict[str, Any]:
+        """Build the synthesis result dictionary and store it in the cache."""
+        synthesis_result = {
+            "summary": summary,
+            "source_count": len(request["sources"]),
+            "sources": request["sources"],
+            "model_used": request["route"].model_used,
+            "model_tier": request["route"].tier,
+            "estimated_input_tokens": request["input_tokens"],
+            "word_count_target": request["word_count"],
+            "strategy": "synthesis",
+            "prompt_version": request["prompt_version"].name,
+            "cached": False
+        }
+        increment("tokens_in", request["input_tokens"])
+        increment("tokens_out", estimate_tokens(summary))
+        if request["cache_key"] is not None:
+            self.cache.put_summary(request["cache_key"], synthesis_result)
+        return dict(synthesis_result)
+    
+    def _cached_synthesis(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the cached synthesis of the same summaries, if any."""
+        if request["cache_key"] is None:
+            return None
+        cached_result = self.cache.get_summary(request["cache_key"])
+        if cached_result is not None:
+            cached_result["cached"] = True
+        return cached_result
+    
+    def synthesize(
+        self,
+        results: List[Dict[str, Any]],
+        word_count: int = None,
+        tier: str = None
+    ) -> Dict[str, Any]:
+        """
+        Write one comparative synthesis of several summaries.
+        
+        Each summary is labelled "Source N" with its URL, and the "synthesis"
+        prompt asks for agreements, contradictions and what only one source
+        covers, citing the labels. Summaries without text are left out.
+        
+        Args:
+            results (List[Dict[str, Any]]): Summary results, each with a "summary" and
+                optionally the "url" or "source" it was made from
+            word_count (int, optional): Target word count, defaults to COMPARE_SYNTHESIS_WORD_COUNT
+            tier (str, optional): "fast", "balanced" or "quality", steering model routing
+            
+        Returns:
+            Dict[str, Any]: Synthesis result with metadata
             
-            result = chain.invoke({"input_documents": documents})
+        Raises:
+            SummarizationError: If fewer than two summaries are given or the LLM call fails
+        """
+        request = self._prepare_synthesis(results, word_count, tier)
+        cached_result = self._cached_synthesis(request)
+        if cached_result is not None:
+            return cached_result
+        
+        try:
+            with span("llm", strategy="synthesis"), use_route(request["route"]):
+                response = self.llm.invoke(request["prompt"].format(text=request["text"]))
+        except Exception as e:
+            raise SummarizationError(f"Failed to generate synthesis: {str(e)}")
+        return self._complete_synthesis(request, response.content)
+    
+    async def asynthesize(
+        self,
+        results: List[Dict[str, Any]],
+        word_count: int = None,
+        tier: str = None
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously write one comparative synthesis of several summaries.
+        
+        Behaves like synthesize() but uses the async ChatGroq API.
+        
+        Args:
+            results (List[Dict[str, Any]]): Summary results, each with a "summary" and
+                optionally the "url" or "source" it was made from
+            word_count (int, optional): Target word count, defaults to COMPARE_SYNTHESIS_WORD_COUNT
+            tier (str, optional): "fast", "balanced" or "quality", steering model routing
             
-            return {
-                "summary": result["output_text"],
-                "document_count": len(documents),
-                "model_used": self.config.GROQ_MODEL,
-                "word_count_target": word_count or self.config.SUMMARY_WORD_COUNT
-            }
+        Returns:
+            Dict[str, Any]: Synthesis result with metadata
             
+        Raises:
+            SummarizationError: If fewer than two summaries are given or the LLM call fails
+        """
+        request = await asyncio.to_thread(self._prepare_synthesis, results, word_count, tier)
+        cached_result = await asyncio.to_thread(self._cached_synthesis, request)
+        if cached_result is not None:
+            return cached_result
+        
+        try:
+            with span("llm", strategy="synthesis"), use_route(request["route"]):
+                response = await self.llm.ainvoke(request["prompt"].format(text=request["text"]))
         except Exception as e:
-            raise SummarizationError(f"Failed to generate summary: {str(e)}")
+            raise SummarizationError(f"Failed to generate synthesis: {str(e)}")
+        return await asyncio.to_thread(self._complete_synthesis, request, response.content)
     
     def is_available(self) -> bool:
         """
         Check if the summarization service is available.
         
+        Without a usable LLM the service still counts as available when it
+        answers with extractive summaries instead.
+        
         Returns:
             bool: True if service is available
         """
-        return self.llm is not None and self.config.GROQ_API_KEY != ""
\ No newline at end of file
+        if self.llm is not None and self.config.GROQ_API_KEY != "":
+            return True
+        return self.llm_error is not None
\ No newline at end of file
@@ -0,0 +1,701 @@
+"""
+Persistent archive of past summaries with semantic search.
+
+Every generated summary is stored with its source chunks. The summary, each
+chunk and the whole document (the mean of its chunk vectors) are embedded
+with a local sentence-transformer model and indexed with FAISS, which
+serves "find related summaries" searches and, optionally, a semantic cache
+that reuses the summary of an equivalent document.
+
+Embeddings are added in batches by a background thread. Each batch is
+written as an immutable index segment that readers memory-map, so the index
+does not have to fit in memory. Segments are merged once there are more than
+ARCHIVE_MAX_SEGMENTS. Summaries, chunk texts and the segment list live in a
+SQLite database next to the segments, so several processes (app and job
+workers) can share one archive.
+"""
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import List, Any, Dict, Optional, Sequence, Tuple
+import numpy as np
+from config.settings import Config
+from src.utils.tracing import METRIC_PREFIX, get_metrics_registry
+
+
+ARCHIVE_KINDS = ("summary", "chunk", "document")
+# Source text is embedded in chunks of this many characters, at most MAX_CHUNKS per summary
+CHUNK_CHARS = 1000
+CHUNK_OVERLAP = 100
+MAX_CHUNKS = 64
+# Claimed rows whose segment never appeared are embedded again after this long
+STALE_CLAIM_SECONDS = 600
+# Extra search depth per requested hit, since hits are merged per summary and filtered
+SEARCH_OVERSAMPLING = 4
+
+_logger = logging.getLogger("content_summarizer.archive")
+
+
+class SummaryArchiveError(Exception):
+    """Custom exception for summary archive errors."""
+    pass
+
+
+@dataclass
+class ArchivedSummary:
+    """A stored summary and the request it answered."""
+
+    summary_id: int
+    source: Optional[str]
+    title: Optional[str]
+    summary: str
+    word_count: Optional[int]
+    result: Dict[str, Any]
+    created_at: float
+
+
+@dataclass
+class ArchiveHit:
+    """A summary found by a search, with the best-matching text and its score."""
+
+    entry: ArchivedSummary
+    score: float
+    kind: str
+    text: str
+
+
+def _faiss():
+    """Import FAISS, which is only needed once the archive is used."""
+    try:
+        import faiss
+    except ImportError:
+        raise SummaryArchiveError("faiss-cpu is not installed")
+    return faiss
+
+
+def split_chunks(documents: List[Any]) -> List[str]:
+    """
+    Split documents into the chunks the archive embeds.
+
+    Args:
+        documents (List[Any]): Documents to split
+
+    Returns:
+        List[str]: Up to MAX_CHUNKS chunks of about CHUNK_CHARS characters
+    """
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_CHARS, chunk_overlap=CHUNK_OVERLAP)
+    chunks = []
+    for doc in documents:
+        chunks.extend(text for text in splitter.split_text(doc.page_content) if text.strip())
+        if len(chunks) >= MAX_CHUNKS:
+            break
+    return chunks[:MAX_CHUNKS]
+
+
+def _normalized(vector: np.ndarray) -> np.ndarray:
+    """Scale a vector to unit length, so inner products are cosine similarities."""
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+class SummaryArchive:
+    """
+    Archive of summaries and their source chunks, searchable by meaning.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        model_name: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        flush_seconds: Optional[float] = None,
+        max_segments: Optional[int] = None
+    ):
+        """
+        Open (and create if needed) the archive.
+
+        Args:
+            directory (str, optional): Archive directory, defaults to ARCHIVE_DIR
+            model_name (str, optional): Sentence-transformer model name or
+                path, defaults to ARCHIVE_EMBEDDING_MODEL
+            batch_size (int, optional): Embeddings per batch, defaults to
+                ARCHIVE_BATCH_SIZE
+            flush_seconds (float, optional): Longest wait before a partial
+                batch is indexed, defaults to ARCHIVE_FLUSH_SECONDS
+            max_segments (int, optional): Segments kept before they are
+                merged, defaults to ARCHIVE_MAX_SEGMENTS
+        """
+        self.config = Config()
+        self.directory = directory or self.config.ARCHIVE_DIR
+        self.model_name = model_name or self.config.ARCHIVE_EMBEDDING_MODEL
+        self.batch_size = max(1, batch_size or self.config.ARCHIVE_BATCH_SIZE)
+        self.flush_seconds = flush_seconds or self.config.ARCHIVE_FLUSH_SECONDS
+        self.max_segments = max(1, max_segments or self.config.ARCHIVE_MAX_SEGMENTS)
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._segments_lock = threading.Lock()
+        self._encoder = None
+        self._encoder_lock = threading.Lock()
+        # Open segments: name -> {kind: memory-mapped index}
+        self._segments: Dict[str, Dict[str, Any]] = {}
+        # Vectors computed before their rows were indexed, by vector ID
+        self._precomputed: Dict[int, np.ndarray] = {}
+        self._pending = 0
+        self._pending_changed = threading.Condition()
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+        self.last_error: Optional[str] = None
+
+        self._conn = sqlite3.connect(
+            os.path.join(self.directory, "archive.db"), check_same_thread=False, timeout=30, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS summaries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT,
+                title TEXT,
+                summary TEXT NOT NULL,
+                word_count INTEGER,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS vectors (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                summary_id INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                text TEXT NOT NULL,
+                segment TEXT,
+                claimed_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_vectors_segment ON vectors(segment);
+            CREATE TABLE IF NOT EXISTS segments (
+                name TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                vectors INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            );
+            """
+        )
+
+        def recover(now: float) -> int:
+            self._conn.execute(
+                """
+                UPDATE vectors SET segment = NULL, claimed_at = NULL
+                WHERE segment IS NOT NULL AND claimed_at < ?
+                AND segment NOT IN (SELECT name FROM segments)
+                """,
+                (now - STALE_CLAIM_SECONDS,)
+            )
+            return self._conn.execute("SELECT COUNT(*) FROM vectors WHERE segment IS NULL").fetchone()[0]
+
+        # Rows left unindexed by an earlier run are embedded in the background
+        unindexed = self._transaction(recover)
+        if unindexed:
+            self._schedule(unindexed)
+
+    def _transaction(self, work):
+        """Run work(now) in an IMMEDIATE transaction and return its result."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                value = work(time.time())
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return value
+
+    def _query(self, sql: str, parameters: Sequence[Any] = ()) -> List[tuple]:
+        """Run a read-only query."""
+        with self._lock:
+            return self._conn.execute(sql, parameters).fetchall()
+
+    def _load_encoder(self):
+        """Load the sentence-transformer model on first use."""
+        with self._encoder_lock:
+            if self._encoder is None:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                except ImportError:
+                    raise SummaryArchiveError("sentence-transformers is not installed")
+                try:
+                    self._encoder = SentenceTransformer(self.model_name, device="cpu")
+                except Exception as e:
+                    raise SummaryArchiveError(f"Failed to load embedding model {self.model_name}: {str(e)}")
+            return self._encoder
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts with the archive's model.
+
+        Args:
+            texts (List[str]): Texts to embed
+
+        Returns:
+            np.ndarray: One unit-length float32 row per text
+
+        Raises:
+            SummaryArchiveError: If the model cannot be loaded or fails
+        """
+        encoder = self._load_encoder()
+        try:
+            vectors = encoder.encode(
+                texts,
+                batch_size=self.batch_size,
+                normalize_embeddings=True,
+                convert_to_numpy=True,
+                show_progress_bar=False
+            )
+        except Exception as e:
+            raise SummaryArchiveError(f"Failed to embed texts: {str(e)}") from e
+        return np.ascontiguousarray(vectors, dtype=np.float32)
+
+    def add(self, documents: List[Any], result: Dict[str, Any], chunk_vectors: Optional[np.ndarray] = None) -> int:
+        """
+        Archive a summary and its source chunks.
+
+        The entry is stored at once; its embeddings are indexed with the next
+        batch, so it shows up in searches within ARCHIVE_FLUSH_SECONDS.
+
+        Args:
+            documents (List[Any]): Documents that were summarized
+            result (Dict[str, Any]): Summary result dictionary
+            chunk_vectors (np.ndarray, optional): Embeddings of
+                split_chunks(documents), when already computed
+
+        Returns:
+            int: ID of the archived summary
+
+        Raises:
+            SummaryArchiveError: If the entry cannot be stored
+        """
+        chunks = split_chunks(documents)
+        metadata = dict(getattr(documents[0], "metadata", {}) or {}) if documents else {}
+
+        def insert(now: float) -> Tuple[int, List[int]]:
+            cursor = self._conn.execute(
+                "INSERT INTO summaries (source, title, summary, word_count, result, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    result.get("source") or metadata.get("source"),
+                    result.get("title") or metadata.get("title"),
+                    result["summary"],
+                    result.get("word_count_target"),
+                    json.dumps(result, default=str),
+                    now
+                )
+            )
+            summary_id = cursor.lastrowid
+            rows = [("summary", result["summary"]), ("document", "")] + [("chunk", chunk) for chunk in chunks]
+            vector_ids = []
+            for kind, text in rows:
+                cursor = self._conn.execute(
+                    "INSERT INTO vectors (summary_id, kind, text) VALUES (?, ?, ?)", (summary_id, kind, text)
+                )
+                vector_ids.append(cursor.lastrowid)
+            return summary_id, vector_ids
+
+        try:
+            summary_id, vector_ids = self._transaction(insert)
+        except sqlite3.Error as e:
+            raise SummaryArchiveError(f"Failed to archive summary: {str(e)}")
+        if chunk_vectors is not None and len(chunk_vectors) == len(chunks):
+            with self._lock:
+                self._precomputed.update(zip(vector_ids[2:], chunk_vectors))
+        self._schedule(len(vector_ids))
+        return summary_id
+
+    def _schedule(self, count: int):
+        """Count rows waiting to be indexed and make sure the flusher runs."""
+        with self._pending_changed:
+            self._pending += count
+            if self._flusher is None and not self._closed:
+                self._flusher = threading.Thread(target=self._run_flusher, name="archive-flusher", daemon=True)
+                self._flusher.start()
+                # A daemon thread killed mid-flush leaves its rows claimed until STALE_CLAIM_SECONDS
+                atexit.register(self.close)
+            if self._pending >= self.batch_size:
+                self._pending_changed.notify()
+
+    def _run_flusher(self):
+        """Index waiting rows once a batch is full or has waited ARCHIVE_FLUSH_SECONDS."""
+        while True:
+            with self._pending_changed:
+                self._pending_changed.wait_for(
+                    lambda: self._closed or self._pending >= self.batch_size, timeout=self.flush_seconds
+                )
+                if not self._pending:
+                    if self._closed:
+                        return
+                    continue
+                self._pending = 0
+                closing = self._closed
+            try:
+                self.flush()
+                self.last_error = None
+            except Exception as e:
+                # The rows stay unindexed and are retried with the next batch
+                self.last_error = str(e)
+                _logger.warning("Summary archive flush failed: %s", e)
+                if closing:
+                    return
+                with self._pending_changed:
+                    self._pending += 1
+
+    def close(self, timeout: float = 30.0):
+        """
+        Index the rows still waiting and stop the background flusher.
+
+        Args:
+            timeout (float): Longest wait for the last flush, in seconds
+        """
+        with self._pending_changed:
+            self._closed = True
+            self._pending_changed.notify()
+            flusher = self._flusher
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join(timeout)
+
+    def flush(self) -> int:
+        """
+        Index every archived row that is not indexed yet, as one new segment.
+
+        Returns:
+            int: Number of vectors indexed
+
+        Raises:
+            SummaryArchiveError: If embedding or writing the segment fails
+        """
+        with self._flush_lock:
+            name = f"{int(time.time() * 1000)}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+            def claim(now: float) -> List[tuple]:
+                rows = self._conn.execute(
+                    "SELECT id, summary_id, kind, text FROM vectors WHERE segment IS NULL ORDER BY id"
+                ).fetchall()
+                if rows:
+                    self._conn.execute(
+                        "UPDATE vectors SET segment = ?, claimed_at = ? WHERE segment IS NULL AND id <= ?",
+                        (name, now, rows[-1][0])
+                    )
+                return rows
+
+            rows = self._transaction(claim)
+            if not rows:
+                return 0
+            try:
+                vectors = self._vectors_for(rows)
+                ids = np.array([row[0] for row in rows], dtype=np.int64)
+                kinds = np.array([row[2] for row in rows])
+                self._write_segment(name, {
+                    kind: (ids[kinds == kind], vectors[kinds == kind])
+                    for kind in ARCHIVE_KINDS
+                    if (kinds == kind).any()
+                })
+                self._transaction(lambda now: self._conn.execute(
+                    "INSERT INTO segments (name, model, vectors, created_at) VALUES (?, ?, ?, ?)",
+                    (name, self.model_name, len(rows), now)
+                ))
+            except BaseException:
+                self._transaction(lambda now: self._conn.execute(
+                    "UPDATE vectors SET segment = NULL, claimed_at = NULL WHERE segment = ?", (name,)
+                ))
+                self._remove_segment_files(name)
+                raise
+            self._compact()
+            return len(rows)
+
+    def _vectors_for(self, rows: List[tuple]) -> np.ndarray:
+        """Embed claimed rows in one batch, reusing precomputed chunk vectors."""
+        with self._lock:
+            known = {row[0]: self._precomputed.pop(row[0]) for row in rows if row[0] in self._precomputed}
+        to_embed = [index for index, row in enumerate(rows) if row[2] != "document" and row[0] not in known]
+        embedded = self.embed([rows[index][3] for index in to_embed]) if to_embed else None
+
+        vectors: List[Optional[np.ndarray]] = [known.get(row[0]) for row in rows]
+        for position, index in enumerate(to_embed):
+            vectors[index] = embedded[position]
+
+        # A document is the mean of its chunks (or its summary, if it had no text)
+        by_summary: Dict[int, Dict[str, List[np.ndarray]]] = {}
+        for row, vector in zip(rows, vectors):
+            if vector is not None:
+                by_summary.setdefault(row[1], {}).setdefault(row[2], []).append(vector)
+        dimension = next(vector.shape[0] for vector in vectors if vector is not None)
+        for index, row in enumerate(rows):
+            if row[2] == "document":
+                parts = by_summary.get(row[1], {})
+                members = parts.get("chunk") or parts.get("summary")
+                vectors[index] = _normalized(np.mean(members, axis=0)) if members else np.zeros(dimension)
+        return np.vstack(vectors).astype(np.float32)
+
+    def _segment_path(self, name: str, kind: str) -> str:
+        """File holding one kind of vector of a segment."""
+        return os.path.join(self.directory, f"{name}.{kind}.faiss")
+
+    def _write_segment(self, name: str, parts: Dict[str, Tuple[np.ndarray, np.ndarray]]):
+        """Write one flat inner-product index per kind, atomically."""
+        faiss = _faiss()
+        for kind, (ids, vectors) in parts.items():
+            index = faiss.IndexIDMap2(faiss.IndexFlatIP(vectors.shape[1]))
+            index.add_with_ids(np.ascontiguousarray(vectors, dtype=np.float32), ids)
+            path = self._segment_path(name, kind)
+            faiss.write_index(index, path + ".tmp")
+            os.replace(path + ".tmp", path)
+
+    def _remove_segment_files(self, name: str):
+        """Delete a segment's files. Processes that mapped them keep their mapping."""
+        for kind in ARCHIVE_KINDS:
+            for path in (self._segment_path(name, kind), self._segment_path(name, kind) + ".tmp"):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _open_segments(self) -> Dict[str, Dict[str, Any]]:
+        """Memory-map the current segments, dropping merged ones."""
+        faiss = _faiss()
+        # Flat indexes are mapped read-only; FAISS before 1.9 only maps them with IO_FLAG_MMAP
+        flags = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+        names = [row[0] for row in self._query("SELECT name FROM segments WHERE model = ? ORDER BY created_at", (self.model_name,))]
+        with self._segments_lock:
+            opened = {}
+            for name in names:
+                indexes = self._segments.get(name)
+                if indexes is None:
+                    indexes = {}
+                    for kind in ARCHIVE_KINDS:
+                        path = self._segment_path(name, kind)
+                        if os.path.exists(path):
+                            try:
+                                indexes[kind] = faiss.read_index(path, flags)
+                            except RuntimeError:
+                                # Merged away by another process since the listing
+                                indexes = None
+                                break
+                    if indexes is None:
+                        continue
+                opened[name] = indexes
+            self._segments = opened
+            return opened
+
+    def _compact(self):
+        """Merge all segments into one once there are more than max_segments."""
+        faiss = _faiss()
+        segments = self._open_segments()
+        if len(segments) <= self.max_segments:
+            return
+        name = f"{int(time.time() * 1000)}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        def merge(now: float) -> List[str]:
+            current = [row[0] for row in self._conn.execute(
+                "SELECT name FROM segments WHERE model = ?", (self.model_name,)
+            ).fetchall()]
+            merged = [segment for segment in current if segment in segments]
+            if len(merged) <= self.max_segments:
+                return []
+            parts = {}
+            for kind in ARCHIVE_KINDS:
+                indexes = [segments[segment][kind] for segment in merged if kind in segments[segment]]
+                if indexes:
+                    parts[kind] = (
+                        np.concatenate([faiss.vector_to_array(index.id_map) for index in indexes]),
+                        np.vstack([index.index.reconstruct_n(0, index.ntotal) for index in indexes])
+                    )
+            self._write_segment(name, parts)
+            self._conn.executemany("DELETE FROM segments WHERE name = ?", [(segment,) for segment in merged])
+            self._conn.execute("UPDATE vectors SET segment = ? WHERE segment IN (%s)" % ",".join("?" * len(merged)), [name] + merged)
+            self._conn.execute(
+                "INSERT INTO segments (name, model, vectors, created_at) VALUES (?, ?, ?, ?)",
+                (name, self.model_name, sum(len(ids) for ids, _ in parts.values()), now)
+            )
+            return merged
+
+        try:
+            merged = self._transaction(merge)
+        except BaseException:
+            self._remove_segment_files(name)
+            raise
+        for segment in merged:
+            self._remove_segment_files(segment)
+
+    def _search_kind(self, vector: np.ndarray, kind: str, k: int) -> List[Tuple[int, float]]:
+        """Search one kind of vector across all segments, best first."""
+        query = vector.reshape(1, -1).astype(np.float32)
+        hits = []
+        for indexes in self._open_segments().values():
+            index = indexes.get(kind)
+            if index is None or not index.ntotal:
+                continue
+            scores, ids = index.search(query, min(k, index.ntotal))
+            hits.extend((int(vector_id), float(score)) for vector_id, score in zip(ids[0], scores[0]) if vector_id >= 0)
+        hits.sort(key=lambda hit: -hit[1])
+        return hits[:k]
+
+    def _hits(self, matches: List[Tuple[int, float]]) -> List[ArchiveHit]:
+        """Resolve vector matches to archived summaries, keeping each summary's best match."""
+        if not matches:
+            return []
+        placeholders = ",".join("?" * len(matches))
+        rows = self._query(
+            f"""
+            SELECT v.id, v.kind, v.text, s.id, s.source, s.title, s.summary, s.word_count, s.result, s.created_at
+            FROM vectors v JOIN summaries s ON s.id = v.summary_id
+            WHERE v.id IN ({placeholders})
+            """,
+            [vector_id for vector_id, _ in matches]
+        )
+        by_vector = {row[0]: row for row in rows}
+        hits: Dict[int, ArchiveHit] = {}
+        for vector_id, score in matches:
+            row = by_vector.get(vector_id)
+            if row is None or row[3] in hits:
+                continue
+            entry = ArchivedSummary(
+                summary_id=row[3],
+                source=row[4],
+                title=row[5],
+                summary=row[6],
+                word_count=row[7],
+                result=json.loads(row[8]),
+                created_at=row[9]
+            )
+            hits[row[3]] = ArchiveHit(entry=entry, score=score, kind=row[1], text=row[2] or row[6])
+        return sorted(hits.values(), key=lambda hit: -hit.score)
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        kinds: Sequence[str] = ("summary", "chunk"),
+        exclude_source: Optional[str] = None
+    ) -> List[ArchiveHit]:
+        """
+        Find the archived summaries most related to a text.
+
+        Args:
+            query (str): Search text, e.g. a question or another summary
+            k (int): Maximum number of summaries to return
+            kinds (Sequence[str]): Vector kinds to match against
+            exclude_source (str, optional): Leave out summaries of this source
+
+        Returns:
+            List[ArchiveHit]: Best match per summary, most similar first
+
+        Raises:
+            SummaryArchiveError: If the model or FAISS is not available
+        """
+        vector = self.embed([query])[0]
+        depth = k * SEARCH_OVERSAMPLING
+        matches = []
+        for kind in kinds:
+            matches.extend(self._search_kind(vector, kind, depth))
+        matches.sort(key=lambda match: -match[1])
+        hits = [hit for hit in self._hits(matches) if exclude_source is None or hit.entry.source != exclude_source]
+        return hits[:k]
+
+    def find_equivalent(
+        self,
+        chunk_vectors: np.ndarray,
+        word_count: Optional[int],
+        min_score: float,
+        result_fields: Optional[Dict[str, Any]] = None
+    ) -> Optional[ArchiveHit]:
+        """
+        Find an archived summary of a document equivalent to the one embedded.
+
+        Args:
+            chunk_vectors (np.ndarray): Embeddings of the document's split_chunks()
+            word_count (int, optional): Only summaries with this target word count match
+            min_score (float): Minimum cosine similarity of the document vectors
+            result_fields (Dict[str, Any], optional): Only summaries whose
+                result has these values match, e.g. the model and strategy
+
+        Returns:
+            Optional[ArchiveHit]: The most similar equivalent summary, or None
+        """
+        if not len(chunk_vectors):
+            return None
+        vector = _normalized(np.mean(chunk_vectors, axis=0))
+        matches = [match for match in self._search_kind(vector, "document", SEARCH_OVERSAMPLING) if match[1] >= min_score]
+        for hit in self._hits(matches):
+            if hit.entry.word_count != word_count:
+                continue
+            if all(hit.entry.result.get(key) == value for key, value in (result_fields or {}).items()):
+                return hit
+        return None
+
+    def get(self, summary_id: int) -> Optional[ArchivedSummary]:
+        """
+        Look up an archived summary.
+
+        Args:
+            summary_id (int): Summary ID
+
+        Returns:
+            Optional[ArchivedSummary]: The summary, or None if unknown
+        """
+        rows = self._query(
+            "SELECT id, source, title, summary, word_count, result, created_at FROM summaries WHERE id = ?",
+            (summary_id,)
+        )
+        if not rows:
+            return None
+        row = rows[0]
+        return ArchivedSummary(row[0], row[1], row[2], row[3], row[4], json.loads(row[5]), row[6])
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get archive counts.
+
+        Returns:
+            Dict[str, int]: Summaries, indexed and waiting vectors, and segments
+        """
+        summaries = self._query("SELECT COUNT(*) FROM summaries")[0][0]
+        indexed, waiting = self._query(
+            """
+            SELECT COALESCE(SUM(segment IN (SELECT name FROM segments)), 0),
+                   COALESCE(SUM(segment IS NULL OR segment NOT IN (SELECT name FROM segments)), 0)
+            FROM vectors
+            """
+        )[0]
+        segments = self._query("SELECT COUNT(*) FROM segments WHERE model = ?", (self.model_name,))[0][0]
+        return {"summaries": summaries, "indexed_vectors": indexed, "waiting_vectors": waiting, "segments": segments}
+
+    def render_metrics(self) -> List[str]:
+        """Render archive sizes as Prometheus text lines."""
+        stats = self.stats()
+        name = f"{METRIC_PREFIX}_archive_entries"
+        lines = [f"# HELP {name} Summary archive size.", f"# TYPE {name} gauge"]
+        for key, value in stats.items():
+            lines.append(f'{name}{{kind="{key}"}} {value}')
+        return lines
+
+
+_archive: Optional[SummaryArchive] = None
+_archive_lock = threading.Lock()
+
+
+def get_summary_archive() -> Optional[SummaryArchive]:
+    """
+    Get the process-wide summary archive, if ARCHIVE_ENABLED is set.
+
+    Returns:
+        Optional[SummaryArchive]: The shared archive, or None when disabled
+    """
+    global _archive
+    if not Config.ARCHIVE_ENABLED:
+        return None
+    with _archive_lock:
+        if _archive is None:
+            _archive = SummaryArchive()
+            get_metrics_registry().add_collector(_archive.render_metrics)
+        return _archive
@@ -0,0 +1,187 @@
+"""
+Boilerplate and noise stripping for loaded documents.
+
+Runs between loading and summarization so the LLM does not pay for cookie
+banners, repeated footers or transcript filler. Only lines that are nothing
+but site chrome, or that repeat an earlier line of the request, are dropped;
+prose that merely mentions such phrases is kept. Caption tags and spoken
+fillers are only stripped from YouTube transcripts, never from pages. All work is done with
+precompiled regexes and set lookups on line hashes; a typical page takes a
+few milliseconds, far below the LLM time it saves.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import List, Any, Optional, Set, Tuple
+from config.settings import Config
+from .token_budget import estimate_documents_tokens
+
+
+# Bracketed caption annotations and music notes, e.g. "[Music]", "(applause)"
+_CAPTION_TAGS = re.compile(
+    r"[\[(](?:music|applause|laughter|laughs|cheering|inaudible|silence|noise|crosstalk|foreign|__)[\])]|♪+",
+    re.IGNORECASE
+)
+# Spoken fillers as standalone words, with the commas around them
+_FILLER_WORDS = re.compile(r"(?:,\s*)?(?<![\w'-])(?:umm?|uhh?|erm|hmm|mhm|uh-huh)(?![\w'-]),?", re.IGNORECASE)
+_WHITESPACE_RUN = re.compile(r"[ \t\f\v\u00a0]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+# Lines that carry no words at all: separators, bullets, page numbers
+_NO_LETTERS = re.compile(r"[\W\d_]*")
+# Site chrome phrases; a line is only dropped when it consists of nothing else,
+# so prose that mentions "privacy policy" or "sign in" is kept
+_CHROME_PHRASE = (
+    r"(?:accept(?: all)? cookies|we use cookies|cookie (?:policy|settings|preferences)|privacy policy|"
+    r"terms (?:of (?:use|service)|and conditions)|all rights reserved|"
+    r"(?:subscribe|sign up)(?: (?:to|for) (?:our|the) newsletter)?|follow us(?: on \w+)?|"
+    r"share(?: (?:this|on) (?:article|post|page|facebook|twitter|linkedin|x))?|skip to (?:main )?content|"
+    r"back to top|advertisement|sponsored(?: content)?|read more|log ?in|log ?out|sign in|sign out|register)"
+)
+_CHROME_SEPARATOR = r"[\s|·•/>»,\-–]*"
+_BOILERPLATE_LINE = re.compile(
+    rf"{_CHROME_SEPARATOR}{_CHROME_PHRASE}(?:{_CHROME_SEPARATOR}{_CHROME_PHRASE})*{_CHROME_SEPARATOR}[.!:]?",
+    re.IGNORECASE
+)
+# Copyright notices such as "© 2024 Example Inc. All rights reserved."
+_COPYRIGHT_LINE = re.compile(
+    r"(?:copyright\s*)?(?:©|\(c\)|copyright\s+(?=\d))\s*(?:\d{4}(?:\s*[-–]\s*\d{4})?)?[^.!?]{0,60}"
+    r"(?:\.\s*all rights reserved)?\.?",
+    re.IGNORECASE
+)
+
+BOILERPLATE_MAX_CHARS = 120
+
+# Metadata "content_type" of transcript documents (see Transcript.to_document())
+TRANSCRIPT_CONTENT_TYPE = "youtube"
+
+
+@dataclass
+class NormalizationResult:
+    """Normalized documents and what the normalization saved."""
+
+    documents: List[Any] = field(default_factory=list)
+    tokens_before: int = 0
+    tokens_after: int = 0
+    duplicate_lines: int = 0
+    boilerplate_lines: int = 0
+    filler_removed: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        """Estimated input tokens removed by the normalization."""
+        return max(0, self.tokens_before - self.tokens_after)
+
+
+class TextNormalizer:
+    """
+    Strip duplicate blocks, site chrome and transcript filler from documents.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        """
+        Initialize the normalizer.
+
+        Args:
+            enabled (bool, optional): Normalize documents; defaults to
+                TEXT_NORMALIZATION_ENABLED. When disabled, documents pass
+                through unchanged.
+        """
+        self.config = Config()
+        self.enabled = self.config.TEXT_NORMALIZATION_ENABLED if enabled is None else enabled
+
+    @staticmethod
+    def _strip_filler(text: str) -> Tuple[str, int]:
+        """Remove caption tags and spoken fillers; return the text and the removal count."""
+        text, tags = _CAPTION_TAGS.subn(" ", text)
+        text, fillers = _FILLER_WORDS.subn(" ", text)
+        return text, tags + fillers
+
+    def normalize_text(
+        self,
+        text: str,
+        seen: Optional[Set[int]] = None,
+        result: Optional[NormalizationResult] = None,
+        transcript: bool = False
+    ) -> str:
+        """
+        Normalize one text.
+
+        Whitespace is collapsed, and lines are dropped when they repeat an
+        earlier line, carry no letters, or are short and consist entirely of
+        site chrome or a copyright notice. Transcripts also lose their caption
+        tags and spoken fillers; repeated words are kept everywhere.
+
+        Args:
+            text (str): Text to normalize
+            seen (Set[int], optional): Hashes of lines already kept, shared
+                across the documents of one request so repeated footers are
+                dropped from every page after the first
+            result (NormalizationResult, optional): Receives removal counts
+            transcript (bool): The text is a YouTube transcript
+
+        Returns:
+            str: Normalized text
+        """
+        seen = set() if seen is None else seen
+        result = NormalizationResult() if result is None else result
+
+        if transcript:
+            text, removed = self._strip_filler(text)
+            result.filler_removed += removed
+        text = _BLANK_LINES.sub("\n\n", _WHITESPACE_RUN.sub(" ", text))
+
+        kept: List[str] = []
+        for line in text.split("\n"):
+            line = line.strip()
+            if not line:
+                if kept and kept[-1]:
+                    kept.append("")
+                continue
+            if _NO_LETTERS.fullmatch(line):
+                result.boilerplate_lines += 1
+                continue
+            if len(line) <= BOILERPLATE_MAX_CHARS and (
+                _BOILERPLATE_LINE.fullmatch(line) or _COPYRIGHT_LINE.fullmatch(line)
+            ):
+                result.boilerplate_lines += 1
+                continue
+            key = hash(line.lower())
+            if key in seen:
+                result.duplicate_lines += 1
+                continue
+            seen.add(key)
+            kept.append(line)
+
+        return _BLANK_LINES.sub("\n\n", "\n".join(kept)).strip()
+
+    def normalize_documents(self, documents: List[Any]) -> NormalizationResult:
+        """
+        Normalize a request's documents.
+
+        Lines are deduplicated across all documents. Documents marked as
+        YouTube transcripts by the loader also have their filler stripped. A
+        document whose text is removed entirely is dropped, unless that would
+        leave none.
+
+        Args:
+            documents (List[Any]): Documents to normalize
+
+        Returns:
+            NormalizationResult: Normalized documents and token estimates
+        """
+        from langchain_core.documents import Document
+
+        tokens_before = estimate_documents_tokens(documents)
+        if not self.enabled:
+            return NormalizationResult(list(documents), tokens_before, tokens_before)
+
+        result = NormalizationResult(tokens_before=tokens_before)
+        seen: Set[int] = set()
+        for doc in documents:
+            transcript = doc.metadata.get("content_type") == TRANSCRIPT_CONTENT_TYPE
+            text = self.normalize_text(doc.page_content, seen, result, transcript)
+            if text:
+                result.documents.append(Document(page_content=text, metadata=dict(doc.metadata)))
+        if not result.documents:
+            result.documents = list(documents)
+        result.tokens_after = estimate_documents_tokens(result.documents)
+        return result
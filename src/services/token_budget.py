@@ -0,0 +1,184 @@
+"""
+Local token estimation and prompt budget planning.
+"""
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List, Any, Optional
+from config.settings import Config
+
+
+# Calibrated for English prose with Llama-family tokenizers
+CHARS_PER_TOKEN = 4.0
+TOKENS_PER_WORD = 1.33
+
+BUDGET_ACTIONS = ("stuff", "trim", "chunk", "reject")
+
+_WHITESPACE_RUN = re.compile(r"[ \t\f\v]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+@lru_cache(maxsize=1)
+def _get_tiktoken_encoding():
+    """Load the tiktoken encoding once, or None if it is unavailable."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+
+    Uses tiktoken when TOKEN_ESTIMATOR is "tiktoken" and the encoding can be
+    loaded; otherwise a heuristic that averages a character-based and a
+    word-based estimate, which is within a few percent for English prose.
+
+    Args:
+        text (str): Text to measure
+
+    Returns:
+        int: Approximate token count
+    """
+    if not text:
+        return 0
+    if Config.TOKEN_ESTIMATOR == "tiktoken":
+        encoding = _get_tiktoken_encoding()
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+    by_chars = len(text) / CHARS_PER_TOKEN
+    by_words = len(text.split()) * TOKENS_PER_WORD
+    return int((by_chars + by_words) / 2) + 1
+
+
+def estimate_documents_tokens(documents: List[Any]) -> int:
+    """
+    Estimate the number of tokens in a list of documents.
+
+    Args:
+        documents (List[Any]): Documents with a ``page_content`` attribute
+
+    Returns:
+        int: Approximate token count
+    """
+    return sum(estimate_tokens(doc.page_content) for doc in documents)
+
+
+def estimate_output_tokens(word_count: int) -> int:
+    """
+    Estimate the number of tokens a summary of the given length will take.
+
+    Args:
+        word_count (int): Target summary word count
+
+    Returns:
+        int: Approximate output token count
+    """
+    return int(word_count * TOKENS_PER_WORD) + 1
+
+
+def trim_boilerplate(text: str) -> str:
+    """
+    Cheaply shrink text by collapsing whitespace and dropping repeated lines.
+
+    Args:
+        text (str): Text to trim
+
+    Returns:
+        str: Trimmed text
+    """
+    seen = set()
+    lines = []
+    for line in _BLANK_LINES.sub("\n\n", text).split("\n"):
+        line = _WHITESPACE_RUN.sub(" ", line).strip()
+        if line and line in seen:
+            continue
+        if line:
+            seen.add(line)
+        lines.append(line)
+    return "\n".join(lines).strip()
+
+
+@dataclass
+class BudgetPlan:
+    """Outcome of planning a summarization request against the token budget."""
+
+    action: str
+    input_tokens: int
+    output_tokens: int
+    documents: List[Any] = field(default_factory=list)
+    reason: Optional[str] = None
+
+
+class TokenBudgetPlanner:
+    """
+    Decide how to fit documents into the model context before any LLM call.
+
+    Inputs that fit in one call are sent as-is ("stuff"). Inputs that only fit
+    after collapsing whitespace and repeated lines are trimmed ("trim").
+    Larger inputs are chunked ("chunk"), and inputs above the hard limit are
+    rejected ("reject") without a network round trip.
+    """
+
+    def __init__(self, stuff_max_tokens: int = None, max_input_tokens: int = None):
+        self.stuff_max_tokens = stuff_max_tokens or Config.STUFF_MAX_TOKENS
+        self.max_input_tokens = max_input_tokens or Config.MAX_INPUT_TOKENS
+
+    def plan(
+        self,
+        documents: List[Any],
+        word_count: int,
+        prompt_text: str = "",
+        stuff_max_tokens: int = None,
+        input_tokens: int = None
+    ) -> BudgetPlan:
+        """
+        Plan a summarization request.
+
+        Args:
+            documents (List[Any]): Documents to summarize
+            word_count (int): Target summary word count
+            prompt_text (str): Prompt template text, counted as input overhead
+            stuff_max_tokens (int, optional): Single-call budget of the model
+                that will run the request, instead of the planner's default
+            input_tokens (int, optional): Input estimate already computed by
+                the caller, including the prompt overhead
+
+        Returns:
+            BudgetPlan: The chosen action, token estimates and documents to use
+        """
+        stuff_max_tokens = stuff_max_tokens or self.stuff_max_tokens
+        overhead = estimate_tokens(prompt_text)
+        output_tokens = estimate_output_tokens(word_count)
+        if input_tokens is None:
+            input_tokens = estimate_documents_tokens(documents) + overhead
+
+        if input_tokens > self.max_input_tokens:
+            return BudgetPlan(
+                action="reject",
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                documents=documents,
+                reason=f"Estimated {input_tokens} input tokens exceeds the limit of {self.max_input_tokens}"
+            )
+
+        if input_tokens + output_tokens <= stuff_max_tokens:
+            return BudgetPlan("stuff", input_tokens, output_tokens, documents)
+
+        trimmed = self._trim_documents(documents)
+        trimmed_tokens = estimate_documents_tokens(trimmed) + overhead
+        if trimmed_tokens + output_tokens <= stuff_max_tokens:
+            return BudgetPlan("trim", trimmed_tokens, output_tokens, trimmed)
+
+        return BudgetPlan("chunk", trimmed_tokens, output_tokens, trimmed)
+
+    @staticmethod
+    def _trim_documents(documents: List[Any]) -> List[Any]:
+        """Return copies of the documents with boilerplate trimmed."""
+        from langchain_core.documents import Document
+        return [
+            Document(page_content=trim_boilerplate(doc.page_content), metadata=dict(doc.metadata))
+            for doc in documents
+        ]
@@ -0,0 +1,332 @@
+"""
+Persistent on-disk store for YouTube transcripts.
+"""
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from typing import List, Any, Dict, Optional, Tuple
+from config.settings import Config
+from src.utils.tracing import record_cache
+from .text_normalizer import TRANSCRIPT_CONTENT_TYPE
+
+
+# File layout (little-endian):
+#   header   magic, version, segment count, text length, compressed text length
+#   starts   uint32[segments]      segment start times in milliseconds
+#   lengths  uint32[segments]      segment durations in milliseconds
+#   offsets  uint32[segments]      character offset of each segment in the text
+#   text     zlib-compressed UTF-8 transcript text
+_MAGIC = b"YTTS"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHxxIII")
+_FILE_SUFFIX = ".tsc"
+_SAFE_KEY = re.compile(r"[^A-Za-z0-9_-]")
+
+
+def _column(values: List[int]) -> bytes:
+    """Pack integers as a little-endian uint32 column."""
+    column = array("I", values)
+    if sys.byteorder != "little":
+        column.byteswap()
+    return column.tobytes()
+
+
+def _read_column(buffer, offset: int, count: int) -> Tuple[array, int]:
+    """Unpack a little-endian uint32 column, returning it and the next offset."""
+    column = array("I")
+    end = offset + count * column.itemsize
+    chunk = buffer[offset:end]
+    if len(chunk) != end - offset:
+        raise ValueError("truncated column")
+    column.frombytes(chunk)
+    if sys.byteorder != "little":
+        column.byteswap()
+    return column, end
+
+
+class TranscriptStoreError(Exception):
+    """Raised when a stored transcript cannot be read or written."""
+    pass
+
+
+@dataclass
+class Transcript:
+    """A transcript as one text plus per-segment timing columns."""
+
+    video_id: str
+    language: str
+    text: str
+    starts_ms: List[int] = field(default_factory=list)
+    durations_ms: List[int] = field(default_factory=list)
+    offsets: List[int] = field(default_factory=list)
+
+    @classmethod
+    def from_segments(cls, video_id: str, language: str, segments: List[Tuple[str, float, float]]) -> "Transcript":
+        """
+        Build a transcript from (text, start seconds, duration seconds) segments.
+
+        Segment texts are joined with single spaces, matching YoutubeLoader's
+        plain-text transcript format.
+
+        Args:
+            video_id (str): YouTube video ID
+            language (str): Transcript language code
+            segments (List[Tuple[str, float, float]]): Transcript segments in order
+
+        Returns:
+            Transcript: The combined transcript
+        """
+        parts = []
+        starts_ms, durations_ms, offsets = [], [], []
+        position = 0
+        for text, start, duration in segments:
+            offsets.append(position)
+            starts_ms.append(max(0, int(round(start * 1000))))
+            durations_ms.append(max(0, int(round(duration * 1000))))
+            parts.append(text)
+            position += len(text) + 1
+        return cls(video_id, language, " ".join(parts), starts_ms, durations_ms, offsets)
+
+    def to_document(self) -> Any:
+        """
+        Convert the transcript to a LangChain document.
+
+        Returns:
+            Any: Document with the transcript text, its source video and the
+                content type that lets the normalizer strip filler
+        """
+        from langchain_core.documents import Document
+        return Document(
+            page_content=self.text,
+            metadata={"source": self.video_id, "language": self.language, "content_type": TRANSCRIPT_CONTENT_TYPE}
+        )
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the transcript in the store's file format.
+
+        Returns:
+            bytes: Header, timing columns and compressed text
+        """
+        raw_text = self.text.encode("utf-8")
+        compressed = zlib.compress(raw_text, 6)
+        header = _HEADER.pack(_MAGIC, _VERSION, len(self.offsets), len(raw_text), len(compressed))
+        return b"".join((
+            header,
+            _column(self.starts_ms),
+            _column(self.durations_ms),
+            _column(self.offsets),
+            compressed
+        ))
+
+    @classmethod
+    def from_buffer(cls, video_id: str, language: str, buffer) -> "Transcript":
+        """
+        Deserialize a transcript from bytes or a memory-mapped file.
+
+        Args:
+            video_id (str): YouTube video ID
+            language (str): Transcript language code
+            buffer: Bytes-like object in the store's file format
+
+        Returns:
+            Transcript: The stored transcript
+
+        Raises:
+            TranscriptStoreError: If the data is truncated or not a transcript
+        """
+        # Slices of the memoryview are zero-copy, so a memory-mapped file is
+        # decompressed straight from the mapping
+        view = memoryview(buffer)
+        try:
+            magic, version, count, text_length, compressed_length = _HEADER.unpack_from(view, 0)
+            if magic != _MAGIC or version != _VERSION:
+                raise TranscriptStoreError("Unrecognized transcript file format")
+            starts_ms, offset = _read_column(view, _HEADER.size, count)
+            durations_ms, offset = _read_column(view, offset, count)
+            offsets, offset = _read_column(view, offset, count)
+            raw_text = zlib.decompress(view[offset:offset + compressed_length])
+        except (struct.error, zlib.error, ValueError) as e:
+            raise TranscriptStoreError(f"Corrupt transcript file: {str(e)}")
+        finally:
+            view.release()
+        if len(raw_text) != text_length:
+            raise TranscriptStoreError("Corrupt transcript file: text length mismatch")
+        return cls(
+            video_id,
+            language,
+            raw_text.decode("utf-8"),
+            starts_ms.tolist(),
+            durations_ms.tolist(),
+            offsets.tolist()
+        )
+
+
+class TranscriptStore:
+    """
+    Directory of compressed transcripts keyed by video ID and language.
+
+    Each transcript is one file, written atomically. Files at or above
+    ``mmap_threshold`` bytes are read through a memory map so the compressed
+    text is decompressed straight from the page cache. Once the directory grows
+    past ``max_bytes``, the least recently used files are evicted.
+    """
+
+    def __init__(self, directory: str = None, max_bytes: int = None, mmap_threshold: int = None):
+        self.config = Config()
+        self.directory = directory or self.config.TRANSCRIPT_STORE_DIR
+        self.max_bytes = max_bytes or self.config.TRANSCRIPT_STORE_MAX_BYTES
+        self.mmap_threshold = self.config.TRANSCRIPT_MMAP_THRESHOLD_BYTES if mmap_threshold is None else mmap_threshold
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._total_bytes = sum(size for _, size, _ in self._scan())
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, video_id: str, language: str) -> str:
+        """File path for a transcript; keys are sanitized to safe file names."""
+        name = f"{_SAFE_KEY.sub('_', video_id)}.{_SAFE_KEY.sub('_', language)}{_FILE_SUFFIX}"
+        return os.path.join(self.directory, name)
+
+    def _scan(self) -> List[Tuple[str, int, float]]:
+        """List stored files as (path, size, last use time)."""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(_FILE_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def get(self, video_id: str, language: str) -> Optional[Transcript]:
+        """
+        Read a stored transcript.
+
+        Args:
+            video_id (str): YouTube video ID
+            language (str): Transcript language code
+
+        Returns:
+            Optional[Transcript]: The transcript, or None if it is not stored
+        """
+        path = self._path(video_id, language)
+        try:
+            with open(path, "rb") as handle:
+                size = os.fstat(handle.fileno()).st_size
+                if size >= self.mmap_threshold and size > 0:
+                    with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        transcript = Transcript.from_buffer(video_id, language, mapped)
+                else:
+                    transcript = Transcript.from_buffer(video_id, language, handle.read())
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            record_cache("transcript_store", False)
+            return None
+        except TranscriptStoreError:
+            # A damaged file is dropped so the transcript is fetched again
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+            record_cache("transcript_store", False)
+            return None
+
+        try:
+            # The modification time doubles as the last-use time for eviction
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        record_cache("transcript_store", True)
+        return transcript
+
+    def put(self, transcript: Transcript):
+        """
+        Store a transcript, replacing any previous copy, and enforce the size limit.
+
+        Args:
+            transcript (Transcript): Transcript to store
+
+        Raises:
+            TranscriptStoreError: If the file cannot be written
+        """
+        path = self._path(transcript.video_id, transcript.language)
+        data = transcript.to_bytes()
+        temp_path = None
+        try:
+            previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            # Don't leave a partial temp file behind when the write or rename fails
+            if temp_path is not None:
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+            raise TranscriptStoreError(f"Failed to store transcript: {str(e)}")
+
+        with self._lock:
+            self._total_bytes += len(data) - previous_size
+            over_limit = self._total_bytes > self.max_bytes
+        if over_limit:
+            self._evict()
+
+    def _remove(self, path: str) -> int:
+        """Delete a stored file, returning the bytes freed."""
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return 0
+        with self._lock:
+            self._total_bytes -= size
+        return size
+
+    def _evict(self):
+        """Delete least recently used files until the store fits its size limit."""
+        entries = sorted(self._scan(), key=lambda entry: entry[2])
+        with self._lock:
+            # Rescan so files written by other processes are accounted for
+            self._total_bytes = sum(size for _, size, _ in entries)
+        for path, _, _ in entries:
+            with self._lock:
+                if self._total_bytes <= self.max_bytes:
+                    return
+            self._remove(path)
+
+    def clear(self):
+        """Delete all stored transcripts."""
+        for path, _, _ in self._scan():
+            self._remove(path)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get store counters.
+
+        Returns:
+            Dict[str, int]: Hits, misses, stored files and bytes on disk
+        """
+        entries = self._scan()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries)
+            }
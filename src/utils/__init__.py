@@ -2,15 +2,45 @@
 Utility modules for the Content Summarizer application.
 """
 
-from .url_utils import is_youtube_url, validate_url, get_content_type_display, extract_domain
-from .text_utils import calculate_text_metrics, format_metrics_for_display, truncate_text
+from .url_utils import (
+    ParsedURL,
+    parse_url,
+    classify_url,
+    is_youtube_url,
+    validate_url,
+    get_content_type_display,
+    extract_domain,
+    normalize_url
+)
+from .tracing import (
+    Trace,
+    start_trace,
+    current_trace,
+    span,
+    mark_error,
+    get_metrics_registry,
+    start_metrics_server
+)
+from .text_utils import calculate_text_metrics, format_metrics_for_display, format_trace_for_display, truncate_text
 
 __all__ = [
+    'ParsedURL',
+    'parse_url',
+    'classify_url',
     'is_youtube_url',
     'validate_url', 
     'get_content_type_display',
     'extract_domain',
+    'normalize_url',
     'calculate_text_metrics',
     'format_metrics_for_display',
-    'truncate_text'
+    'format_trace_for_display',
+    'truncate_text',
+    'Trace',
+    'start_trace',
+    'current_trace',
+    'span',
+    'mark_error',
+    'get_metrics_registry',
+    'start_metrics_server'
 ]
\ No newline at end of file
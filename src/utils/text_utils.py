@@ -62,6 +62,71 @@ def format_metrics_for_display(metrics: Dict[str, int]) -> List[Dict[str, Any]]:
     ]
 
 
+def format_trace_for_display(trace: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Format a request trace for display in the UI.
+    
+    Args:
+        trace (Dict[str, Any]): Trace dictionary from Trace.to_dict()
+        
+    Returns:
+        List[Dict[str, Any]]: Formatted stage timings and counters for UI display
+    """
+    metrics = [
+        {
+            "icon": "⏱️",
+            "value": f"{trace['duration_ms'] or 0:.0f} ms",
+            "label": "Total",
+            "color": "#00d4ff"
+        }
+    ]
+    
+    stage_durations: Dict[str, float] = {}
+    for span in trace["spans"]:
+        stage_durations[span["name"]] = stage_durations.get(span["name"], 0) + span["duration_ms"]
+    for stage, duration_ms in stage_durations.items():
+        metrics.append({
+            "icon": "🕒",
+            "value": f"{duration_ms:.0f} ms",
+            "label": stage.replace("_", " ").replace(".", " · ").title(),
+            "color": "#00d4ff"
+        })
+    
+    counters = trace["counters"]
+    if "bytes_fetched" in counters:
+        metrics.append({
+            "icon": "📥",
+            "value": f"{counters['bytes_fetched'] / 1024:.1f} KB",
+            "label": "Fetched",
+            "color": "#00d4ff"
+        })
+    if "tokens_in" in counters or "tokens_out" in counters:
+        metrics.append({
+            "icon": "🔢",
+            "value": f"{int(counters.get('tokens_in', 0))} / {int(counters.get('tokens_out', 0))}",
+            "label": "Tokens In / Out",
+            "color": "#00d4ff"
+        })
+    if counters.get("tokens_saved"):
+        metrics.append({
+            "icon": "✂️",
+            "value": f"{int(counters['tokens_saved'])}",
+            "label": "Tokens Saved",
+            "color": "#00d4ff"
+        })
+    
+    hits = sum(lookups["hits"] for lookups in trace["cache"].values())
+    lookups_total = hits + sum(lookups["misses"] for lookups in trace["cache"].values())
+    if lookups_total:
+        metrics.append({
+            "icon": "💾",
+            "value": f"{hits} / {lookups_total}",
+            "label": "Cache Hits",
+            "color": "#00d4ff"
+        })
+    return metrics
+
+
 def truncate_text(text: str, max_length: int = 100) -> str:
     """
     Truncate text to specified length with ellipsis.
@@ -0,0 +1,493 @@
+"""
+Lightweight request tracing, stage timing and metrics export.
+
+A trace covers one request (one URL in the UI, the batch CLI or the async
+pipeline). Code running inside it records named spans, counters such as bytes
+fetched and tokens in/out, and cache lookups through the module-level helpers,
+which are no-ops when no trace is active. Finished traces are aggregated into
+the process-wide MetricsRegistry, rendered in the Prometheus text format, and
+optionally written as one JSON log line each.
+"""
+import json
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Any, Dict, Callable, Iterator, Optional, Tuple
+from config.settings import Config
+
+
+METRIC_PREFIX = "content_summarizer"
+
+# Histogram buckets in seconds, from cache hits up to long LLM generations
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+_trace_logger = logging.getLogger("content_summarizer.trace")
+_trace_listeners: List[Callable[["Trace"], None]] = []
+
+
+@dataclass
+class Span:
+    """A timed stage within a trace."""
+
+    name: str
+    offset_ms: float
+    duration_ms: float
+    cpu_ms: float = 0.0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+class Trace:
+    """Timings, counters and cache lookups recorded for one request."""
+
+    def __init__(self, name: str, **attributes: Any):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.attributes: Dict[str, Any] = dict(attributes)
+        self.started_at = time.time()
+        self.duration_ms: Optional[float] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.spans: List[Span] = []
+        self.counters: Dict[str, float] = {}
+        self.cache_lookups: Dict[str, Dict[str, int]] = {}
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._finished = False
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Time a stage of the request.
+
+        Args:
+            name (str): Stage name, e.g. "fetch" or "llm"
+            **attributes: Extra attributes stored with the span
+
+        Yields:
+            Dict[str, Any]: The span's attributes, which the caller may extend
+        """
+        started = time.perf_counter()
+        # CPU time of the calling thread; on an event loop it includes other tasks
+        started_cpu = time.thread_time()
+        try:
+            yield attributes
+        except BaseException as e:
+            attributes["error"] = type(e).__name__
+            raise
+        finally:
+            ended = time.perf_counter()
+            cpu = time.thread_time() - started_cpu
+            with self._lock:
+                self.spans.append(Span(
+                    name=name,
+                    offset_ms=round((started - self._start) * 1000, 3),
+                    duration_ms=round((ended - started) * 1000, 3),
+                    cpu_ms=round(cpu * 1000, 3),
+                    attributes=attributes
+                ))
+
+    def increment(self, name: str, value: float = 1):
+        """Add to a named counter, e.g. "bytes_fetched" or "tokens_in"."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_cache(self, cache: str, hit: bool):
+        """Count a hit or miss for a named cache."""
+        with self._lock:
+            lookups = self.cache_lookups.setdefault(cache, {"hits": 0, "misses": 0})
+            lookups["hits" if hit else "misses"] += 1
+
+    def set_attribute(self, name: str, value: Any):
+        """Attach a request-level attribute."""
+        with self._lock:
+            self.attributes[name] = value
+
+    def mark_error(self, message: str):
+        """Mark the request as failed."""
+        with self._lock:
+            self.status = "error"
+            self.error = message
+
+    def stage_durations(self) -> Dict[str, float]:
+        """
+        Total time per stage name, in milliseconds.
+
+        Returns:
+            Dict[str, float]: Stage durations in first-seen order
+        """
+        durations: Dict[str, float] = {}
+        with self._lock:
+            for span in self.spans:
+                durations[span.name] = round(durations.get(span.name, 0) + span.duration_ms, 3)
+        return durations
+
+    def finish(self, status: str = None):
+        """
+        End the trace and export it. Calling finish() again has no effect.
+
+        Args:
+            status (str, optional): Final status, overriding the current one
+        """
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+            self.duration_ms = round((time.perf_counter() - self._start) * 1000, 3)
+            if status is not None:
+                self.status = status
+        _export(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the trace to a JSON-serializable dictionary.
+
+        Returns:
+            Dict[str, Any]: Trace fields, spans, counters and cache lookups
+        """
+        with self._lock:
+            return {
+                "trace_id": self.trace_id,
+                "name": self.name,
+                "started_at": self.started_at,
+                "duration_ms": self.duration_ms,
+                "status": self.status,
+                "error": self.error,
+                "attributes": dict(self.attributes),
+                "spans": [
+                    {
+                        "name": s.name,
+                        "offset_ms": s.offset_ms,
+                        "duration_ms": s.duration_ms,
+                        "cpu_ms": s.cpu_ms,
+                        "attributes": s.attributes
+                    }
+                    for s in sorted(self.spans, key=lambda s: s.offset_ms)
+                ],
+                "counters": dict(self.counters),
+                "cache": {name: dict(lookups) for name, lookups in self.cache_lookups.items()}
+            }
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self):
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.sum += seconds
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+
+
+def _escape_label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_histograms(lines: List[str], name: str, label: str, histograms: Dict[str, Histogram]):
+    """
+    Append labelled histograms in the Prometheus text format.
+
+    Args:
+        lines (List[str]): Output lines to extend
+        name (str): Metric name
+        label (str): Label distinguishing the histograms, e.g. "stage"
+        histograms (Dict[str, Histogram]): Histograms by label value
+    """
+    for value, histogram in sorted(histograms.items()):
+        labels = f'{label}="{_escape_label(value)}"'
+        for bound, count in zip(DURATION_BUCKETS, histogram.buckets):
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+        lines.append(f"{name}_sum{{{labels}}} {round(histogram.sum, 6)}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+class MetricsRegistry:
+    """Process-wide aggregation of finished traces."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._collectors: List[Callable[[], List[str]]] = []
+        self.reset()
+
+    def add_collector(self, collector: Callable[[], List[str]]):
+        """
+        Append metrics that are not derived from traces, e.g. queue gauges.
+
+        Args:
+            collector (Callable[[], List[str]]): Returns Prometheus text lines
+                when the metrics are rendered
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def reset(self):
+        """Drop all aggregated metrics."""
+        with self._lock:
+            self._requests: Dict[Tuple[str, str], int] = {}
+            self._request_durations: Dict[str, Histogram] = {}
+            self._stage_durations: Dict[str, Histogram] = {}
+            self._counters: Dict[str, float] = {}
+            self._cache_lookups: Dict[Tuple[str, str], int] = {}
+
+    def observe(self, trace: Trace):
+        """
+        Fold a finished trace into the aggregates.
+
+        Args:
+            trace (Trace): Finished trace
+        """
+        data = trace.to_dict()
+        with self._lock:
+            key = (data["name"], data["status"])
+            self._requests[key] = self._requests.get(key, 0) + 1
+            if data["duration_ms"] is not None:
+                self._request_durations.setdefault(data["name"], Histogram()).observe(data["duration_ms"] / 1000)
+            for span in data["spans"]:
+                self._stage_durations.setdefault(span["name"], Histogram()).observe(span["duration_ms"] / 1000)
+            for name, value in data["counters"].items():
+                self._counters[name] = self._counters.get(name, 0) + value
+            for cache, lookups in data["cache"].items():
+                for field_name, result in (("hits", "hit"), ("misses", "miss")):
+                    key = (cache, result)
+                    self._cache_lookups[key] = self._cache_lookups.get(key, 0) + lookups[field_name]
+
+    def render_prometheus(self) -> str:
+        """
+        Render the aggregates in the Prometheus text exposition format.
+
+        Returns:
+            str: Metrics text ending with a newline
+        """
+        lines: List[str] = []
+        with self._lock:
+            name = f"{METRIC_PREFIX}_requests_total"
+            lines += [f"# HELP {name} Finished requests by trace name and status.", f"# TYPE {name} counter"]
+            for (trace_name, status), count in sorted(self._requests.items()):
+                lines.append(f'{name}{{name="{_escape_label(trace_name)}",status="{_escape_label(status)}"}} {count}')
+
+            name = f"{METRIC_PREFIX}_request_duration_seconds"
+            lines += [f"# HELP {name} End-to-end request duration.", f"# TYPE {name} histogram"]
+            render_histograms(lines, name, "name", self._request_durations)
+
+            name = f"{METRIC_PREFIX}_stage_duration_seconds"
+            lines += [f"# HELP {name} Duration of request stages.", f"# TYPE {name} histogram"]
+            render_histograms(lines, name, "stage", self._stage_durations)
+
+            for counter, value in sorted(self._counters.items()):
+                name = f"{METRIC_PREFIX}_{counter}_total"
+                lines += [f"# TYPE {name} counter", f"{name} {value:g}"]
+
+            name = f"{METRIC_PREFIX}_cache_lookups_total"
+            lines += [f"# HELP {name} Cache lookups by cache and result.", f"# TYPE {name} counter"]
+            for (cache, result), count in sorted(self._cache_lookups.items()):
+                lines.append(f'{name}{{cache="{_escape_label(cache)}",result="{result}"}} {count}')
+            collectors = list(self._collectors)
+        for collector in collectors:
+            lines += collector()
+        return "\n".join(lines) + "\n"
+
+
+_metrics_registry = MetricsRegistry()
+_metrics_server: Optional[ThreadingHTTPServer] = None
+_metrics_server_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """
+    Get the process-wide metrics registry.
+
+    Returns:
+        MetricsRegistry: The shared registry instance
+    """
+    return _metrics_registry
+
+
+def add_trace_listener(listener: Callable[[Trace], None]):
+    """
+    Call a function with every finished trace, e.g. to collect benchmark samples.
+
+    Args:
+        listener (Callable[[Trace], None]): Called from the thread that finished the trace
+    """
+    _trace_listeners.append(listener)
+
+
+def remove_trace_listener(listener: Callable[[Trace], None]):
+    """
+    Stop calling a function registered with add_trace_listener().
+
+    Args:
+        listener (Callable[[Trace], None]): Previously registered listener
+    """
+    if listener in _trace_listeners:
+        _trace_listeners.remove(listener)
+
+
+def _export(trace: Trace):
+    """Aggregate a finished trace, notify listeners and write the JSON trace log if enabled."""
+    _metrics_registry.observe(trace)
+    for listener in list(_trace_listeners):
+        listener(trace)
+    if Config.TRACE_LOG_ENABLED:
+        if not _trace_logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            _trace_logger.addHandler(handler)
+            _trace_logger.setLevel(logging.INFO)
+            _trace_logger.propagate = False
+        _trace_logger.info(json.dumps(trace.to_dict(), ensure_ascii=False, default=str))
+
+
+@contextmanager
+def activate(trace: Trace) -> Iterator[Trace]:
+    """
+    Make a trace current for the enclosed code without finishing it.
+
+    Used when one request is handled in several steps, e.g. by the producer
+    and consumer tasks of the async pipeline.
+
+    Args:
+        trace (Trace): Trace to make current
+
+    Yields:
+        Trace: The same trace
+    """
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+@contextmanager
+def start_trace(name: str, **attributes: Any) -> Iterator[Trace]:
+    """
+    Start a trace, make it current and finish it when the block exits.
+
+    Args:
+        name (str): Trace name, e.g. "process_content"
+        **attributes: Request-level attributes such as the URL
+
+    Yields:
+        Trace: The new trace
+    """
+    trace = Trace(name, **attributes)
+    try:
+        with activate(trace):
+            yield trace
+    except BaseException as e:
+        trace.mark_error(f"{type(e).__name__}: {str(e)}")
+        raise
+    finally:
+        trace.finish()
+
+
+def current_trace() -> Optional[Trace]:
+    """
+    Get the trace active in the current context.
+
+    Returns:
+        Optional[Trace]: The current trace, or None outside a traced request
+    """
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Time a stage of the current request; does nothing outside a trace.
+
+    Args:
+        name (str): Stage name
+        **attributes: Extra attributes stored with the span
+
+    Yields:
+        Dict[str, Any]: The span's attributes, which the caller may extend
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield attributes
+        return
+    with trace.span(name, **attributes) as span_attributes:
+        yield span_attributes
+
+
+def increment(name: str, value: float = 1):
+    """Add to a counter of the current trace, if any."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.increment(name, value)
+
+
+def record_cache(cache: str, hit: bool):
+    """Count a cache hit or miss on the current trace, if any."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.record_cache(cache, hit)
+
+
+def mark_error(message: str):
+    """Mark the current trace as failed, if any."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.mark_error(message)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serve the metrics registry at /metrics."""
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = _metrics_registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int = None, host: str = None) -> Optional[ThreadingHTTPServer]:
+    """
+    Serve Prometheus metrics on a background thread, once per process.
+
+    Args:
+        port (int, optional): Port to listen on, defaults to Config.METRICS_PORT;
+            0 disables the server
+        host (str, optional): Interface to bind, defaults to Config.METRICS_HOST
+
+    Returns:
+        Optional[ThreadingHTTPServer]: The running server, or None if disabled
+            or the port is unavailable
+    """
+    global _metrics_server
+    port = Config.METRICS_PORT if port is None else port
+    host = host or Config.METRICS_HOST
+    if not port:
+        return None
+    with _metrics_server_lock:
+        if _metrics_server is None:
+            try:
+                _metrics_server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError:
+                return None
+            _metrics_server.daemon_threads = True
+            threading.Thread(target=_metrics_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _metrics_server
@@ -3,12 +3,95 @@ URL validation and processing utilities.
 """
 import re
 import validators
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Tuple, Optional
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+
+TRACKING_QUERY_PREFIXES = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+
+
+# Single pass over a YouTube URL: host, optional path prefix and video ID.
+# Matches youtube.com/watch?v=, youtu.be/, /embed/, /v/, /shorts/, /live/
+# and youtube-nocookie.com embeds on any subdomain (www., m., music.).
+YOUTUBE_URL_PATTERN = re.compile(
+    r"""^(?:https?://)?(?:[a-z0-9-]+\.)*
+    (?P<host>youtube\.com|youtube-nocookie\.com|youtu\.be)(?::\d+)?
+    (?:
+        /(?P<prefix>embed/|v/|e/|shorts/|live/)?(?P<path_id>[A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])
+        |
+        /watch/?\?(?:[^#]*?&)?v=(?P<query_id>[A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])
+        |
+        (?=[/?#]|$)
+    )""",
+    re.IGNORECASE | re.VERBOSE
+)
+
+
+@dataclass(frozen=True)
+class ParsedURL:
+    """
+    A URL classified once and passed through the processing pipeline.
+    
+    Attributes:
+        url (str): The URL as entered
+        kind (str): Content type, "youtube" or "website"
+        canonical_url (str): Stable form used for deduplication and cache keys
+        domain (str): Lowercased host name
+        video_id (Optional[str]): YouTube video ID, if the URL points to a video
+    """
+    
+    url: str
+    kind: str
+    canonical_url: str
+    domain: str
+    video_id: Optional[str] = None
+
+
+@lru_cache(maxsize=4096)
+def parse_url(url: str) -> ParsedURL:
+    """
+    Classify a URL and derive its canonical form.
+    
+    YouTube video URLs in any supported form (watch, youtu.be, embed, shorts,
+    nocookie, ...) share the canonical URL https://www.youtube.com/watch?v=<id>.
+    Other URLs are canonicalized with normalize_url().
+    
+    Args:
+        url (str): The URL to parse
+        
+    Returns:
+        ParsedURL: The parsed, cached classification
+    """
+    url = url.strip()
+    match = YOUTUBE_URL_PATTERN.match(url)
+    
+    if match:
+        video_id = match.group("query_id")
+        if match.group("path_id") and (match.group("prefix") or match.group("host").lower() == "youtu.be"):
+            video_id = match.group("path_id")
+        canonical_url = f"https://www.youtube.com/watch?v={video_id}" if video_id else normalize_url(url)
+        return ParsedURL(
+            url=url,
+            kind="youtube",
+            canonical_url=canonical_url,
+            domain=urlparse(normalize_url(url)).hostname or "",
+            video_id=video_id
+        )
+    
+    canonical_url = normalize_url(url)
+    return ParsedURL(
+        url=url,
+        kind="website",
+        canonical_url=canonical_url,
+        domain=urlparse(canonical_url).hostname or ""
+    )
 
 
 def is_youtube_url(url: str) -> bool:
     """
-    Check if URL is a valid YouTube URL and return normalized format.
+    Check if URL is a valid YouTube URL.
     
     Args:
         url (str): The URL to validate
@@ -16,30 +99,19 @@ def is_youtube_url(url: str) -> bool:
     Returns:
         bool: True if the URL is a valid YouTube URL, False otherwise
     """
-    youtube_patterns = [
-        r'(https?://)?(www\.)?(youtube|youtu|youtube-nocookie)\.(com|be)/',
-        r'(https?://)?(www\.)?youtu\.be/',
-        r'(https?://)?(www\.)?youtube\.com/watch\?v=',
-        r'(https?://)?(www\.)?youtube\.com/embed/',
-        r'(https?://)?(www\.)?youtube\.com/v/'
-    ]
-    
-    for pattern in youtube_patterns:
-        if re.search(pattern, url):
-            return True
-    return False
+    return parse_url(url).kind == "youtube"
 
 
-def validate_url(url: str) -> Tuple[bool, Optional[str], Optional[str]]:
+def classify_url(url: str) -> Tuple[bool, Optional[ParsedURL], Optional[str]]:
     """
-    Validate URL and determine its type.
+    Validate URL and parse it into a ParsedURL.
     
     Args:
         url (str): The URL to validate
         
     Returns:
-        Tuple[bool, Optional[str], Optional[str]]: 
-            (is_valid, content_type, error_message)
+        Tuple[bool, Optional[ParsedURL], Optional[str]]:
+            (is_valid, parsed_url, error_message)
     """
     if not url:
         return False, None, "URL cannot be empty"
@@ -47,10 +119,24 @@ def validate_url(url: str) -> Tuple[bool, Optional[str], Optional[str]]:
     if not validators.url(url):
         return False, None, "Invalid URL format"
     
-    if is_youtube_url(url):
-        return True, "youtube", None
-    else:
-        return True, "website", None
+    return True, parse_url(url), None
+
+
+def validate_url(url: str) -> Tuple[bool, Optional[str], Optional[str]]:
+    """
+    Validate URL and determine its type.
+    
+    Args:
+        url (str): The URL to validate
+        
+    Returns:
+        Tuple[bool, Optional[str], Optional[str]]: 
+            (is_valid, content_type, error_message)
+    """
+    is_valid, parsed_url, error_message = classify_url(url)
+    if not is_valid:
+        return False, None, error_message
+    return True, parsed_url.kind, None
 
 
 def get_content_type_display(content_type: str) -> str:
@@ -85,4 +171,36 @@ def extract_domain(url: str) -> str:
         parsed = urlparse(url)
         return parsed.netloc
     except Exception:
-        return "Unknown"
\ No newline at end of file
+        return "Unknown"
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so equivalent links map to the same cache key.
+    
+    Lowercases the scheme and host, drops default ports, fragments, trailing
+    slashes and common tracking parameters, and sorts the query string.
+    
+    Args:
+        url (str): The URL to normalize
+        
+    Returns:
+        str: The normalized URL
+    """
+    url = url.strip()
+    if "://" not in url:
+        url = "https://" + url
+    
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    if (scheme == "http" and netloc.endswith(":80")) or (scheme == "https" and netloc.endswith(":443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    
+    path = parsed.path.rstrip("/") or "/"
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_QUERY_PREFIXES)
+    ))
+    
+    return urlunparse((scheme, netloc, path, "", query, ""))
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""
+Job worker pool for the persistent job queue.
+
+Usage:
+    python -m src.worker --workers 4
+
+Starts the given number of worker processes, restarts any that die, and
+stops them on SIGINT/SIGTERM after their current jobs. With --parent-pid the
+pool also stops when that process exits, which is how the Streamlit app runs
+it when JOB_QUEUE_ENABLED is set.
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+from typing import List, Dict, Optional
+from config.settings import Config
+
+
+# Seconds workers get to finish their current job on shutdown
+SHUTDOWN_TIMEOUT_SECONDS = 30
+
+
+def _process_alive(pid: int) -> bool:
+    """Check whether a process exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def run_pool(workers: int, parent_pid: Optional[int] = None) -> int:
+    """
+    Run worker processes until a signal arrives or the parent exits.
+
+    Args:
+        workers (int): Number of worker processes
+        parent_pid (int, optional): Stop when this process no longer exists
+
+    Returns:
+        int: Process exit code
+    """
+    from src.services.job_queue import run_worker_process
+
+    # Spawned children start from a clean interpreter, without this process's threads
+    context = multiprocessing.get_context("spawn")
+    stop = context.Event()
+    # Setting the multiprocessing event inside a handler can deadlock with the
+    # main thread's own wait on it, so the handlers only set a local flag
+    shutdown = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: shutdown.set())
+
+    prefix = f"{socket.gethostname()}-{os.getpid()}"
+    processes: Dict[int, multiprocessing.Process] = {}
+    while not shutdown.is_set():
+        for index in range(workers):
+            process = processes.get(index)
+            if process is None or not process.is_alive():
+                process = context.Process(
+                    target=run_worker_process,
+                    args=(f"{prefix}-{index}", stop, workers),
+                    name=f"job-worker-{index}",
+                    daemon=True
+                )
+                process.start()
+                processes[index] = process
+        if parent_pid and not _process_alive(parent_pid):
+            shutdown.set()
+        shutdown.wait(1.0)
+
+    stop.set()
+    for process in processes.values():
+        process.join(SHUTDOWN_TIMEOUT_SECONDS)
+        if process.is_alive():
+            # Its job's lease expires and another worker picks the job up
+            process.terminate()
+    return 0
+
+
+_pool_process: Optional[subprocess.Popen] = None
+_pool_lock = threading.Lock()
+
+
+def ensure_worker_pool(workers: int = None) -> Optional[subprocess.Popen]:
+    """
+    Start the worker pool in a child process, once per process.
+
+    A pool that has exited is started again on the next call.
+
+    Args:
+        workers (int, optional): Worker processes, defaults to JOB_WORKERS;
+            0 leaves the pool to be run separately with ``python -m src.worker``
+
+    Returns:
+        Optional[subprocess.Popen]: The pool process, or None if disabled
+    """
+    global _pool_process
+    workers = Config.JOB_WORKERS if workers is None else workers
+    if workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool_process is None or _pool_process.poll() is not None:
+            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            _pool_process = subprocess.Popen(
+                [sys.executable, "-m", "src.worker", "--workers", str(workers), "--parent-pid", str(os.getpid())],
+                cwd=project_root
+            )
+        return _pool_process
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(prog="python -m src.worker", description="Run job queue workers")
+    parser.add_argument("--workers", type=int, default=max(1, Config.JOB_WORKERS), help="Worker processes")
+    parser.add_argument("--parent-pid", type=int, default=None, help="Exit when this process exits")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if not Config.validate_config():
+        print("GROQ_API_KEY is not set", file=sys.stderr)
+        return 2
+    return run_pool(args.workers, args.parent_pid)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
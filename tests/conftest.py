@@ -0,0 +1,8 @@
+"""
+Shared pytest configuration.
+"""
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,40 @@
+"""
+Tests for near-duplicate lookups in ContentCache.
+"""
+from langchain_core.documents import Document
+
+from config.settings import Config
+from src.services.cache import ContentCache
+from src.services.near_duplicates import NearDuplicateIndex, fingerprint_documents
+
+
+def make_cache(monkeypatch) -> ContentCache:
+    monkeypatch.setattr(Config, "NEAR_DUPLICATE_ENABLED", True)
+    return ContentCache(db_path="")
+
+
+def documents():
+    text = " ".join(f"The committee reviewed item {n} and approved it." for n in range(60))
+    return [Document(page_content=text)]
+
+
+def test_near_duplicate_probes_are_not_summary_traffic(monkeypatch):
+    cache = make_cache(monkeypatch)
+    variant = NearDuplicateIndex.variant("Summarize", "llama", "balanced", "stuff")
+    key = ContentCache.summary_key(documents(), "llama", "Summarize", 200)
+    fingerprint = fingerprint_documents(documents())
+    cache.put_summary(key, {"summary": "Approved.", "source": "https://example.com/1"})
+    cache.put_fingerprint(fingerprint, variant, key)
+
+    assert cache.get_near_duplicate_summary(fingerprint, variant)["summary"] == "Approved."
+    assert cache.get_near_duplicate_summary(fingerprint, variant + 1) is None
+    stats = cache.stats()[ContentCache.SUMMARIES_NAMESPACE]
+    assert (stats["hits"], stats["misses"]) == (0, 0)
+
+
+def test_variant_separates_model_tier_and_strategy():
+    base = NearDuplicateIndex.variant("Summarize", "llama", "balanced", "stuff")
+    assert base == NearDuplicateIndex.variant("Summarize", "llama", "balanced", "stuff")
+    assert base != NearDuplicateIndex.variant("Summarize", "mixtral", "balanced", "stuff")
+    assert base != NearDuplicateIndex.variant("Summarize", "llama", "fast", "stuff")
+    assert base != NearDuplicateIndex.variant("Summarize", "llama", "balanced", "map_reduce")
@@ -0,0 +1,133 @@
+"""
+Tests for model routing fallback, cooldown and rate-limit handling.
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import List, Any, Optional
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from src.services.chat_models import GovernedChatModel, RoutedChatModel
+from src.services.model_router import FAILURES_BEFORE_COOLDOWN, ModelRouter, ModelSpec, use_route
+from src.services.rate_limiter import RateGovernor
+
+
+class ServerError(Exception):
+    status_code = 500
+
+
+class RateLimited(Exception):
+    """A 429 response carrying Retry-After, shaped like the Groq client's error."""
+
+    status_code = 429
+
+    def __init__(self, retry_after: float):
+        super().__init__("rate limited")
+        self.response = SimpleNamespace(headers={"retry-after": str(retry_after)})
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model that raises the queued errors, then answers with its name."""
+
+    reply: str = "ok"
+    errors: List[Any] = []
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.reply))])
+
+
+class HangingChatModel(BaseChatModel):
+    """Chat model whose async calls never finish."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "hanging"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        raise NotImplementedError
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(60)
+        raise AssertionError("not cancelled")
+
+
+def make_routed(errors_a: List[Exception], errors_b: List[Exception] = None):
+    router = ModelRouter([ModelSpec("model-a", "balanced", 8000), ModelSpec("model-b", "balanced", 8000)], cooldown_seconds=60)
+    models = {
+        "model-a": ScriptedChatModel(reply="a", errors=list(errors_a)),
+        "model-b": ScriptedChatModel(reply="b", errors=list(errors_b or []))
+    }
+    return router, models, RoutedChatModel(models=models, router=router)
+
+
+def test_falls_back_to_the_next_candidate_on_errors():
+    router, models, llm = make_routed([ServerError("boom")])
+    route = router.route(100, 50)
+    with use_route(route):
+        assert llm.invoke("hello").content == "b"
+    assert route.model_used == "model-b"
+    assert router.stats()["model-a"]["errors"] == 1
+    assert router.stats()["model-b"]["errors"] == 0
+
+
+def test_failing_model_cools_down():
+    router, models, llm = make_routed([ServerError("boom")] * FAILURES_BEFORE_COOLDOWN)
+    for _ in range(FAILURES_BEFORE_COOLDOWN):
+        with use_route(router.route(100, 50)):
+            llm.invoke("hello")
+    route = router.route(100, 50)
+    assert [model.name for model in route.candidates] == ["model-b", "model-a"]
+    calls = models["model-a"].calls
+    with use_route(route):
+        assert llm.invoke("hello").content == "b"
+    assert models["model-a"].calls == calls
+
+
+def test_rate_limits_are_raised_without_fallback_or_error_stats():
+    router, models, llm = make_routed([RateLimited(1)])
+    with use_route(router.route(100, 50)):
+        with pytest.raises(RateLimited):
+            llm.invoke("hello")
+    assert models["model-b"].calls == 0
+    assert router.stats()["model-a"]["errors"] == 0
+
+
+def test_governor_waits_out_retry_after_and_retries():
+    router, models, routed = make_routed([RateLimited(0.3)])
+    governor = RateGovernor(requests_per_minute=0, tokens_per_minute=0, max_concurrency=0)
+    llm = GovernedChatModel(llm=routed, governor=governor, completion_tokens=10, max_retries=2)
+    started = time.monotonic()
+    with use_route(router.route(100, 50)):
+        assert llm.invoke("hello").content == "a"
+    assert time.monotonic() - started >= 0.3
+    assert governor.stats()["throttled"] == 1
+    assert models["model-a"].calls == 2
+    assert models["model-b"].calls == 0
+
+
+def test_cancelled_call_releases_its_permit():
+    governor = RateGovernor(requests_per_minute=0, tokens_per_minute=0, max_concurrency=1, max_wait_seconds=1)
+    llm = GovernedChatModel(llm=HangingChatModel(), governor=governor, completion_tokens=10)
+
+    async def run():
+        task = asyncio.create_task(llm.ainvoke("hello"))
+        await asyncio.sleep(0.05)
+        assert governor.stats()["in_flight"] == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert governor.stats()["in_flight"] == 0
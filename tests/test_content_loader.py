@@ -0,0 +1,54 @@
+"""
+Tests for ContentLoader website loading against the local fixture server.
+"""
+import pytest
+
+from benchmarks.fakes import FixtureServer
+from src.services.content_loader import ContentLoader
+
+
+@pytest.fixture(scope="module")
+def server():
+    with FixtureServer() as fixture_server:
+        yield fixture_server
+
+
+def test_html_pages_go_through_the_extractor(server, monkeypatch):
+    def fail(result, media_type):
+        raise AssertionError("HTML must not be partitioned")
+
+    monkeypatch.setattr(ContentLoader, "_partition_document", staticmethod(fail))
+    docs = ContentLoader().load_website_content(f"{server.base_url}/news_article.html")
+    assert len(docs) == 1
+    assert docs[0].metadata["source"].endswith("news_article.html")
+    assert docs[0].page_content.strip()
+
+
+def test_other_content_types_are_partitioned_by_type(server, monkeypatch):
+    calls = []
+
+    def partition(result, media_type):
+        calls.append(media_type)
+        return result.text
+
+    monkeypatch.setattr(ContentLoader, "_partition_document", staticmethod(partition))
+    docs = ContentLoader().load_website_content(f"{server.base_url}/news_article.txt")
+    assert calls == ["text/plain"]
+    assert docs[0].page_content.strip()
+
+
+def test_unchanged_pages_are_served_from_the_document_cache(server):
+    from langchain_core.documents import Document
+    from src.services.cache import ContentCache
+
+    cache = ContentCache(db_path="")
+    loader = ContentLoader(cache=cache)
+    url = f"{server.base_url}/blog_post.html"
+    loader.load_website_content(url)
+    cache.put_documents(url, [Document(page_content="cached text", metadata={"source": url})])
+
+    # The fixture server answers the If-Modified-Since revalidation with a 304
+    assert loader.load_website_content(url)[0].page_content == "cached text"
+
+    cache.documents.memory.clear()
+    assert loader.load_website_content(url)[0].page_content != "cached text"
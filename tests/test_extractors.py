@@ -0,0 +1,41 @@
+"""
+Tests for the HTML extractors.
+"""
+import pytest
+
+from src.services.content_loader import ContentLoaderError
+from src.services.extractors import ContentExtractor, FallbackExtractor, ReadabilityExtractor, create_extractor
+
+
+def test_unknown_extractor_is_a_content_loader_error():
+    with pytest.raises(ContentLoaderError):
+        create_extractor("nonexistent")
+
+
+def test_content_extractor_is_abstract():
+    with pytest.raises(TypeError):
+        ContentExtractor()
+
+
+def test_readability_is_the_default_with_a_fallback():
+    extractor = create_extractor("readability")
+    assert isinstance(extractor, FallbackExtractor)
+    assert isinstance(extractor.primary, ReadabilityExtractor)
+
+
+def test_readability_keeps_the_article_and_drops_chrome():
+    html = """
+    <html><head><title>Budget approved</title></head><body>
+    <nav><a href="/">Home</a> <a href="/news">News</a></nav>
+    <article>
+      <h1>Budget approved</h1>
+      <p>The council approved the city budget on Tuesday after a long debate about transit funding.</p>
+      <p>Members voted seven to two, with both dissenters citing the cost of the new bus lanes.</p>
+    </article>
+    <footer>Privacy Policy | Terms of Use</footer>
+    </body></html>
+    """
+    text = ReadabilityExtractor().extract(html)
+    assert "seven to two" in text
+    assert "Privacy Policy" not in text
+    assert "Home" not in text
@@ -0,0 +1,113 @@
+"""
+Tests for HttpFetcher against a scripted local HTTP server.
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.services.http_fetcher import HttpFetcher, HttpFetchError
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Answers each path from the server's script and records the request headers."""
+
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        script = self.server.script[self.path]
+        status, headers, body = script.pop(0) if len(script) > 1 else script[0]
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        # Bodies sent with "Connection: close" end at EOF instead of a Content-Length
+        if "Content-Length" not in headers and "Connection" not in headers and status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    http_server = ThreadingHTTPServer(("127.0.0.1", 0), ScriptedHandler)
+    http_server.daemon_threads = True
+    http_server.script = {}
+    http_server.requests = []
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    http_server.base_url = f"http://127.0.0.1:{http_server.server_port}"
+    yield http_server
+    http_server.shutdown()
+    http_server.server_close()
+
+
+def make_fetcher(**options) -> HttpFetcher:
+    options.setdefault("max_retries", 2)
+    options.setdefault("backoff_factor", 0)
+    return HttpFetcher(**options)
+
+
+def test_retries_server_errors(server):
+    server.script["/flaky"] = [(503, {}, b"busy"), (503, {}, b"busy"), (200, {"Content-Type": "text/html"}, b"<p>ok</p>")]
+    result = make_fetcher().fetch(f"{server.base_url}/flaky")
+    assert result.status_code == 200
+    assert result.text == "<p>ok</p>"
+    assert len(server.requests) == 3
+
+
+def test_gives_up_after_the_retries(server):
+    server.script["/down"] = [(503, {}, b"busy")]
+    with pytest.raises(HttpFetchError):
+        make_fetcher(max_retries=1).fetch(f"{server.base_url}/down")
+    assert len(server.requests) == 2
+
+
+def test_client_errors_are_not_retried(server):
+    server.script["/missing"] = [(404, {}, b"not found")]
+    with pytest.raises(HttpFetchError):
+        make_fetcher().fetch(f"{server.base_url}/missing")
+    assert len(server.requests) == 1
+
+
+def test_revalidates_with_etag(server):
+    server.script["/page"] = [(200, {"ETag": '"v1"'}, b"body"), (304, {"ETag": '"v1"'}, b"")]
+    fetcher = make_fetcher(revalidate=True)
+    url = f"{server.base_url}/page"
+    assert fetcher.fetch(url, cache_key="page").content == b"body"
+    result = fetcher.fetch(url, cache_key="page")
+    assert result.not_modified
+    assert result.content == b""
+    assert result.cache_key == "page"
+    assert server.requests[1][1].get("If-None-Match") == '"v1"'
+
+
+def test_unexpected_304_is_refetched_without_validators(server):
+    server.script["/page"] = [(304, {}, b""), (200, {}, b"body")]
+    result = make_fetcher(revalidate=True).fetch(f"{server.base_url}/page", cache_key="page")
+    assert not result.not_modified
+    assert result.content == b"body"
+    assert "If-None-Match" not in server.requests[1][1]
+
+
+def test_no_validators_without_revalidation(server):
+    server.script["/page"] = [(200, {"ETag": '"v1"'}, b"body")]
+    fetcher = make_fetcher(revalidate=False)
+    url = f"{server.base_url}/page"
+    fetcher.fetch(url, cache_key="page")
+    fetcher.fetch(url, cache_key="page")
+    assert "If-None-Match" not in server.requests[1][1]
+
+
+def test_rejects_declared_oversized_bodies(server):
+    server.script["/big"] = [(200, {"Content-Length": "5000"}, b"x" * 5000)]
+    with pytest.raises(HttpFetchError, match="too large"):
+        make_fetcher(max_response_bytes=1000).fetch(f"{server.base_url}/big")
+
+
+def test_rejects_oversized_bodies_without_length(server):
+    server.script["/stream"] = [(200, {"Connection": "close"}, b"x" * 5000)]
+    with pytest.raises(HttpFetchError, match="exceeds limit"):
+        make_fetcher(max_response_bytes=1000).fetch(f"{server.base_url}/stream")
@@ -0,0 +1,19 @@
+"""
+Enforce the cold-start import budget of benchmarks/bench_import_time.py.
+"""
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_cold_start_within_budget():
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_import_time", "--check", "--runs", "3"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=300
+    )
+    assert completed.returncode == 0, completed.stdout + completed.stderr
@@ -0,0 +1,59 @@
+"""
+Tests for JobQueue submission.
+"""
+import sqlite3
+
+from src.services.job_queue import JobQueue
+
+
+def make_queue(tmp_path) -> JobQueue:
+    return JobQueue(db_path=str(tmp_path / "jobs.db"))
+
+
+def test_equivalent_urls_share_one_active_job(tmp_path):
+    queue = make_queue(tmp_path)
+    job = queue.submit("https://www.youtube.com/watch?v=dQw4w9WgXcQ", 200)
+    assert queue.submit("https://youtu.be/dQw4w9WgXcQ", 200).job_id == job.job_id
+    assert queue.submit("https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=3", 200).job_id == job.job_id
+    assert queue.submit("https://www.youtube.com/watch?v=dQw4w9WgXcQ", 100).job_id != job.job_id
+
+    page = queue.submit("https://example.com/article/", 200)
+    assert queue.submit("https://Example.com/article?utm_source=feed", 200).job_id == page.job_id
+    assert queue.stats()["queued"] == 3
+    queue.close()
+
+
+def test_finished_jobs_are_not_reused(tmp_path):
+    queue = make_queue(tmp_path)
+    job = queue.submit("https://example.com/article", 200)
+    claimed = queue.claim("worker-1")
+    queue.complete(claimed.job_id, "worker-1", {"summary": "Done."})
+    assert queue.submit("https://example.com/article/", 200).job_id != job.job_id
+    queue.close()
+
+
+def test_opens_databases_without_the_canonical_url_column(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        CREATE TABLE jobs (
+            job_id TEXT PRIMARY KEY, url TEXT NOT NULL, word_count INTEGER, session TEXT,
+            status TEXT NOT NULL, stage TEXT, attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL, partial_summary TEXT NOT NULL DEFAULT '', result TEXT,
+            error TEXT, worker TEXT, available_at REAL NOT NULL, lease_expires_at REAL,
+            created_at REAL NOT NULL, updated_at REAL NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO jobs (job_id, url, word_count, status, max_attempts, available_at, created_at, updated_at)
+        VALUES ('old', 'https://youtu.be/dQw4w9WgXcQ', 200, 'queued', 3, 0, 0, 0)
+        """
+    )
+    conn.commit()
+    conn.close()
+    queue = JobQueue(db_path=path)
+    assert queue.submit("https://www.youtube.com/watch?v=dQw4w9WgXcQ", 200).job_id == "old"
+    queue.close()
@@ -0,0 +1,54 @@
+"""
+Tests for RateGovernor slot handling.
+"""
+import asyncio
+import threading
+
+import pytest
+
+from src.services.rate_limiter import RateGovernor, RateLimitError
+
+
+def test_cancelled_async_waiter_leaves_the_queue():
+    governor = RateGovernor(requests_per_minute=0, tokens_per_minute=1000, max_concurrency=1, max_wait_seconds=5)
+    holder = governor.acquire(100)
+
+    async def run():
+        task = asyncio.create_task(governor.aacquire(100))
+        await asyncio.sleep(0.05)
+        assert governor.stats()["queue_depth"] == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert governor.stats()["queue_depth"] == 0
+        holder.release(0)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+    stats = governor.stats()
+    assert (stats["queue_depth"], stats["in_flight"]) == (0, 0)
+    # Only the released call's 0 actual tokens were charged against the budget
+    assert governor.tokens.level == pytest.approx(governor.tokens.capacity)
+
+
+def test_async_waiter_is_woken_by_a_release_from_another_thread():
+    governor = RateGovernor(requests_per_minute=0, tokens_per_minute=0, max_concurrency=1, max_wait_seconds=5)
+    holder = governor.acquire(100)
+
+    async def run():
+        threading.Timer(0.05, holder.release).start()
+        permit = await asyncio.wait_for(governor.aacquire(100), 1)
+        permit.release()
+        return permit
+
+    assert asyncio.run(run()).waited >= 0.04
+    assert governor.stats()["in_flight"] == 0
+
+
+def test_async_waiter_times_out():
+    governor = RateGovernor(requests_per_minute=0, tokens_per_minute=0, max_concurrency=1, max_wait_seconds=0.1)
+    governor.acquire(100)
+    with pytest.raises(RateLimitError):
+        asyncio.run(governor.aacquire(100))
+    stats = governor.stats()
+    assert (stats["queue_depth"], stats["timeouts"]) == (0, 1)
@@ -0,0 +1,32 @@
+"""
+Tests for ServiceRegistry warm-up.
+"""
+from src.services.registry import ServiceRegistry
+
+
+def make_registry(monkeypatch) -> ServiceRegistry:
+    registry = ServiceRegistry()
+    builds = []
+
+    def build(fingerprint: str):
+        builds.append(fingerprint)
+        registry._content_loader = object()
+        registry._summarization_service = object()
+        registry._fingerprint = fingerprint
+
+    monkeypatch.setattr(registry, "_build", build)
+    registry.builds = builds
+    return registry
+
+
+def test_warm_up_runs_again_after_reset(monkeypatch):
+    registry = make_registry(monkeypatch)
+    registry.warm_up()
+    registry._warm_up.join(5)
+    assert len(registry.builds) == 1
+
+    registry.reset()
+    registry.warm_up()
+    assert registry._warm_up is not None
+    registry._warm_up.join(5)
+    assert len(registry.builds) == 2
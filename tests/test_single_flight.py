@@ -0,0 +1,93 @@
+"""
+Tests for SingleFlight request coalescing.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.services.single_flight import SingleFlight, SingleFlightError
+
+
+def test_concurrent_identical_calls_run_once():
+    flight = SingleFlight(enabled=True, lock_dir="")
+    calls = []
+    started = threading.Event()
+
+    def compute():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return {"value": 42}
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        leader = executor.submit(flight.do, "key", compute)
+        started.wait()
+        followers = [executor.submit(flight.do, "key", compute) for _ in range(7)]
+        results = [leader.result()] + [future.result() for future in followers]
+    assert len(calls) == 1
+    assert all(result == {"value": 42} for result in results)
+
+
+def test_followers_share_the_leaders_error():
+    flight = SingleFlight(enabled=True, lock_dir="")
+
+    async def run():
+        async def fail():
+            await asyncio.sleep(0.1)
+            raise ValueError("boom")
+
+        return await asyncio.gather(*(flight.ado("key", fail) for _ in range(5)), return_exceptions=True)
+
+    errors = asyncio.run(run())
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert flight.leaders == 1 and flight.followers == 4
+
+
+def test_async_followers_hold_no_worker_threads():
+    flight = SingleFlight(enabled=True, lock_dir="")
+    calls = []
+
+    async def run():
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=2))
+        release = asyncio.Event()
+
+        async def compute():
+            calls.append(1)
+            await release.wait()
+            return "done"
+
+        waiters = [asyncio.create_task(flight.ado("key", compute)) for _ in range(20)]
+        await asyncio.sleep(0.05)
+        # With 19 followers waiting, the two default-executor threads are still free
+        assert await asyncio.wait_for(asyncio.to_thread(lambda: "free"), 1) == "free"
+        release.set()
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(run()) == ["done"] * 20
+    assert len(calls) == 1
+
+
+def test_async_followers_time_out():
+    flight = SingleFlight(enabled=True, lock_dir="", wait_timeout=0.1)
+    leader, _ = flight.begin("key")
+
+    async def run():
+        return await flight.ado("key", lambda: None)
+
+    with pytest.raises(SingleFlightError):
+        asyncio.run(run())
+    flight.finish("key", leader, result=None)
+
+
+def test_async_follower_woken_from_another_thread():
+    flight = SingleFlight(enabled=True, lock_dir="")
+    leader, _ = flight.begin("key")
+    threading.Timer(0.1, lambda: flight.finish("key", leader, result="from thread")).start()
+
+    async def run():
+        return await flight.ado("key", lambda: None)
+
+    assert asyncio.run(run()) == "from thread"
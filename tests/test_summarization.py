@@ -0,0 +1,77 @@
+"""
+Tests for SummarizationService with the benchmark's fake chat model.
+"""
+import asyncio
+import time
+
+import pytest
+from langchain_core.documents import Document
+
+from benchmarks.fakes import BenchSummarizationService, FakeChatModel
+from config.settings import Config
+from src.services.summarization import SummarizationError
+from src.services.summary_archive import SummaryArchive
+
+
+def make_service(**options) -> BenchSummarizationService:
+    return BenchSummarizationService(FakeChatModel(first_token_latency=0.01, tokens_per_second=100000, output_tokens=20), **options)
+
+
+def document(index: int) -> Document:
+    text = f"Report {index}. " + " ".join(f"The committee reviewed item {index}-{n} and approved it." for n in range(40))
+    return Document(page_content=text, metadata={"source": f"https://example.com/{index}"})
+
+
+def test_async_preparation_does_not_block_the_event_loop(monkeypatch):
+    service = make_service()
+    normalize = service._normalize
+
+    def slow_normalize(documents):
+        time.sleep(0.2)
+        return normalize(documents)
+
+    monkeypatch.setattr(service, "_normalize", slow_normalize)
+
+    async def run():
+        return await asyncio.gather(*(service.asummarize_content([document(index)]) for index in range(4)))
+
+    started = time.monotonic()
+    results = asyncio.run(run())
+    assert all(result["summary"] for result in results)
+    # Four 0.2 s preparations run side by side, not one after another
+    assert time.monotonic() - started < 0.6
+
+
+def test_synthesis_needs_two_summaries():
+    service = make_service()
+    with pytest.raises(SummarizationError):
+        service.synthesize([{"summary": "Only one.", "url": "https://example.com/1"}])
+
+
+def test_synthesis_labels_its_sources():
+    service = make_service()
+    result = service.synthesize([
+        {"summary": "The budget passed.", "url": "https://example.com/1"},
+        {"summary": "The budget failed.", "url": "https://example.com/2"}
+    ])
+    assert result["source_count"] == 2
+    assert result["sources"] == ["https://example.com/1", "https://example.com/2"]
+    assert result["strategy"] == "synthesis"
+
+
+def test_failed_archive_embedding_only_skips_the_semantic_lookup(tmp_path, monkeypatch):
+    class FailingEncoder:
+        def encode(self, texts, **kwargs):
+            raise RuntimeError("CUDA out of memory")
+
+    monkeypatch.setattr(Config, "ARCHIVE_SEMANTIC_CACHE_THRESHOLD", 0.9)
+    archive = SummaryArchive(directory=str(tmp_path), flush_seconds=60)
+    archive._encoder = FailingEncoder()
+    service = make_service()
+    service.archive = archive
+    try:
+        result = service.summarize_content([document(1)])
+    finally:
+        archive.close()
+    assert result["summary"]
+    assert "semantic_match" not in result
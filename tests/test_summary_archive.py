@@ -0,0 +1,71 @@
+"""
+Tests for SummaryArchive with a deterministic stand-in for the embedding model.
+"""
+import zlib
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from src.services.summary_archive import SummaryArchive, SummaryArchiveError, split_chunks
+
+
+class HashingEncoder:
+    """Bag-of-words encoder: each word adds to one of 64 dimensions."""
+
+    def encode(self, texts, **kwargs) -> np.ndarray:
+        vectors = np.zeros((len(texts), 64), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, zlib.crc32(word.encode("utf-8")) % 64] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+
+class FailingEncoder:
+    def encode(self, texts, **kwargs):
+        raise RuntimeError("CUDA out of memory")
+
+
+def make_archive(tmp_path, encoder) -> SummaryArchive:
+    archive = SummaryArchive(directory=str(tmp_path), flush_seconds=60)
+    archive._encoder = encoder
+    return archive
+
+
+def documents():
+    text = " ".join(f"The council voted on proposal {n} and adopted it." for n in range(30))
+    return [Document(page_content=text, metadata={"source": "https://example.com/council"})]
+
+
+def result(model: str, strategy: str = "stuff") -> dict:
+    return {
+        "summary": f"Summary by {model}.",
+        "model_used": model,
+        "model_tier": "balanced",
+        "strategy": strategy,
+        "prompt_version": "v1",
+        "word_count_target": 200
+    }
+
+
+def test_equivalent_summary_must_match_the_request_fields(tmp_path):
+    archive = make_archive(tmp_path, HashingEncoder())
+    archive.add(documents(), result("fast-model"))
+    archive.flush()
+    vectors = archive.embed(split_chunks(documents()))
+
+    fields = {"model_used": "fast-model", "model_tier": "balanced", "strategy": "stuff", "prompt_version": "v1"}
+    assert archive.find_equivalent(vectors, 200, 0.9, fields).entry.result["model_used"] == "fast-model"
+    assert archive.find_equivalent(vectors, 200, 0.9, dict(fields, model_used="quality-model")) is None
+    assert archive.find_equivalent(vectors, 200, 0.9, dict(fields, strategy="refine")) is None
+    assert archive.find_equivalent(vectors, 200, 0.9, dict(fields, prompt_version="v2")) is None
+    assert archive.find_equivalent(vectors, 100, 0.9, fields) is None
+    archive.close()
+
+
+def test_embedding_failures_raise_archive_errors(tmp_path):
+    archive = make_archive(tmp_path, FailingEncoder())
+    with pytest.raises(SummaryArchiveError):
+        archive.embed(["text"])
+    archive.close()
@@ -0,0 +1,76 @@
+"""
+Tests for TextNormalizer.
+"""
+from langchain_core.documents import Document
+
+from src.services.text_normalizer import TRANSCRIPT_CONTENT_TYPE, TextNormalizer
+
+
+ARTICLE = """Acme rewrites its privacy policy after regulator pressure
+
+Acme said on Monday that its new privacy policy will let users sign in without sharing their contacts.
+The change follows a year of complaints; read more about the investigation in our earlier coverage.
+Under the old terms, anyone who logged in agreed to advertising profiles built from their browsing.
+Critics say the move is overdue."""
+
+
+def normalize(text: str) -> str:
+    return TextNormalizer(enabled=True).normalize_text(text)
+
+
+def test_keeps_prose_that_mentions_chrome_phrases():
+    assert normalize(ARTICLE) == ARTICLE
+
+
+def test_keeps_bullet_lists():
+    text = "What changed\nFaster startup\nLower memory use\nNew export formats\nBetter search\nDark mode"
+    assert normalize(text) == text
+
+
+def test_drops_lines_made_only_of_site_chrome():
+    text = "\n".join([
+        "Skip to content",
+        "Sign in | Register",
+        "The council approved the budget on Tuesday.",
+        "Privacy Policy · Terms of Use",
+        "Read more »",
+        "© 2024 Example Media. All rights reserved."
+    ])
+    assert normalize(text) == "The council approved the budget on Tuesday."
+
+
+def test_drops_lines_repeated_across_documents():
+    normalizer = TextNormalizer(enabled=True)
+    seen = set()
+    first = normalizer.normalize_text("Home\nNews\nSport\nFirst story text.", seen)
+    second = normalizer.normalize_text("Home\nNews\nSport\nSecond story text.", seen)
+    assert first == "Home\nNews\nSport\nFirst story text."
+    assert second == "Second story text."
+
+
+def transcript(text: str) -> Document:
+    return Document(page_content=text, metadata={"source": "dQw4w9WgXcQ", "content_type": TRANSCRIPT_CONTENT_TYPE})
+
+
+def test_strips_transcript_filler():
+    result = TextNormalizer(enabled=True).normalize_documents([transcript("[Music] so um the results were, uh, good")])
+    assert result.documents[0].page_content == "so the results were good"
+    assert result.filler_removed == 3
+
+
+def test_keeps_repeated_words():
+    for text in (
+        "She said bye bye to him.",
+        "It was very very cold in Walla Walla.",
+        "New York, New York is a song.",
+        "He shouted no no no at the referee."
+    ):
+        assert normalize(text) == text
+        assert TextNormalizer(enabled=True).normalize_documents([transcript(text)]).documents[0].page_content == text
+
+
+def test_keeps_filler_words_outside_transcripts():
+    text = "The critic paused, said hmm, and moved on."
+    assert normalize(text) == text
+    page = Document(page_content=text, metadata={"source": "https://example.com/review"})
+    assert TextNormalizer(enabled=True).normalize_documents([page]).documents[0].page_content == text
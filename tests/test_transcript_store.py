@@ -0,0 +1,30 @@
+"""
+Tests for TranscriptStore writes.
+"""
+import os
+
+import pytest
+
+from src.services.transcript_store import Transcript, TranscriptStore, TranscriptStoreError
+
+
+def make_transcript() -> Transcript:
+    return Transcript.from_segments("dQw4w9WgXcQ", "en", [("Hello there.", 0.0, 1.5), ("General news.", 1.5, 2.0)])
+
+
+def test_put_and_get_round_trip(tmp_path):
+    store = TranscriptStore(directory=str(tmp_path))
+    store.put(make_transcript())
+    assert store.get("dQw4w9WgXcQ", "en").text == "Hello there. General news."
+
+
+def test_failed_write_removes_the_temp_file(tmp_path, monkeypatch):
+    store = TranscriptStore(directory=str(tmp_path))
+
+    def fail_replace(source, destination):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+    with pytest.raises(TranscriptStoreError):
+        store.put(make_transcript())
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
@@ -0,0 +1,64 @@
+"""
+Tests for URL classification and canonicalization.
+"""
+import pytest
+
+from src.utils.url_utils import normalize_url, parse_url
+
+VIDEO_ID = "dQw4w9WgXcQ"
+CANONICAL = f"https://www.youtube.com/watch?v={VIDEO_ID}"
+
+
+@pytest.mark.parametrize("url", [
+    f"https://www.youtube.com/watch?v={VIDEO_ID}",
+    f"https://youtube.com/watch?v={VIDEO_ID}",
+    f"https://m.youtube.com/watch?v={VIDEO_ID}",
+    f"https://music.youtube.com/watch?v={VIDEO_ID}",
+    f"https://www.youtube.com/watch?feature=share&v={VIDEO_ID}&t=42s",
+    f"https://www.youtube.com/watch?v={VIDEO_ID}&list=PL123#comments",
+    f"https://youtu.be/{VIDEO_ID}",
+    f"https://youtu.be/{VIDEO_ID}?t=42",
+    f"https://www.youtube.com/embed/{VIDEO_ID}",
+    f"https://www.youtube-nocookie.com/embed/{VIDEO_ID}",
+    f"https://www.youtube.com/shorts/{VIDEO_ID}",
+    f"https://www.youtube.com/live/{VIDEO_ID}?si=abc",
+    f"www.youtube.com/watch?v={VIDEO_ID}",
+    f"  HTTPS://WWW.YOUTUBE.COM/watch?v={VIDEO_ID}  "
+])
+def test_youtube_forms_share_one_canonical_url(url):
+    parsed = parse_url(url)
+    assert parsed.kind == "youtube"
+    assert parsed.video_id == VIDEO_ID
+    assert parsed.canonical_url == CANONICAL
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.youtube.com/channel/UC123",
+    f"https://www.youtube.com/watch?v={VIDEO_ID}extra",
+    "https://youtu.be/short"
+])
+def test_youtube_urls_without_a_video(url):
+    parsed = parse_url(url)
+    assert parsed.kind == "youtube"
+    assert parsed.video_id is None
+
+
+def test_lookalike_host_is_a_website():
+    parsed = parse_url(f"https://notyoutube.com.example.org/watch?v={VIDEO_ID}")
+    assert parsed.kind == "website"
+    assert parsed.video_id is None
+
+
+@pytest.mark.parametrize("url, domain", [
+    (f"https://m.youtube.com/watch?v={VIDEO_ID}", "m.youtube.com"),
+    (f"https://WWW.YouTube.com/watch?v={VIDEO_ID}", "www.youtube.com"),
+    (f"https://youtu.be/{VIDEO_ID}", "youtu.be"),
+    ("https://Example.com:8080/article", "example.com")
+])
+def test_domain_is_the_lowercased_host(url, domain):
+    assert parse_url(url).domain == domain
+
+
+def test_normalize_url_drops_tracking_and_sorts_query():
+    url = "HTTPS://Example.com:443/a/?utm_source=x&b=2&a=1#top"
+    assert normalize_url(url) == "https://example.com/a?a=1&b=2"